@@ -23,19 +23,6 @@ OTHER_THEMES = ["modern5", "minimal5", "responsive", "dark"]
 
 
 
-def update_conf(theme):
-    '''
-    Updates conf.py with the given theme
-    '''
-    CONF = "conf.py"
-
-    lines = open(CONF).readlines()
-    lines = ["html_theme = '%s'\n" % (theme, ) if "html_theme =" in line
-                else line for line in lines]
-    open(CONF, "w").writelines(lines)
-
-
-
 def update_index(theme):
     '''
     Updates index_<THEME>.hml files to point to the correct static dir
@@ -53,7 +40,7 @@ def move_theme(theme):
     '''
     Moves the build output of the given theme
     '''
-    src = os.path.join("blog", "html")
+    src = cmdline.theme_html(theme)
     dest = os.path.join("themes", theme)
 
     print("Moving %s to %s" % (src, dest))
@@ -108,15 +95,15 @@ def build_all_themes():
     # remove previous theme build output if any
     shutil.rmtree("themes", True)
 
+    # sources are read once with the default theme, then each other theme
+    # is written in its own process, themes are passed to Sphinx so conf.py
+    # is left as it is
+    cmdline.build_themes(OTHER_THEMES, jobs=len(OTHER_THEMES),
+                         theme=DEFAULT_THEME)
+
     for theme in OTHER_THEMES:
-        print("Building theme %s" % (theme,))
-        update_conf(theme)
-        cmdline.build()
         move_theme(theme)
 
-    update_conf(DEFAULT_THEME)
-    cmdline.build()
-
 
 
 command = parse(sys.argv[1:])
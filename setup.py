@@ -24,7 +24,7 @@ RSS feed generation, comments powered by Disqus and more.
 Tinkerer is also highly customizable through Sphinx extensions.
 '''
 
-requires = ["Jinja2>=2.3", "Sphinx>=1.2.3", "Babel>=1.3", "pyquery>=1.2.8"]
+requires = ["Jinja2>=2.3", "Sphinx>=1.4", "Babel>=1.3", "pyquery>=1.2.8"]
 if sys.version_info[:2] < (2,7) or (sys.version_info.major == 3 and
                                     sys.version_info.minor < 2):
     requires.append("argparse>=1.2")
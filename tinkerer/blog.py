@@ -0,0 +1,99 @@
+'''
+    blog
+    ~~~~
+
+    Blog context - paths, configuration and template environment of a blog.
+    Functions operating on a blog take an optional Blog object so several
+    blogs can be handled by the same process; when none is given, the blog
+    at the root set by paths.set_paths is used.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import os
+import types
+import tinkerer
+from tinkerer import paths
+
+
+class Blog():
+    '''
+    A blog rooted at the given directory.
+    '''
+    def __init__(self, root="."):
+        '''
+        Computes blog paths based on given root path.
+        '''
+        self.root = os.path.abspath(root)
+        self.blog = os.path.join(self.root,
+                                 os.getenv("TINKERER_BLOG_PATH", "blog"))
+        self.doctree = os.path.join(self.blog, "doctrees")
+        self.html = os.path.join(self.blog, "html")
+        self.master_file = os.path.join(
+            self.root, tinkerer.master_doc + tinkerer.source_suffix)
+        self.index_file = os.path.join(self.root, "index.html")
+        self.conf_file = os.path.join(self.root, "conf.py")
+        self.templates = os.path.join(self.root, "_templates")
+        self._env = None
+        self._word_separator = None
+
+    @property
+    def env(self):
+        '''
+        Jinja environment rendering templates from the blog _templates
+        directory, falling back to Tinkerer builtin templates.
+        '''
+        if self._env is None:
+            from tinkerer import writer
+            self._env = writer.make_env(self.templates)
+        return self._env
+
+    def get_conf(self):
+        '''
+        Loads the blog configuration file (conf.py) as a new module object
+        which isn't shared with other blogs.
+        '''
+        conf = types.ModuleType("conf")
+        conf.__file__ = self.conf_file
+        with open(self.conf_file, "r") as f:
+            exec(compile(f.read(), self.conf_file, "exec"), conf.__dict__)
+        return conf
+
+    @property
+    def word_separator(self):
+        '''
+        Character replacing non-alphanumeric characters in document names.
+        conf.py is only loaded again when it changes, the default is returned
+        while the blog has no valid conf.py.
+        '''
+        try:
+            stat = os.stat(self.conf_file)
+        except OSError:
+            return "_"
+
+        key = stat.st_mtime, stat.st_size
+        if self._word_separator is None or self._word_separator[0] != key:
+            try:
+                self._word_separator = (key,
+                                        self.get_conf().slug_word_separator)
+            except Exception:
+                return "_"
+        return self._word_separator[1]
+
+
+# blog used when no blog is passed explicitly
+_default = None
+
+
+def get_blog(blog=None):
+    '''
+    Returns the given blog or, if None, the blog at the root set by
+    paths.set_paths.
+    '''
+    global _default
+    if blog is None:
+        if _default is None or _default.root != paths.root:
+            _default = Blog(paths.root)
+        blog = _default
+    return blog
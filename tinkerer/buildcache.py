@@ -0,0 +1,73 @@
+'''
+    buildcache
+    ~~~~~~~~~~
+
+    Exports and imports the doctrees and environment of a build as a
+    compressed archive so a build on another checkout or machine (such as a
+    continuous integration run) only re-reads changed sources.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import os
+import shutil
+import tarfile
+from tinkerer.blog import get_blog
+
+try:
+    # Python 2
+    import cPickle as pickle
+except ImportError:
+    # Python 3
+    import pickle
+
+
+def export_cache(archive, blog=None):
+    '''
+    Writes the doctrees and environment of the last build to a gzipped tar
+    archive.
+    '''
+    blog = get_blog(blog)
+    if not os.path.isdir(blog.doctree):
+        raise Exception("No build cache found at '%s'" % blog.doctree)
+
+    with tarfile.open(archive, "w:gz") as tar:
+        for name in sorted(os.listdir(blog.doctree)):
+            tar.add(os.path.join(blog.doctree, name), name)
+
+
+def import_cache(archive, blog=None):
+    '''
+    Replaces the doctrees and environment of the blog with the ones from an
+    archive written by export_cache. The environment is moved to the blog
+    root so Sphinx accepts it.
+    '''
+    from sphinx.application import ENV_PICKLE_FILENAME
+
+    blog = get_blog(blog)
+
+    with tarfile.open(archive, "r:gz") as tar:
+        members = tar.getmembers()
+        for member in members:
+            path = os.path.normpath(member.name)
+            if (os.path.isabs(path) or path.startswith(os.pardir) or not
+                    (member.isfile() or member.isdir())):
+                raise Exception("Unexpected entry '%s' in build cache '%s'" %
+                                (member.name, archive))
+
+        if os.path.exists(blog.doctree):
+            shutil.rmtree(blog.doctree)
+        os.makedirs(blog.doctree)
+        tar.extractall(blog.doctree, members)
+
+    env_file = os.path.join(blog.doctree, ENV_PICKLE_FILENAME)
+    if not os.path.exists(env_file):
+        return
+
+    with open(env_file, "rb") as f:
+        env = pickle.load(f)
+    env.srcdir = blog.root
+    env.doctreedir = blog.doctree
+    with open(env_file, "wb") as f:
+        pickle.dump(env, f, pickle.HIGHEST_PROTOCOL)
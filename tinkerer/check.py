@@ -0,0 +1,134 @@
+'''
+    check
+    ~~~~~
+
+    Validates blog sources without building HTML. Only the Sphinx read phase
+    is run (across a process pool when more than one job is requested) and all
+    problems found are reported in machine-readable form.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from sphinx.application import Sphinx
+from tinkerer.blog import get_blog
+
+try:
+    # Python 2
+    from StringIO import StringIO
+except ImportError:
+    # Python 3
+    from io import StringIO
+
+
+# warning emitted by Sphinx, eg. "2010/10/01/post.rst:3: WARNING: message"
+SPHINX_WARNING_PTN = re.compile(
+    r"^(?:(?P<location>.+?): )?(?P<level>WARNING|ERROR|SEVERE): "
+    r"(?P<message>.*)$")
+
+# system message emitted by docutils, eg. "post.rst:3: (ERROR/3) message"
+DOCUTILS_WARNING_PTN = re.compile(
+    r"^(?:(?P<location>.+?): )?\((?P<level>[A-Z]+)/\d\) (?P<message>.*)$")
+
+# terminal color escape sequences
+COLOR_PTN = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def make_problem(location, level, message, blog=None):
+    '''
+    Returns a problem record given a Sphinx location string.
+    '''
+    filename, line = location, None
+    if location:
+        path, sep, lineno = location.rpartition(":")
+        if sep and (lineno.isdigit() or not lineno):
+            filename = path
+            line = int(lineno) if lineno else None
+        if os.path.isabs(filename):
+            filename = os.path.relpath(filename, get_blog(blog).root)
+
+    return {"file": filename, "line": line, "level": level,
+            "message": message}
+
+
+def parse_warnings(text, blog=None):
+    '''
+    Parses Sphinx warning output into a list of problems.
+    '''
+    problems = []
+    for line in COLOR_PTN.sub("", text).splitlines():
+        match = (SPHINX_WARNING_PTN.match(line) or
+                 DOCUTILS_WARNING_PTN.match(line))
+        if match:
+            problems.append(make_problem(
+                *match.group("location", "level", "message"), blog=blog))
+        elif problems and line.strip():
+            # continuation of a multi-line message
+            problems[-1]["message"] += "\n" + line.strip()
+
+    return problems
+
+
+def is_error(problem):
+    '''
+    Returns True if the problem should fail the check. Warnings not tied to a
+    source file (eg. Sphinx configuration warnings) are only reported.
+    '''
+    return problem["file"] is not None or problem["level"] != "WARNING"
+
+
+def check_landing_page(app, blog=None):
+    '''
+    Returns a problem if the configured landing page can't be resolved.
+    '''
+    landing_page = app.config.landing_page
+    if landing_page and "pages/%s" % landing_page not in app.env.blog_pages:
+        return [make_problem(get_blog(blog).conf_file, "ERROR",
+                             "Missing landing page: %s" % landing_page,
+                             blog)]
+    return []
+
+
+def check(jobs=1, blog=None):
+    '''
+    Reads all blog sources and returns the list of problems found. No HTML,
+    feed or aggregated page is written.
+    '''
+    # doctrees and output go to a scratch directory so the real build output
+    # is left untouched
+    blog = get_blog(blog)
+    scratch = tempfile.mkdtemp()
+    warnings = StringIO()
+
+    try:
+        app = Sphinx(blog.root, blog.root,
+                     os.path.join(scratch, "out"),
+                     os.path.join(scratch, "doctrees"),
+                     "dummy", status=None, warning=warnings,
+                     freshenv=True, parallel=jobs)
+        app.build(force_all=True)
+        problems = parse_warnings(warnings.getvalue(), blog)
+        problems.extend(check_landing_page(app, blog))
+    except Exception as e:
+        problems = parse_warnings(warnings.getvalue(), blog)
+        problems.append(make_problem(None, "SEVERE", str(e), blog))
+    finally:
+        shutil.rmtree(scratch, True)
+
+    return problems
+
+
+def report(problems, stream=None):
+    '''
+    Writes the given problems as JSON, by default to stdout.
+    '''
+    stream = stream or sys.stdout
+    stream.write(json.dumps({"problems": problems}, indent=2,
+                            sort_keys=True))
+    stream.write("\n")
@@ -6,72 +6,311 @@
 
     setup - to create a new blog
     build - to clean build blog
+    build many - to clean build several blogs in parallel processes
+    check - to validate blog sources without building
     post - to create a new post
     page - to create a new page
 
+    Modules needed by a single command (Sphinx, Jinja and the post, page and
+    draft helpers) are imported by that command so creating a file doesn't
+    pay for loading the build machinery.
+
     :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
     CONTRIBUTORS file)
     :license: FreeBSD, see LICENSE file
 '''
 import argparse
 from datetime import datetime
+import glob
 import os
 import shutil
-import subprocess
 import tinkerer
-from tinkerer import draft, output, page, paths, post, writer
+from tinkerer import output
+from tinkerer.blog import Blog, get_blog
 
 
-def setup():
+def setup(blog=None):
     '''
     Sets up a new blog in the current directory.
     '''
+    from tinkerer import writer
+
+    blog = get_blog(blog)
+
     # it is a new blog if conf.py doesn't already exist
-    new_blog = writer.setup_blog()
+    new_blog = writer.setup_blog(blog)
 
     output.filename.info("conf.py")
     if new_blog:
         output.write.info("Your new blog is almost ready!")
         output.write.info("You just need to edit a couple of lines in %s" %
-                          (os.path.relpath(paths.conf_file), ))
+                          (os.path.relpath(blog.conf_file), ))
     else:
         output.write.info("Done")
 
 
-def build():
+def copy_extra_files(destination, blog=None):
     '''
-    Runs a clean Sphinx build of the blog.
+    Copies extra files from the "_copy" directory to the output directory.
     '''
-    # clean build directory
-    if os.path.exists(paths.blog):
-        shutil.rmtree(paths.blog)
+    copy = os.path.join(get_blog(blog).root, "_copy")
+    if os.path.exists(copy):
+        shutil.copytree(copy, destination)
+
 
+def sphinx_flags(destination, jobs=1, overrides=None, blog=None,
+                 doctree=None):
+    '''
+    Returns the sphinx-build command line writing HTML to the destination.
+    Doctrees are kept in the blog doctree directory unless another one is
+    given.
+    '''
+    blog = get_blog(blog)
     flags = ["sphinx-build"]
     # silence Sphinx if in quiet mode
     if output.quiet:
         flags.append("-q")
-    flags += ["-d", paths.doctree, "-b", "html", paths.root, paths.html]
+    if jobs > 1:
+        flags += ["-j", str(jobs)]
+    for setting in sorted(overrides or {}):
+        flags += ["-D", "%s=%s" % (setting, overrides[setting])]
+    flags += ["-d", doctree or blog.doctree, "-b", "html", blog.root,
+              destination]
+
+    return flags
+
+
+def build(jobs=1, blog=None, clean=True, overrides=None):
+    '''
+    Runs a clean Sphinx build of the blog. If clean is False, the doctrees
+    and environment of the previous build are kept so only changed sources
+    are read again, HTML is always written from scratch. Overrides are
+    passed to Sphinx as -D settings.
+    '''
+    import subprocess
+
+    blog = get_blog(blog)
+
+    # clean build directory
+    if os.path.exists(blog.blog if clean else blog.html):
+        shutil.rmtree(blog.blog if clean else blog.html)
 
     # build always prints "index.html"
     output.filename.info("index.html")
 
     # copy some extra files to the output directory
-    if os.path.exists("_copy"):
-        shutil.copytree("_copy/", paths.html)
+    copy_extra_files(blog.html, blog)
+
+    return subprocess.call(sphinx_flags(blog.html, jobs, overrides,
+                                        blog=blog),
+                           cwd=blog.root)
+
+
+def build_cached(jobs=1, cache_import=None, cache_export=None, blog=None):
+    '''
+    Builds the blog reusing the doctrees and environment of the previous
+    build, first imported from the cache_import archive if it exists. After a
+    successful build they are exported to the cache_export archive.
+    '''
+    from tinkerer import buildcache
+
+    blog = get_blog(blog)
+
+    if cache_import:
+        if os.path.exists(cache_import):
+            buildcache.import_cache(cache_import, blog)
+            output.write.info("Build cache imported from '%s'" %
+                              cache_import)
+        else:
+            output.write.info("No build cache at '%s', reading all sources" %
+                              cache_import)
+
+    result = build(jobs, blog, clean=False)
+
+    if not result and cache_export:
+        buildcache.export_cache(cache_export, blog)
+        output.write.info("Build cache exported to '%s'" % cache_export)
+
+    return result
+
+
+def blog_roots(patterns):
+    '''
+    Returns the blog roots given as paths or glob patterns, in order and
+    without duplicates. Patterns matching nothing are returned as they are so
+    they are reported as failed builds.
+    '''
+    roots = []
+    for pattern in patterns:
+        for root in sorted(glob.glob(pattern)) or [pattern]:
+            root = os.path.abspath(root)
+            if root not in roots:
+                roots.append(root)
+    return roots
+
+
+def build_one(root):
+    '''
+    Runs a clean in-process Sphinx build of the blog at root. Called in a
+    --build-many worker process, returns (root, result, seconds, error).
+    '''
+    import sys
+    import time
+    import traceback
+    from sphinx.application import Sphinx
+
+    start = time.time()
+    blog = Blog(root)
+
+    # conf.py and the blog extension may add the blog directories to the
+    # import path, keep them from leaking into the next blog of the worker
+    sys_path = list(sys.path)
+    modules = set(sys.modules)
+    try:
+        if not os.path.exists(blog.conf_file):
+            raise Exception("'%s' not found" % blog.conf_file)
+
+        if os.path.exists(blog.blog):
+            shutil.rmtree(blog.blog)
+        copy_extra_files(blog.html, blog)
+
+        # compiled theme templates are shared by all blogs through the
+        # template cache
+        app = Sphinx(blog.root, blog.root, blog.html, blog.doctree, "html",
+                     confoverrides={"template_bytecode_cache": True},
+                     status=None, warning=sys.stderr, freshenv=True)
+        app.build()
+        result, error = app.statuscode, None
+    except Exception:
+        result, error = 1, traceback.format_exc().strip().splitlines()[-1]
+    finally:
+        sys.path[:] = sys_path
+        for name in set(sys.modules) - modules:
+            module_file = getattr(sys.modules[name], "__file__", None) or ""
+            if os.path.abspath(module_file).startswith(blog.root + os.sep):
+                del sys.modules[name]
+
+    return root, result, time.time() - start, error
+
+
+def build_many(patterns, jobs=1):
+    '''
+    Runs a clean build of each blog given as a path or glob pattern, up to
+    jobs at a time in worker processes. Reports the status and build time of
+    each blog and returns non-zero if any build failed.
+    '''
+    from multiprocessing import Pool
+    import time
+
+    roots = blog_roots(patterns)
 
-    return subprocess.call(flags)
+    start = time.time()
+    pool = Pool(max(min(jobs, len(roots)), 1))
+    try:
+        failed = 0
+        for root, result, seconds, error in pool.imap_unordered(build_one,
+                                                                roots):
+            if result:
+                failed += 1
+                output.write.error("FAILED %s (%.2fs)%s" % (
+                    root, seconds, ": " + error if error else ""))
+            else:
+                output.filename.info(os.path.join(Blog(root).html,
+                                                  "index.html"))
+                output.write.info("built %s (%.2fs)" % (root, seconds))
+    finally:
+        pool.close()
+        pool.join()
+
+    output.write.info("%d of %d blog(s) built in %.2fs" % (
+        len(roots) - failed, len(roots), time.time() - start))
+    return 1 if failed else 0
+
+
+def theme_html(theme, blog=None):
+    '''
+    Returns the output directory of the given theme in a multi-theme build.
+    '''
+    return os.path.join(get_blog(blog).blog, "themes", theme)
+
+
+def build_themes(themes, jobs=1, blog=None, theme=None):
+    '''
+    Runs a clean Sphinx build of the blog with the given theme or, if None,
+    the theme from conf.py, then writes the HTML for each of the given themes
+    to its own output directory. conf.py is never modified.
+    Theme builds reuse the doctrees and environment of the first build so
+    sources are only read once, and run in up to jobs parallel processes.
+    Each theme build works on its own copy of the doctrees, as Sphinx writes
+    the environment again at the end of the build.
+    '''
+    from multiprocessing.pool import ThreadPool
+    import subprocess
+    import tempfile
+
+    blog = get_blog(blog)
+
+    result = build(jobs, blog,
+                   overrides={"html_theme": theme} if theme else None)
+    if result:
+        return result
+
+    def build_theme(theme):
+        destination = theme_html(theme, blog)
+        output.filename.info(os.path.join(destination, "index.html"))
+        copy_extra_files(destination, blog)
+
+        temp = tempfile.mkdtemp(prefix="tinkerer-")
+        try:
+            doctree = os.path.join(temp, "doctrees")
+            shutil.copytree(blog.doctree, doctree)
+            return subprocess.call(
+                sphinx_flags(destination, overrides={"html_theme": theme},
+                             blog=blog, doctree=doctree),
+                cwd=blog.root)
+        finally:
+            shutil.rmtree(temp, True)
+
+    pool = ThreadPool(max(jobs, 1))
+    try:
+        results = pool.map(build_theme, themes)
+    finally:
+        pool.close()
+
+    return next((result for result in results if result), 0)
+
+
+def run_check(jobs=1, blog=None):
+    '''
+    Validates all blog sources without writing any output. Problems are
+    written to stdout as JSON.
+    '''
+    from tinkerer import check
+
+    problems = check.check(jobs, blog)
+    check.report(problems)
+
+    errors = [problem for problem in problems if check.is_error(problem)]
+    if errors:
+        output.write.error("%d problem(s) found" % len(errors))
+        return 1
+
+    output.write.info("No problems found")
+    return 0
 
 
-def create_post(title, date, template):
+def create_post(title, date, template, blog=None):
     '''
     Creates a new post with the given title or makes an existing file a post.
     '''
+    from tinkerer import post
+
     move = os.path.exists(title)
 
     if move:
-        new_post = post.move(title, date)
+        new_post = post.move(title, date, blog)
     else:
-        new_post = post.create(title, date, template)
+        new_post = post.create(title, date, template, blog)
 
     output.filename.info(new_post.path)
     if move:
@@ -80,16 +319,18 @@ def create_post(title, date, template):
         output.write.info("New post created as '%s'" % new_post.path)
 
 
-def create_page(title, template):
+def create_page(title, template, blog=None):
     '''
     Creates a new page with the given title or makes an existing file a page.
     '''
+    from tinkerer import page
+
     move = os.path.exists(title)
 
     if move:
-        new_page = page.move(title)
+        new_page = page.move(title, blog=blog)
     else:
-        new_page = page.create(title, template)
+        new_page = page.create(title, template, blog)
 
     output.filename.info(new_page.path)
     if move:
@@ -98,16 +339,18 @@ def create_page(title, template):
         output.write.info("New page created as '%s'" % new_page.path)
 
 
-def create_draft(title, template):
+def create_draft(title, template, blog=None):
     '''
     Creates a new draft with the given title or makes an existing file a draft.
     '''
+    from tinkerer import draft
+
     move = os.path.exists(title)
 
     if move:
-        new_draft = draft.move(title)
+        new_draft = draft.move(title, blog)
     else:
-        new_draft = draft.create(title, template)
+        new_draft = draft.create(title, template, blog)
 
     output.filename.info(new_draft)
     if move:
@@ -116,22 +359,24 @@ def create_draft(title, template):
         output.write.info("New draft created as '%s'" % new_draft)
 
 
-def preview_draft(draft_file):
+def preview_draft(draft_file, jobs=1, blog=None):
     '''
     Rebuilds the blog, including the given draft.
     '''
+    from tinkerer import draft, post
+
     if not os.path.exists(draft_file):
         raise Exception("Draft named '%s' does not exist" % draft_file)
 
     # promote draft
-    preview_post = post.move(draft_file)
+    preview_post = post.move(draft_file, blog=blog)
 
     try:
         # rebuild
-        result = build()
+        result = build(jobs, blog)
     finally:
         # demote post back to draft
-        draft.move(preview_post.path)
+        draft.move(preview_post.path, blog)
 
     return result
 
@@ -145,6 +390,15 @@ def main(argv=None):
     group.add_argument("-s", "--setup", action="store_true",
                        help="setup a new blog")
     group.add_argument("-b", "--build", action="store_true", help="build blog")
+    group.add_argument(
+        "--build-many", nargs="+", metavar="ROOT",
+        help="clean build each blog whose root directory is ROOT, which can "
+        "be a glob pattern; up to -j blogs are built at a time and the exit "
+        "code is non-zero if any build fails")
+    group.add_argument(
+        "--check", action="store_true",
+        help="validate all posts and pages without building HTML, report "
+        "problems as JSON and exit with a non-zero code if any are found")
     group.add_argument(
         "-p", "--post", nargs=1,
         help="create a new post with the title POST (if a file named POST "
@@ -169,6 +423,24 @@ def main(argv=None):
         '-t', '--template', action='store', default=None,
         help="specify a body template, defaults to page or post",
     )
+    parser.add_argument(
+        "--themes", nargs="+", metavar="THEME",
+        help="after building, also write the blog with each THEME to "
+        "blog/themes/THEME, reusing the parsed sources; can only be used "
+        "together with -b/--build")
+    parser.add_argument(
+        "--cache-import", metavar="ARCHIVE",
+        help="before building, restore the doctrees and environment from "
+        "ARCHIVE (if it exists) and only read sources whose content changed; "
+        "can only be used together with -b/--build")
+    parser.add_argument(
+        "--cache-export", metavar="ARCHIVE",
+        help="after building, save the doctrees and environment to ARCHIVE, "
+        "a gzipped tar file; can only be used together with -b/--build")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="number of parallel processes to use with -b/--build, "
+        "--build-many, --check and --preview")
     parser.add_argument(
         "--date", nargs=1,
         help="optionally specify a date as 'YYYY/mm/dd' for the post, "
@@ -185,9 +457,13 @@ def main(argv=None):
 
     output.init(command.quiet, command.filename)
 
-    # tinkerer should be run from the blog root unless in setup mode or -v
+    # blog at the root set by paths, the current directory unless changed
+    blog = get_blog()
+
+    # tinkerer should be run from the blog root unless in setup mode, -v or
+    # building other blogs
     if (not command.setup and not command.version and not
-            os.path.exists(paths.conf_file)):
+            command.build_many and not os.path.exists(blog.conf_file)):
         output.write.error("Tinkerer must be run from your blog root "
                            "(directory containing 'conf.py')")
         return -1
@@ -207,8 +483,20 @@ def main(argv=None):
             )
             return -1
 
+    # --themes only works with --build
+    if command.themes and not command.build:
+        output.write.error("Can only use --themes with -b/--build.")
+        return -1
+
+    # build cache only works with --build, without --themes
+    cached = command.cache_import or command.cache_export
+    if cached and (not command.build or command.themes):
+        output.write.error("Can only use --cache-import and --cache-export "
+                           "with -b/--build, without --themes.")
+        return -1
+
     if command.template:
-        if not os.path.exists(os.path.join(paths.templates, command.template)):
+        if not os.path.exists(os.path.join(blog.templates, command.template)):
             output.write.error(
                 "The specified template does not exist. "
                 " Make sure the template is placed inside the _templates"
@@ -216,17 +504,26 @@ def main(argv=None):
             return -1
 
     if command.setup:
-        setup()
+        setup(blog)
+    elif command.build and command.themes:
+        return build_themes(command.themes, command.jobs, blog)
+    elif command.build and cached:
+        return build_cached(command.jobs, command.cache_import,
+                            command.cache_export, blog)
     elif command.build:
-        return build()
+        return build(command.jobs, blog)
+    elif command.build_many:
+        return build_many(command.build_many, command.jobs)
+    elif command.check:
+        return run_check(command.jobs, blog)
     elif command.post:
-        create_post(command.post[0], post_date, command.template)
+        create_post(command.post[0], post_date, command.template, blog)
     elif command.page:
-        create_page(command.page[0], command.template)
+        create_page(command.page[0], command.template, blog)
     elif command.draft:
-        create_draft(command.draft[0], command.template)
+        create_draft(command.draft[0], command.template, blog)
     elif command.preview:
-        preview_draft(command.preview[0])
+        preview_draft(command.preview[0], command.jobs, blog)
     elif command.version:
         output.write.info("Tinkerer version %s" % tinkerer.__version__)
     else:
@@ -13,17 +13,19 @@ import re
 import shutil
 import tinkerer
 from tinkerer import master, paths, utils, writer
+from tinkerer.blog import get_blog
 
 
-def create(title, template=None):
+def create(title, template=None, blog=None):
     '''
     Creates a new post draft.
     '''
-    name = utils.name_from_title(title)
+    blog = get_blog(blog)
+    name = utils.name_from_title(title, blog.word_separator)
     template = template or paths.post_template
 
     path = os.path.join(
-        utils.get_path(paths.root, "drafts"),
+        utils.get_path(blog.root, "drafts"),
         name + tinkerer.source_suffix,
     )
 
@@ -36,22 +38,25 @@ def create(title, template=None):
                    "content":    "",
                    "author":     "default",
                    "categories": "none",
-                   "tags":       "none"})
+                   "tags":       "none"},
+                  blog=blog)
 
     return path
 
 
-def move(path):
+def move(path, blog=None):
     '''
     Demotes given file to draft.
     '''
+    blog = get_blog(blog)
+
     # get dirname and filename
     dirname, filename = os.path.split(path)
 
     # get docname without extension
     docname = os.path.splitext(filename)[0]
 
-    draft = os.path.join(utils.get_path(paths.root, "drafts"), filename)
+    draft = os.path.join(utils.get_path(blog.root, "drafts"), filename)
 
     # move file
     shutil.move(path, draft)
@@ -67,6 +72,6 @@ def move(path):
         docname = "/".join([g("y"), g("m"), g("d"), docname])
 
     # remove file from TOC
-    master.remove_doc(docname)
+    master.remove_doc(docname, blog)
 
     return draft
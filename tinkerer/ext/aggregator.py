@@ -12,12 +12,53 @@ import copy
 from tinkerer.ext.uistr import UIStr
 
 
+def get_home(app):
+    '''
+    Returns the name of the aggregated page holding the newest posts.
+    '''
+    if not app.config.landing_page:
+        return "index"
+    # with stable pagination page1 holds the oldest posts
+    return "latest" if app.config.stable_pagination else "page1"
+
+
+def get_groups(app):
+    '''
+    Returns [(pagename, title, posts)] for each aggregated page, starting with
+    the newest posts.
+    '''
+    posts = app.builder.env.blog_posts
+    posts_per_page = app.config.posts_per_page
+    if not posts:
+        return []
+
+    if not app.config.stable_pagination:
+        groups = [("page%d" % (i + 1), UIStr.PAGE_FMT % (i + 1),
+                   posts[i * posts_per_page:(i + 1) * posts_per_page])
+                  for i in range((len(posts) - 1) // posts_per_page + 1)]
+    else:
+        # pages are numbered from the oldest post and hold posts_per_page
+        # posts each, so publishing a post doesn't move posts between them;
+        # the newest page also holds the posts which don't fill a page yet
+        count = max(len(posts) // posts_per_page, 1)
+        groups = [("page%d" % (i + 1), UIStr.PAGE_FMT % (i + 1),
+                   posts[len(posts) - (i + 1) * posts_per_page:
+                         len(posts) - i * posts_per_page])
+                  for i in range(count - 1)]
+        groups.append(("page%d" % count, UIStr.PAGE_FMT % count,
+                       posts[:len(posts) - (count - 1) * posts_per_page]))
+        groups.reverse()
+
+    # first page is titled "Home"
+    groups[0] = (get_home(app), UIStr.HOME, groups[0][2])
+    return groups
+
+
 def make_aggregated_pages(app):
     '''
     Generates aggregated pages.
     '''
     env = app.builder.env
-    posts_per_page = app.config.posts_per_page
     landing_page = app.config.landing_page
 
     if landing_page:
@@ -30,17 +71,22 @@ def make_aggregated_pages(app):
             "index.html"
         )
 
-    # get post groups
-    groups = [env.blog_posts[i:i+posts_per_page]
-              for i in range(0, len(env.blog_posts), posts_per_page)]
+    # get post groups, older posts are only listed by the archive past
+    # aggregated_max_pages
+    groups = get_groups(app)
+    max_pages = app.config.aggregated_max_pages
+    truncated = 0 < max_pages < len(groups)
+    if truncated:
+        groups = groups[:max_pages]
 
     # for each group
-    for i, posts in enumerate(groups):
+    for i, (pagename, title, posts) in enumerate(groups):
         # initialize context
         context = {
             "prev": {},
             "next": {},
-            "posts": []
+            "posts": [],
+            "title": title
         }
 
         # add posts to context
@@ -49,36 +95,26 @@ def make_aggregated_pages(app):
             metadata = copy.deepcopy(env.blog_metadata[post])
             context["posts"].append(metadata)
 
-        pagename = "page%d" % (i + 1)
-
         # handle navigation
         if i == 0:
-            # if landing_page, keep "page1", else use "index" so we land on
-            # first aggregated page
-            if not landing_page:
-                pagename = "index"
-
-            # first page doesn't have prev link and its title is "Home"
+            # first page doesn't have prev link
             context["prev"] = None
-            context["title"] = UIStr.HOME
         else:
             # following pages prev-link to previous page (titled as "Newer")
             context["prev"]["title"] = UIStr.NEWER
-            context["prev"]["link"] = "page%d.html" % i
+            context["prev"]["link"] = "%s.html" % groups[i - 1][0]
 
-            # if no landing_page, prev link for second page is "index"
-            if i == 1 and not landing_page:
-                context["prev"]["link"] = "index.html"
-
-            context["title"] = UIStr.PAGE_FMT % (i + 1)
-
-        if i == len(groups) - 1:
+        if i == len(groups) - 1 and truncated:
+            # last generated page next-links to the archive
+            context["next"]["title"] = UIStr.OLDER
+            context["next"]["link"] = "archive.html"
+        elif i == len(groups) - 1:
             # last page doesn't have next link
             context["next"] = None
         else:
             # other pages next-link to following page (titled as "Older")
             context["next"]["title"] = UIStr.OLDER
-            context["next"]["link"] = "page%d.html" % (i + 2)
+            context["next"]["link"] = "%s.html" % groups[i + 1][0]
 
         context["archive_title"] = UIStr.BLOG_ARCHIVE
 
@@ -0,0 +1,121 @@
+'''
+    api
+    ~~~
+
+    JSON post index for themes loading posts on demand. When blog_api is set,
+    the api directory gets paginated summaries of posts in posts/pageN.json,
+    newest first, and each post in posts/<post>.json with its full body.
+    Documents are built from post metadata and bodies are patched like on
+    aggregated pages, so links are relative to the root of the blog.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import json
+import os
+from tinkerer.ext import patch
+from tinkerer.ext.sitemap import write_file
+
+
+# output directory of the API
+API_DIR = "api"
+
+
+def patch_body(metadata, body, excerpt=False):
+    '''
+    Returns a post body patched to be linked from the root of the blog. The
+    "more" marker of excerpts is replaced by a link to the post.
+    '''
+    return patch.strip_xml_declaration(patch.patch_links(
+        body,
+        metadata.link[:11],  # first 11 characters is path (YYYY/MM/DD/)
+        metadata.link[11:],  # following characters represent filename
+        True,                # hyperlink title to post
+        replace_read_more_link=excerpt))
+
+
+def make_summary(app, metadata):
+    '''
+    Returns the summary of a post listed by index pages.
+    '''
+    return {
+        "title": metadata.title,
+        "link": app.builder.get_target_uri(metadata.link),
+        "url": "%s/posts/%s.json" % (API_DIR, metadata.link),
+        "date": metadata.date.strftime("%Y-%m-%d"),
+        "formatted_date": metadata.formatted_date,
+        "tags": [tag for _, tag in metadata.filing["tags"]],
+        "categories": [category for _, category
+                       in metadata.filing["categories"]],
+        "excerpt": patch_body(metadata, metadata.excerpt, True)
+        if metadata.excerpt else None,
+    }
+
+
+def make_post(app, metadata):
+    '''
+    Returns the document of a post.
+    '''
+    post = make_summary(app, metadata)
+    post["author"] = metadata.author
+    post["body"] = patch_body(metadata, metadata.body)
+    return post
+
+
+def dump(data):
+    '''
+    Returns compact JSON of data.
+    '''
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+
+def write_api(app, exception):
+    '''
+    Writes index pages and posts once the build is finished and removes
+    files of posts which no longer exist.
+    '''
+    if exception is not None or not app.config.blog_api:
+        return
+
+    env = app.builder.env
+    outdir = os.path.join(app.outdir, API_DIR)
+    posts = [env.blog_metadata[post] for post in env.blog_posts
+             if env.blog_metadata[post].body is not None]
+    posts_per_page = app.config.posts_per_page
+    pages = [posts[i:i + posts_per_page]
+             for i in range(0, len(posts), posts_per_page)]
+
+    written = set()
+
+    def write(name, data):
+        filename = os.path.join(outdir, *name.split("/"))
+        if not os.path.exists(os.path.dirname(filename)):
+            os.makedirs(os.path.dirname(filename))
+        write_file(filename, dump(data))
+        written.add(filename)
+
+    for number, page in enumerate(pages):
+        write("posts/page%d.json" % (number + 1), {
+            "page": number + 1,
+            "pages": len(pages),
+            "posts": [make_summary(app, metadata) for metadata in page],
+            "prev": "%s/posts/page%d.json" % (API_DIR, number)
+            if number > 0 else None,
+            "next": "%s/posts/page%d.json" % (API_DIR, number + 2)
+            if number < len(pages) - 1 else None,
+        })
+        for metadata in page:
+            write("posts/%s.json" % metadata.link, make_post(app, metadata))
+
+    for root, dirs, files in os.walk(outdir):
+        for name in files:
+            if os.path.join(root, name) not in written:
+                os.remove(os.path.join(root, name))
+
+
+def add_api(app, context):
+    '''
+    Tells templates whether the JSON post index is written.
+    '''
+    context["blog_api"] = app.config.blog_api
@@ -0,0 +1,342 @@
+'''
+    assets
+    ~~~~~~
+
+    Static asset pipeline. Once pages are written, stylesheets and scripts
+    under _static referenced by pages are minified and written with their
+    content hash in the file name, adjacent stylesheets and scripts are
+    bundled into a single file and the references in pages are rewritten,
+    so assets can be cached by browsers forever. Original files are kept for
+    references which are not rewritten (such as those in scripts).
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import hashlib
+import os
+import re
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+
+# runs of adjacent stylesheet and script tags
+LINK_RUN = re.compile(r"(?:<link\b[^>]*>\s*)+")
+SCRIPT_RUN = re.compile(r"(?:<script\b[^>]*>\s*</script>\s*)+")
+TAG = {LINK_RUN: re.compile(r"<link\b[^>]*>"),
+       SCRIPT_RUN: re.compile(r"<script\b[^>]*>\s*</script>")}
+ATTRIBUTE = re.compile(r"""([\w-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+
+# url() references in stylesheets
+CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+CSS_CHARSET = re.compile(r"""@charset\s+["'][^"']*["']\s*;""")
+
+# @import rules, only allowed at the top of a stylesheet, and the ones given
+# as a plain string rather than url()
+CSS_IMPORT = re.compile(r"@import\b", re.I)
+CSS_IMPORT_STRING = re.compile(r"""(@import\s*)(['"])([^'"]+)\2""", re.I)
+
+# comments, strings and unquoted url() values in stylesheets, the fallback
+# minifier drops comments and keeps the others as they are
+CSS_TOKEN = re.compile(r"""(/\*.*?\*/)|("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|"""
+                       r"""url\([^)"']*\))""", re.S | re.I)
+
+# length of the content hash in file names
+HASH_LENGTH = 10
+FINGERPRINTED = re.compile(r"\.[0-9a-f]{%d}$" % HASH_LENGTH)
+
+
+def minify_css(css):
+    '''
+    Returns minified CSS, using rcssmin if installed. The fallback only
+    removes comments and whitespace which can't change meaning.
+    '''
+    if rcssmin is not None:
+        return rcssmin.cssmin(css)
+
+    # only the code between strings is compacted, comments are dropped
+    parts, code, pos = [], [], 0
+    for match in CSS_TOKEN.finditer(css):
+        code.append(css[pos:match.start()])
+        pos = match.end()
+        if match.group(2):
+            parts += [compact_css("".join(code)), match.group(2)]
+            code = []
+    code.append(css[pos:])
+    parts.append(compact_css("".join(code)))
+    return "".join(parts).strip()
+
+
+def compact_css(code):
+    '''
+    Removes whitespace from CSS code with no comments or strings.
+    '''
+    code = re.sub(r"\s+", " ", code)
+    code = re.sub(r"\s*([{};,])\s*", r"\1", code)
+    # whitespace before a colon can be a descendant selector, after it can't
+    code = re.sub(r":\s+", ":", code)
+    return code.replace(";}", "}")
+
+
+def minify_js(js):
+    '''
+    Returns minified JavaScript if rjsmin is installed, otherwise the script
+    is left as it is.
+    '''
+    if rjsmin is not None:
+        return rjsmin.jsmin(js)
+    return js
+
+
+def is_relative_url(url):
+    '''
+    Returns True if url is relative to the page it appears on.
+    '''
+    return not (url.startswith("/") or url.startswith("#") or ":" in url)
+
+
+def rebase_css(css, source_dir, target_dir):
+    '''
+    Rewrites relative url() and @import references of a stylesheet moved
+    from source_dir to target_dir.
+    '''
+    if source_dir == target_dir:
+        return css
+
+    def rebase_url(url):
+        if not is_relative_url(url):
+            return url
+        path, suffix = re.match(r"([^?#]*)(.*)", url).groups()
+        path = os.path.relpath(os.path.join(source_dir, path), target_dir)
+        return path.replace(os.sep, "/") + suffix
+
+    css = CSS_URL.sub(lambda match: "url(%s%s%s)" % (
+        match.group(1), rebase_url(match.group(2)), match.group(1)), css)
+    return CSS_IMPORT_STRING.sub(lambda match: "%s%s%s%s" % (
+        match.group(1), match.group(2), rebase_url(match.group(3)),
+        match.group(2)), css)
+
+
+class Pipeline():
+    '''
+    Fingerprints and bundles static assets of a build output directory.
+    Assets are processed once and reused by all pages.
+    '''
+    def __init__(self, outdir, encoding="utf-8", bundle=True):
+        self.outdir = outdir
+        self.static = os.path.join(outdir, "_static")
+        self.encoding = encoding
+        self.bundle = bundle
+        self.files = {}
+        self.bundles = {}
+        self.imports = {}
+
+    def write(self, directory, name, ext, content):
+        '''
+        Writes content to a file named after its hash and returns its path.
+        '''
+        digest = hashlib.sha1(content).hexdigest()[:HASH_LENGTH]
+        filename = os.path.join(directory, "%s.%s%s" % (name, digest, ext))
+        if not os.path.exists(filename):
+            with open(filename, "wb") as f:
+                f.write(content)
+        return filename
+
+    def read(self, filename):
+        '''
+        Returns the minified content of a stylesheet or script.
+        '''
+        with open(filename, "rb") as f:
+            content = f.read()
+        name = os.path.basename(filename)
+        if name.endswith(".css") and ".min." not in name:
+            content = minify_css(content.decode(self.encoding)).encode(
+                self.encoding)
+        elif name.endswith(".js") and ".min." not in name:
+            content = minify_js(content.decode(self.encoding)).encode(
+                self.encoding)
+        return content
+
+    def fingerprint(self, filename):
+        '''
+        Returns the path of the fingerprinted copy of a static file.
+        '''
+        name, ext = os.path.splitext(os.path.basename(filename))
+        # pages kept from a previous build already reference fingerprinted
+        # files
+        if FINGERPRINTED.search(name):
+            return filename
+        if filename not in self.files:
+            self.files[filename] = self.write(
+                os.path.dirname(filename), name, ext, self.read(filename))
+        return self.files[filename]
+
+    def has_import(self, filename):
+        '''
+        Returns True if a stylesheet has @import rules.
+        '''
+        if filename not in self.imports:
+            self.imports[filename] = bool(CSS_IMPORT.search(
+                self.read(filename).decode(self.encoding)))
+        return self.imports[filename]
+
+    def make_bundle(self, filenames, ext):
+        '''
+        Returns the path of the fingerprinted bundle of the given files.
+        '''
+        key = tuple(filenames)
+        if key not in self.bundles:
+            parts = []
+            for filename in filenames:
+                content = self.read(filename).decode(self.encoding)
+                if ext == ".css":
+                    content = CSS_CHARSET.sub("", content)
+                    content = rebase_css(content, os.path.dirname(filename),
+                                         self.static)
+                parts.append(content)
+            separator = "\n" if ext == ".css" else ";\n"
+            self.bundles[key] = self.write(
+                self.static, "bundle", ext,
+                separator.join(parts).encode(self.encoding))
+        return self.bundles[key]
+
+    def resolve(self, page_dir, url):
+        '''
+        Returns the static file referenced by url from a page in page_dir or
+        None if url doesn't reference a static file.
+        '''
+        if not url or not is_relative_url(url) or "?" in url or "#" in url:
+            return None
+        filename = os.path.normpath(os.path.join(page_dir, url))
+        if filename.startswith(self.static + os.sep) and os.path.isfile(
+                filename):
+            return filename
+        return None
+
+    def get_asset(self, page_dir, tag, run):
+        '''
+        Returns (url attribute, static file, bundleable) for a tag or None
+        if the tag doesn't reference a static file.
+        '''
+        attributes = dict((match.group(1).lower(),
+                           match.group(2) if match.group(2) is not None
+                           else match.group(3))
+                          for match in ATTRIBUTE.finditer(tag))
+        if run is LINK_RUN:
+            attribute, allowed = "href", set(["rel", "href", "type"])
+            bundleable = (attributes.get("rel") == "stylesheet" and
+                          attributes.get("type", "text/css") == "text/css")
+        else:
+            attribute, allowed = "src", set(["src", "type"])
+            bundleable = (attributes.get("type", "text/javascript") ==
+                          "text/javascript")
+
+        filename = self.resolve(page_dir, attributes.get(attribute))
+        if filename is None:
+            return None
+        bundleable = (bundleable and set(attributes) <= allowed and
+                      filename.endswith(".css" if run is LINK_RUN
+                                        else ".js"))
+        return attribute, filename, bundleable
+
+    def rewrite_run(self, page_dir, run, text):
+        '''
+        Rewrites a run of adjacent tags, bundling consecutive stylesheets or
+        scripts. Browsers ignore @import rules below the top of a stylesheet,
+        so stylesheets with @import rules start a new bundle.
+        '''
+        tags = []
+        for match in TAG[run].finditer(text):
+            asset = self.get_asset(page_dir, match.group(0), run)
+            tags.append((match, asset))
+
+        def url(filename):
+            return os.path.relpath(filename, page_dir).replace(os.sep, "/")
+
+        ext = ".css" if run is LINK_RUN else ".js"
+        result, position, index = [], 0, 0
+        while index < len(tags):
+            match, asset = tags[index]
+            end = index + 1
+            if self.bundle and asset and asset[2]:
+                while (end < len(tags) and tags[end][1] and
+                       tags[end][1][2] and not (
+                           ext == ".css" and
+                           self.has_import(tags[end][1][1]))):
+                    end += 1
+
+            result.append(text[position:match.start()])
+            if end - index > 1:
+                bundle = self.make_bundle(
+                    [asset[1] for _, asset in tags[index:end]], ext)
+                result.append(self.replace_url(match.group(0), asset[0],
+                                               url(bundle)))
+            elif asset:
+                result.append(self.replace_url(
+                    match.group(0), asset[0], url(self.fingerprint(asset[1]))))
+            else:
+                result.append(match.group(0))
+            position = tags[end - 1][0].end()
+            index = end
+
+        result.append(text[position:])
+        return "".join(result)
+
+    def replace_url(self, tag, attribute, url):
+        '''
+        Replaces the value of the given attribute of a tag.
+        '''
+        return re.sub(r"""(\b%s\s*=\s*)(["'])[^"']*\2""" % attribute,
+                      lambda match: "%s%s%s%s" % (match.group(1),
+                                                  match.group(2), url,
+                                                  match.group(2)),
+                      tag, count=1)
+
+    def rewrite_page(self, filename):
+        '''
+        Rewrites the static asset references of a page.
+        '''
+        with open(filename, "rb") as f:
+            html = f.read().decode(self.encoding)
+
+        page_dir = os.path.dirname(filename)
+        rewritten = html
+        for run in [LINK_RUN, SCRIPT_RUN]:
+            rewritten = run.sub(
+                lambda match: self.rewrite_run(page_dir, run,
+                                               match.group(0)),
+                rewritten)
+
+        if rewritten != html:
+            with open(filename, "wb") as f:
+                f.write(rewritten.encode(self.encoding))
+
+    def run(self):
+        '''
+        Rewrites all pages of the output directory.
+        '''
+        for root, dirs, names in os.walk(self.outdir):
+            if root == self.outdir and "_static" in dirs:
+                dirs.remove("_static")
+            for name in names:
+                if name.endswith(".html"):
+                    self.rewrite_page(os.path.join(root, name))
+
+
+def process_assets(app, exception):
+    '''
+    Fingerprints and bundles static assets once the build is finished.
+    '''
+    if exception is not None or not app.config.fingerprint_static:
+        return
+
+    Pipeline(app.outdir, app.config.html_output_encoding,
+             app.config.bundle_static).run()
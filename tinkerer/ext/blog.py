@@ -8,8 +8,14 @@
     CONTRIBUTORS file)
     :license: FreeBSD, see LICENSE file
 '''
-from tinkerer.ext import (aggregator, author, filing, html5, metadata, patch,
-                          readmore, rss, uistr)
+import os
+import sys
+import tinkerer
+from tinkerer import writer
+from tinkerer.ext import (aggregator, api, assets, author, compress, filing,
+                          hashes, highlight, html5, images, metadata, parallel,
+                          patch, readmore, related, rss, search, sidebar,
+                          sitemap, uistr)
 import gettext
 
 
@@ -21,9 +27,25 @@ def initialize(app):
     if not app.config.website[-1] == "/":
         app.config.website += "/"
 
+    # reuse compiled theme templates across builds
+    templates = getattr(app.builder, "templates", None)
+    if app.config.template_bytecode_cache and hasattr(templates,
+                                                      "environment"):
+        templates.environment.bytecode_cache = writer.get_bytecode_cache()
+
     # initialize other components
     metadata.initialize(app)
     filing.initialize(app)
+    hashes.initialize(app)
+    search.initialize(app)
+    readmore.initialize(app)
+    sidebar.initialize(app)
+    highlight.initialize(app)
+    images.initialize(app)
+
+    # monkey-patch Sphinx parallel executor so -j builds don't fail, until
+    # the build is finished
+    parallel.patch_parallel_tasks(app)
 
     # localization
     languages = [app.config.language] if app.config.language else None
@@ -63,11 +85,52 @@ def source_read(app, docname, source):
     metadata.get_metadata(app, docname, source)
 
 
+def doctree_read(app, doctree):
+    '''
+    Processes document after it is read.
+    '''
+    hashes.record_hash(app, doctree)
+    search.collect_terms(app, doctree)
+    readmore.mark_excerpt(app, doctree)
+
+
+def doctree_resolved(app, doctree, docname):
+    '''
+    Processes document after references are resolved, before it is written.
+    '''
+    readmore.collect_excerpt(app, doctree, docname)
+
+
+def env_purge_doc(app, env, docname):
+    '''
+    Removes blog data of a document before it is re-read.
+    '''
+    metadata.purge_metadata(app, env, docname)
+    filing.purge_filing(app, env, docname)
+    hashes.purge_hash(app, env, docname)
+
+
+def env_merge_info(app, env, docnames, other):
+    '''
+    Merges blog data collected by parallel readers.
+    '''
+    metadata.merge_metadata(app, env, docnames, other)
+    filing.merge_filing(app, env, docnames, other)
+    hashes.merge_hashes(app, env, docnames, other)
+
+
 def env_updated(app, env):
     '''
     Processes data after environment is updated (all docs are read).
     '''
     metadata.process_metadata(app, env)
+    related.update_related(app, env)
+    search.update_ids(app, env)
+    sitemap.update_dates(app, env)
+
+    # post bodies are collected while writing, so when the environment is
+    # reused all posts are written again for aggregated pages and feeds
+    return list(env.blog_posts)
 
 
 def html_page_context(app, pagename, templatename, context, doctree):
@@ -75,16 +138,18 @@ def html_page_context(app, pagename, templatename, context, doctree):
     Passes data to templating engine.
     '''
     metadata.add_metadata(app, pagename, context)
+    readmore.render_excerpt(app, pagename)
     rss.add_rss(app, context)
+    search.add_search(app, context)
+    api.add_api(app, context)
+    # widgets are rendered with the context of the first page of each depth
+    sidebar.add_sidebar(app, pagename, context)
 
 
 def collect_additional_pages(app):
     '''
     Generates additional pages.
     '''
-    for name, context, template in rss.generate_feed(app):
-        yield (name, context, template)
-
     for name, context, template in filing.make_tag_pages(app):
         yield (name, context, template)
 
@@ -102,6 +167,17 @@ def html_collect_pages(app):
     '''
     Collect html pages and emit event
     '''
+    # feeds are written as they are rendered so full feeds aren't held in
+    # memory
+    for name, context, template in rss.generate_feed(app):
+        rss.write_feed(app, name, context, template)
+
+    # on parallel builds, pages are rendered by worker processes instead of
+    # being handed back to Sphinx
+    if parallel.is_enabled(app):
+        parallel.write_pages(app, collect_additional_pages(app))
+        return
+
     for name, context, template in collect_additional_pages(app):
         # emit event
         app.emit("html-collected-context", name, template, context)
@@ -116,6 +192,20 @@ def html_collected_context(app, name, template, context):
         patch.patch_aggregated_metadata(context)
 
 
+def build_finished(app, exception):
+    '''
+    Post-processes output once the build is finished.
+    '''
+    # indexes and pages are written before they are compressed
+    search.write_index(app, exception)
+    sitemap.write_sitemap(app, exception)
+    api.write_api(app, exception)
+    assets.process_assets(app, exception)
+    compress.compress_output(app, exception)
+    highlight.finish(app, exception)
+    parallel.restore_parallel_tasks()
+
+
 def setup(app):
     '''
     Sets up the extension.
@@ -128,12 +218,37 @@ def setup(app):
     app.add_config_value("rss_generate_full_posts", False, True)
     app.add_config_value("website", "http://127.0.0.1/blog/html/", True)
     app.add_config_value("posts_per_page", 10, True)
+    app.add_config_value("stable_pagination", False, True)
+    app.add_config_value("aggregated_max_pages", 0, True)
     app.add_config_value("landing_page", None, True)
     app.add_config_value("first_page_title", None, True)
     # added here for consistency, slug_word_separator is used by Tinkerer
     # command line and not really needed by the Sphinx environment
     app.add_config_value("slug_word_separator", "_", True)
     app.add_config_value("rss_max_items", 0, True)
+    app.add_config_value("rss_archive_size", 0, True)
+    app.add_config_value("excerpt_words", 0, True)
+    app.add_config_value("related_posts", 0, True)
+    app.add_config_value("template_bytecode_cache", False, True)
+    app.add_config_value("fingerprint_static", False, True)
+    app.add_config_value("bundle_static", True, True)
+    app.add_config_value("blog_search", False, True)
+    app.add_config_value("blog_search_prefix_length", 2, True)
+    app.add_config_value("blog_sitemap", False, True)
+    app.add_config_value("blog_api", False, True)
+    app.add_config_value("image_widths", [], True)
+    app.add_config_value("image_sizes", "100vw", True)
+    app.add_config_value("image_lazy_loading", True, True)
+    app.add_config_value("post_header_links", True, True)
+    app.add_config_value("highlight_cache_size", 10000, True)
+    app.add_config_value("sidebar_cache", ["recent.html", "tags_cloud.html",
+                                           "categories.html", "tags.html"],
+                         True)
+    app.add_config_value("precompress", False, True)
+    app.add_config_value("precompress_min_size", 1024, True)
+    app.add_config_value("precompress_extensions",
+                         [".html", ".xml", ".css", ".js", ".json", ".svg"],
+                         True)
 
     # new directives
     app.add_directive("author", author.AuthorDirective)
@@ -150,10 +265,26 @@ def setup(app):
     # event handlers
     app.connect("builder-inited", initialize)
     app.connect("source-read", source_read)
+    app.connect("doctree-read", doctree_read)
+    app.connect("doctree-resolved", doctree_resolved)
+    app.connect("env-purge-doc", env_purge_doc)
+    app.connect("env-merge-info", env_merge_info)
     app.connect("env-updated", env_updated)
     app.connect("html-page-context", html_page_context)
     app.connect("html-collect-pages", html_collect_pages)
     app.connect("html-collected-context", html_collected_context)
+    app.connect("build-finished", build_finished)
+
+    # extensions can be placed under the blog "_exts" directory
+    exts = os.path.join(app.confdir, "_exts")
+    if exts not in sys.path:
+        sys.path.append(exts)
+
+    # blog translator emits HTML5 and responsive images
+    app.set_translator("html", html5.HTML5Translator)
 
-    # monkey-patch Sphinx html translator to emit proper HTML5
-    html5.patch_translator()
+    # documents can be read in parallel but post bodies are collected while
+    # writing so the write must stay in the main process
+    return {"version": tinkerer.__version__,
+            "parallel_read_safe": True,
+            "parallel_write_safe": False}
@@ -0,0 +1,130 @@
+'''
+    compress
+    ~~~~~~~~
+
+    Writes precompressed .gz siblings (and .br siblings if the brotli module
+    is installed) of text output files so web servers can serve them as they
+    are, for example with the nginx gzip_static module.
+
+    Compressed files are cached by content hash in the per-user cache, one
+    cache per output directory, so files which didn't change since the
+    previous build are not compressed again, even after a clean build.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import gzip
+import hashlib
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+import os
+import shutil
+from tinkerer import utils
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    # Python 2
+    from StringIO import StringIO as BytesIO
+except ImportError:
+    # Python 3
+    from io import BytesIO
+
+
+def gzip_compress(data):
+    '''
+    Returns data compressed with gzip. The header has no file name or time
+    so the output only depends on data.
+    '''
+    buf = BytesIO()
+    with gzip.GzipFile(filename="", mode="wb", fileobj=buf, compresslevel=9,
+                       mtime=0) as f:
+        f.write(data)
+    return buf.getvalue()
+
+
+def get_encodings():
+    '''
+    Returns (suffix, compress function) of the available encodings.
+    '''
+    encodings = [(".gz", gzip_compress)]
+    if brotli is not None:
+        encodings.append((".br", brotli.compress))
+    return encodings
+
+
+def find_files(outdir, extensions, min_size):
+    '''
+    Returns the output files with one of the given extensions and at least
+    min_size bytes.
+    '''
+    files = []
+    for root, dirs, names in os.walk(outdir):
+        dirs.sort()
+        for name in sorted(names):
+            filename = os.path.join(root, name)
+            if (os.path.splitext(name)[1] in extensions and
+                    os.path.getsize(filename) >= min_size):
+                files.append(filename)
+    return files
+
+
+def compress_file(filename, cache, encodings):
+    '''
+    Writes the compressed siblings of a file, copying them from the cache if
+    the same content was compressed before. Returns the cached files used.
+    '''
+    with open(filename, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha1(data).hexdigest()
+
+    used = []
+    for suffix, compress in encodings:
+        cached = os.path.join(cache, digest + suffix)
+        if not os.path.exists(cached):
+            # write to a temporary file so concurrent builds never copy a
+            # partially written file
+            temp = "%s.%d.tmp" % (cached, os.getpid())
+            with open(temp, "wb") as f:
+                f.write(compress(data))
+            os.rename(temp, cached)
+        shutil.copyfile(cached, filename + suffix)
+        used.append(cached)
+    return used
+
+
+def compress_output(app, exception):
+    '''
+    Compresses the output once the build is finished.
+    '''
+    if exception is not None or not app.config.precompress:
+        return
+
+    # unused files are removed from the cache below, so builds writing to
+    # other output directories, like theme builds, get their own cache
+    cache = utils.get_path(utils.get_cache_path(
+        app.srcdir, "precompressed",
+        hashlib.sha1(os.path.abspath(app.outdir).encode("utf-8")).hexdigest()))
+
+    encodings = get_encodings()
+    files = find_files(app.outdir, app.config.precompress_extensions,
+                       app.config.precompress_min_size)
+
+    # zlib and brotli release the GIL while compressing
+    pool = ThreadPool(cpu_count())
+    try:
+        used = pool.map(lambda filename: compress_file(filename, cache,
+                                                       encodings), files)
+    finally:
+        pool.close()
+
+    # forget content which is no longer part of the output
+    used = set(cached for cached_files in used for cached in cached_files)
+    for name in os.listdir(cache):
+        cached = os.path.join(cache, name)
+        if cached not in used and not name.endswith(".tmp"):
+            os.remove(cached)
@@ -5,6 +5,11 @@
     Handler for `comments` directive using Disqus.
     Disqus shortname must be provided in `conf.py` as `disqus_shortname`.
 
+    With `disqus_lazy_load` set, pages don't get inline scripts. The thread
+    container and comment count links carry the Disqus configuration in
+    data- attributes and `disqus.js` loads Disqus only once they scroll into
+    view.
+
     :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
     CONTRIBUTORS file)
     :license: FreeBSD, see LICENSE file
@@ -34,6 +39,18 @@ def create_thread(disqus_shortname, identifier):
 '</noscript>' % (disqus_shortname, identifier))
 
 
+def create_lazy_thread(disqus_shortname, identifier):
+    '''
+    Returns the container of a Disqus thread loaded once it becomes visible.
+    '''
+    return str(
+'<div id="disqus_thread" data-disqus-shortname="%s"'
+' data-disqus-identifier="%s"></div>'
+'<noscript>Please enable JavaScript to view the '
+'   <a href=\"http://disqus.com/?ref_noscript\">comments powered by Disqus.</a>'
+'</noscript>' % (disqus_shortname, identifier))
+
+
 def enable_count(disqus_shortname):
     '''
     Returns JS code required to enable comment counting on a page.
@@ -47,10 +64,15 @@ def enable_count(disqus_shortname):
 
 
 
-def get_count(link, identifier):
+def get_count(link, identifier, disqus_shortname=None):
     '''
-    Returns HTML required by Disqus to retrieve comment count.
+    Returns HTML required by Disqus to retrieve comment count. Links given a
+    shortname load comment counts lazily.
     '''
+    if disqus_shortname:
+        return str('<a href="%s#disqus_thread" data-disqus-identifier="%s" '
+                   'data-disqus-shortname="%s">%s</a>' %
+                (link, identifier, disqus_shortname, "Leave a comment"))
     return str('<a href="%s#disqus_thread" data-disqus-identifier="%s">%s</a>' % 
             (link, identifier, "Leave a comment"))
 
@@ -65,6 +87,7 @@ def add_disqus_block(app, pagename, templatename, context, doctree):
         return
 
     env = app.builder.env
+    lazy = app.config.disqus_lazy_load
 
     # append disqus.js if not already in context
     if DISQUS_SCRIPT not in context["script_files"]:
@@ -72,16 +95,23 @@ def add_disqus_block(app, pagename, templatename, context, doctree):
 
     # if page is blog post and has comments
     if pagename in env.blog_metadata and env.blog_metadata[pagename].comments:
-        context["comments"] = create_thread(app.config.disqus_shortname, pagename)
+        if lazy:
+            context["comments"] = create_lazy_thread(
+                    app.config.disqus_shortname, pagename)
+        else:
+            context["comments"] = create_thread(
+                    app.config.disqus_shortname, pagename)
 
         # store code required to retrieve comment count for this post in metadata
         env.blog_metadata[pagename].comment_count = get_count(
                 "%s%s.html" % (app.config.website,
                                 env.blog_metadata[pagename].link),
-                pagename)
+                pagename,
+                app.config.disqus_shortname if lazy else None)
 
-    # just enable comment counting on the page
-    else:
+    # just enable comment counting on the page, lazily loaded counts are
+    # enabled by disqus.js from the links themselves
+    elif not lazy:
         context["comment_enabler"] = enable_count(app.config.disqus_shortname)
 
 
@@ -93,6 +123,13 @@ def setup(app):
     # disqus_shortname contains shortname provided to Disqus
     app.add_config_value("disqus_shortname", None, True)
 
+    # load threads and comment counts once they scroll into view
+    app.add_config_value("disqus_lazy_load", False, True)
+
     # connect event
     app.connect("html-page-context", add_disqus_block)
 
+    # comment counts are stored in the environment while writing
+    return {"parallel_read_safe": True,
+            "parallel_write_safe": False}
+
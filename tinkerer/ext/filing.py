@@ -43,7 +43,8 @@ def create_filing_directive(name):
                     env.filing[name][item] = []
                 env.filing[name][item].append(env.docname)
                 env.blog_metadata[env.docname].filing[name].append(
-                    (utils.name_from_title(item), item))
+                    (utils.name_from_title(
+                        item, env.config.slug_word_separator), item))
 
             return []
 
@@ -52,9 +53,39 @@ def create_filing_directive(name):
 
 def initialize(app):
     '''
-    Initializes tags and categories.
+    Initializes tags and categories unless already loaded with the
+    environment from a previous build.
     '''
-    app.builder.env.filing = {"tags": dict(), "categories": dict()}
+    if not hasattr(app.builder.env, "filing"):
+        app.builder.env.filing = {"tags": dict(), "categories": dict()}
+
+
+def purge_filing(app, env, docname):
+    '''
+    Removes a document about to be re-read or removed from all tags and
+    categories.
+    '''
+    for name in ["tags", "categories"]:
+        for item, posts in list(env.filing[name].items()):
+            if docname in posts:
+                posts[:] = [post for post in posts if post != docname]
+                if not posts:
+                    del env.filing[name][item]
+
+
+def merge_filing(app, env, docnames, other):
+    '''
+    Merges tags and categories of the given documents read by a parallel
+    worker.
+    '''
+    for name in ["tags", "categories"]:
+        for item, posts in other.filing[name].items():
+            posts = [post for post in posts if post in docnames]
+            if not posts:
+                continue
+            if item not in env.filing[name]:
+                env.filing[name][item] = []
+            env.filing[name][item].extend(posts)
 
 
 def make_archive_page(env, title, pagename, post_filter=None):
@@ -93,7 +124,8 @@ def make_tag_pages(app):
         yield make_archive_page(
             env,
             UIStr.TAGGED_WITH_FMT % tag,
-            "tags/" + utils.name_from_title(tag),
+            "tags/" + utils.name_from_title(
+                tag, app.config.slug_word_separator),
             lambda post: post in env.filing["tags"][tag])
 
 
@@ -106,5 +138,6 @@ def make_category_pages(app):
         yield make_archive_page(
             env,
             UIStr.FILED_UNDER_FMT % category,
-            "categories/" + utils.name_from_title(category),
+            "categories/" + utils.name_from_title(
+                category, app.config.slug_word_separator),
             lambda post: post in env.filing["categories"][category])
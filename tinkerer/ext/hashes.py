@@ -0,0 +1,113 @@
+'''
+    hashes
+    ~~~~~~
+
+    Content-hash change detection. Sphinx re-reads a document when its source
+    or one of its dependencies is newer than the last read, so a fresh
+    checkout re-reads everything. The hash of each document's sources is
+    stored in the environment and documents whose sources didn't change are
+    marked as read after their current modification times.
+
+    Hashes are only trusted while conf.py and the templates are unchanged,
+    otherwise modification times decide as usual.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import hashlib
+import os
+
+
+def hash_files(filenames, root=None):
+    '''
+    Returns the hex digest of the content of the given files. If root is
+    given, paths relative to it are hashed too so renames are detected.
+    '''
+    digest = hashlib.sha1()
+    for filename in filenames:
+        if root:
+            digest.update(os.path.relpath(filename, root).encode("utf-8"))
+        with open(filename, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def source_files(env, docname):
+    '''
+    Returns the source of a document followed by its dependencies.
+    '''
+    return [env.doc2path(docname)] + [
+        os.path.join(env.srcdir, dependency)
+        for dependency in sorted(env.dependencies.get(docname, ()))]
+
+
+def config_hash(app):
+    '''
+    Returns the hash of conf.py and all files under the templates path.
+    '''
+    filenames = [os.path.join(app.confdir, "conf.py")]
+    for templates in app.config.templates_path:
+        for root, dirs, files in os.walk(os.path.join(app.confdir,
+                                                      templates)):
+            dirs.sort()
+            filenames += [os.path.join(root, name) for name in sorted(files)]
+    return hash_files([filename for filename in filenames
+                       if os.path.isfile(filename)], app.confdir)
+
+
+def initialize(app):
+    '''
+    Marks documents whose sources didn't change since they were hashed as up
+    to date. Called once the environment of the previous build is loaded and
+    before Sphinx looks for outdated documents.
+    '''
+    env = app.builder.env
+    if not hasattr(env, "blog_source_hashes"):
+        env.blog_source_hashes = dict()
+
+    config = config_hash(app)
+    if getattr(env, "blog_config_hash", None) != config:
+        env.blog_config_hash = config
+        env.blog_source_hashes.clear()
+        return
+
+    for docname, digest in env.blog_source_hashes.items():
+        if docname not in env.all_docs:
+            continue
+        filenames = source_files(env, docname)
+        try:
+            if hash_files(filenames) != digest:
+                continue
+            env.all_docs[docname] = max(
+                [env.all_docs[docname]] +
+                [os.path.getmtime(filename) for filename in filenames])
+        except (IOError, OSError):
+            # missing sources are handled by Sphinx
+            continue
+
+
+def record_hash(app, doctree):
+    '''
+    Stores the hash of the sources of a document once it is read.
+    '''
+    env = app.builder.env
+    env.blog_source_hashes[env.docname] = hash_files(
+        source_files(env, env.docname))
+
+
+def purge_hash(app, env, docname):
+    '''
+    Removes the hash of a document about to be re-read or removed.
+    '''
+    env.blog_source_hashes.pop(docname, None)
+
+
+def merge_hashes(app, env, docnames, other):
+    '''
+    Merges hashes of the given documents read by a parallel worker.
+    '''
+    for docname in docnames:
+        if docname in other.blog_source_hashes:
+            env.blog_source_hashes[docname] = \
+                other.blog_source_hashes[docname]
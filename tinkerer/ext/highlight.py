@@ -0,0 +1,159 @@
+'''
+    highlight
+    ~~~~~~~~~
+
+    Cache of highlighted code blocks, kept across builds in the per-user
+    cache.
+    Blocks are keyed by their code, lexer, options, Pygments version and
+    style, so Pygments only runs for blocks which changed. Each block is
+    cached in its own file and files are evicted least recently used first
+    once the cache holds more than highlight_cache_size blocks.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import hashlib
+import io
+import json
+import os
+import pygments
+from tinkerer import utils
+
+
+# cache directory, under the blog directory of the per-user cache
+CACHE_DIR = "highlight"
+
+
+class HighlightCache(object):
+    '''
+    Highlighter serving code blocks from the cache and highlighting them
+    with the Sphinx highlighter on misses.
+    '''
+
+    def __init__(self, highlighter, path):
+        '''
+        Initializes the cache of the given Sphinx highlighter.
+        '''
+        self.highlighter = highlighter
+        self.path = path
+        self.hits, self.misses = 0, 0
+
+        style = highlighter.formatter_args.get("style")
+        self.settings = [pygments.__version__, highlighter.dest,
+                         "%s.%s" % (style.__module__, style.__name__),
+                         highlighter.trim_doctest_flags]
+
+    def __getattr__(self, name):
+        '''
+        Delegates to the Sphinx highlighter.
+        '''
+        return getattr(self.highlighter, name)
+
+    def get_filename(self, source, lang, opts, kwargs):
+        '''
+        Returns the cache file of a code block.
+        '''
+        key = json.dumps([source, lang, opts, kwargs] + self.settings,
+                         sort_keys=True, default=repr)
+        return os.path.join(self.path, "%s.html" % hashlib.sha1(
+            key.encode("utf-8")).hexdigest())
+
+    def highlight_block(self, source, lang, opts=None, warn=None,
+                        force=False, **kwargs):
+        '''
+        Returns a highlighted code block from the cache or highlights it.
+        Blocks which raised warnings are not cached, so they warn again on
+        the next build.
+        '''
+        filename = self.get_filename(source, lang, opts, kwargs)
+        try:
+            with io.open(filename, "r", encoding="utf-8") as f:
+                highlighted = f.read()
+            # the modification time tracks the last use
+            os.utime(filename, None)
+            self.hits += 1
+            return highlighted
+        except (IOError, OSError):
+            pass
+
+        self.misses += 1
+        warnings = []
+
+        def record_warning(*args, **kwds):
+            warnings.append(args)
+            if warn:
+                warn(*args, **kwds)
+
+        highlighted = self.highlighter.highlight_block(
+            source, lang, opts=opts, warn=record_warning if warn else None,
+            force=force, **kwargs)
+        if not warnings:
+            if not os.path.exists(self.path):
+                os.makedirs(self.path)
+            # write to a temporary file so an interrupted build doesn't
+            # leave a truncated block in the cache
+            temp = "%s.%d.tmp" % (filename, os.getpid())
+            with io.open(temp, "w", encoding="utf-8") as f:
+                f.write(highlighted)
+            os.rename(temp, filename)
+        return highlighted
+
+    def evict(self, size):
+        '''
+        Removes the least recently used blocks above the given number.
+        '''
+        if not os.path.isdir(self.path):
+            return
+        filenames = [os.path.join(self.path, name)
+                     for name in os.listdir(self.path)]
+        if len(filenames) <= size:
+            return
+
+        # theme builds of the blog share the cache, so files can be removed
+        # by another build meanwhile
+        used = []
+        for filename in filenames:
+            try:
+                used.append((os.path.getmtime(filename), filename))
+            except OSError:
+                pass
+        used.sort()
+        for _, filename in used[:len(used) - size]:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+
+def initialize(app):
+    '''
+    Wraps the highlighter of the builder with the cache.
+    '''
+    app.blog_highlight_cache = None
+    highlighter = getattr(app.builder, "highlighter", None)
+    if app.config.highlight_cache_size > 0 and highlighter is not None:
+        app.blog_highlight_cache = HighlightCache(
+            highlighter, utils.get_cache_path(app.srcdir, CACHE_DIR))
+
+
+def get_highlighter(builder):
+    '''
+    Returns the highlighter used by the blog translator.
+    '''
+    return builder.app.blog_highlight_cache or builder.highlighter
+
+
+def finish(app, exception):
+    '''
+    Evicts blocks above the cache size and reports cache hits and misses
+    once the build is finished.
+    '''
+    cache = app.blog_highlight_cache
+    if exception is not None or cache is None:
+        return
+
+    cache.evict(app.config.highlight_cache_size)
+    if cache.hits or cache.misses:
+        app.info("highlight cache: %d hit(s), %d miss(es)" % (
+            cache.hits, cache.misses))
@@ -2,67 +2,145 @@
     html5
     ~~~~~
 
-    Monkey-patch Sphinx HTML translator to emit HTML5.
+    HTML5 translator of the blog, registered for the html builder instead of
+    patching the Sphinx translator. Sections are emitted as <section>,
+    literals as <span>, images and embedded iframes are loaded lazily,
+    headline permalinks can be left out of posts and code blocks are
+    highlighted through the highlight cache.
 
     :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
     CONTRIBUTORS file)
     :license: FreeBSD, see LICENSE file.
 """
-from sphinx.writers.html import HTMLTranslator
+import re
+from sphinx.writers.html import SmartyPantsHTMLTranslator
+from tinkerer.ext import highlight, images
 
 
-def visit_desc_addname(self, node):
-    '''
-    Similar to Sphinx but using a <span> node instead of <tt>.
-    '''
-    self.body.append(self.starttag(node, 'span', '', CLASS='descclassname'))
+# opening tags of lazily loaded media, with their attributes and the slash
+# of empty tags
+MEDIA_TAG = re.compile(r"<(img|iframe)\b([^>]*?)\s*(/?)>", re.IGNORECASE)
 
 
-def depart_desc_addname(self, node):
+def add_lazy_loading(html):
     '''
-    Similar to Sphinx but using a <span> node instead of <tt>.
+    Adds loading and decoding attributes to the <img> and <iframe> tags of
+    html which don't have them.
     '''
-    self.body.append('</span>')
+    def add_attributes(match):
+        tag, atts, slash = match.groups()
+        if "loading=" not in atts:
+            atts += ' loading="lazy"'
+        if tag.lower() == "img" and "decoding=" not in atts:
+            atts += ' decoding="async"'
+        return "<%s%s%s>" % (tag, atts, " /" if slash else "")
+    return MEDIA_TAG.sub(add_attributes, html)
 
 
-def visit_desc_name(self, node):
+class HTML5Translator(SmartyPantsHTMLTranslator):
     '''
-    Similar to Sphinx but using a <span> node instead of <tt>.
+    Sphinx HTML translator emitting HTML5.
     '''
-    self.body.append(self.starttag(node, 'span', '', CLASS='descname'))
-
 
-def depart_desc_name(self, node):
-    '''
-    Similar to Sphinx but using a <span> node instead of <tt>.
-    '''
-    self.body.append('</span>')
-
-
-def visit_literal(self, node):
-    '''
-    Similar to Sphinx but using a <span> node instead of <tt>.
-    '''
-    self.body.append(self.starttag(node, 'span', '',
-                                   CLASS='docutils literal'))
-    self.protect_literal_text += 1
-
-
-def depart_literal(self, node):
-    '''
-    Similar to Sphinx but using a <span> node instead of <tt>.
-    '''
-    self.protect_literal_text -= 1
-    self.body.append('</span>')
-
-
-def patch_translator():
-    '''
-    Monkey-patch Sphinx translator to emit proper HTML5.
-    '''
-    HTMLTranslator.visit_desc_addname = visit_desc_addname
-    HTMLTranslator.depart_desc_addname = depart_desc_addname
-    HTMLTranslator.visit_desc_name = visit_desc_name
-    HTMLTranslator.depart_desc_name = depart_desc_name
-    HTMLTranslator.visit_literal = visit_literal
-    HTMLTranslator.depart_literal = depart_literal
+    def __init__(self, *args, **kwds):
+        SmartyPantsHTMLTranslator.__init__(self, *args, **kwds)
+        if not self.builder.config.html_use_smartypants:
+            # quotes and dashes are only converted while this is 0
+            self.no_smarty = 1
+        # code blocks are served from the highlight cache
+        self.highlighter = highlight.get_highlighter(self.builder)
+
+    def add_lazy_loading(self, start):
+        '''
+        Adds lazy loading to media tags appended to the body since start.
+        '''
+        if self.builder.config.image_lazy_loading:
+            for i in range(start, len(self.body)):
+                self.body[i] = add_lazy_loading(self.body[i])
+
+    def visit_section(self, node):
+        '''
+        Similar to docutils but using a <section> node instead of <div>.
+        '''
+        self.section_level += 1
+        self.body.append(self.starttag(node, 'section'))
+
+    def depart_section(self, node):
+        '''
+        Similar to docutils but using a <section> node instead of <div>.
+        '''
+        self.section_level -= 1
+        self.body.append('</section>\n')
+
+    def add_permalink_ref(self, node, title):
+        '''
+        Similar to Sphinx but leaves headline permalinks out of posts unless
+        post_header_links is set.
+        '''
+        metadata = self.builder.env.blog_metadata.get(
+            self.builder.current_docname)
+        if (not self.builder.config.post_header_links and
+                metadata is not None and
+                (metadata.is_post or metadata.is_article)):
+            return
+        SmartyPantsHTMLTranslator.add_permalink_ref(self, node, title)
+
+    def visit_desc_addname(self, node):
+        '''
+        Similar to Sphinx but using a <span> node instead of <tt>.
+        '''
+        self.body.append(self.starttag(node, 'span', '',
+                                       CLASS='descclassname'))
+
+    def depart_desc_addname(self, node):
+        '''
+        Similar to Sphinx but using a <span> node instead of <tt>.
+        '''
+        self.body.append('</span>')
+
+    def visit_desc_name(self, node):
+        '''
+        Similar to Sphinx but using a <span> node instead of <tt>.
+        '''
+        self.body.append(self.starttag(node, 'span', '', CLASS='descname'))
+
+    def depart_desc_name(self, node):
+        '''
+        Similar to Sphinx but using a <span> node instead of <tt>.
+        '''
+        self.body.append('</span>')
+
+    def visit_literal(self, node):
+        '''
+        Similar to Sphinx but using a <span> node instead of <tt>.
+        '''
+        self.no_smarty += 1
+        self.body.append(self.starttag(node, 'span', '',
+                                       CLASS='docutils literal'))
+        self.protect_literal_text += 1
+
+    def depart_literal(self, node):
+        '''
+        Similar to Sphinx but using a <span> node instead of <tt>.
+        '''
+        self.protect_literal_text -= 1
+        self.body.append('</span>')
+        self.no_smarty -= 1
+
+    def visit_image(self, node):
+        '''
+        Emits responsive images, loaded lazily.
+        '''
+        start = len(self.body)
+        images.visit_image(self, node)
+        self.add_lazy_loading(start)
+
+    def visit_raw(self, node):
+        '''
+        Similar to docutils but loads embedded images and iframes lazily.
+        '''
+        start = len(self.body)
+        try:
+            SmartyPantsHTMLTranslator.visit_raw(self, node)
+        finally:
+            self.add_lazy_loading(start)
@@ -0,0 +1,145 @@
+'''
+    images
+    ~~~~~~
+
+    Responsive images. When image_widths is set, raster images are written
+    in each of the configured widths smaller than the original and the <img>
+    tag gets srcset, sizes, width and height attributes. Resized
+    images are cached by source hash in the per-user cache so they are only
+    encoded again when the source changes, even after a clean build.
+
+    Resizing needs Pillow, without it images are emitted as usual.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import hashlib
+import os
+import posixpath
+import shutil
+from docutils import nodes
+from sphinx.writers.html import HTMLTranslator
+from tinkerer import utils
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+# Sphinx implementation, used for images which are not resized
+sphinx_visit_image = HTMLTranslator.visit_image
+
+# extensions of images which can be resized
+RESIZABLE = [".png", ".jpg", ".jpeg", ".webp"]
+
+
+def initialize(app):
+    '''
+    Initializes the image sources read during the build.
+    '''
+    app.blog_image_sources = {}
+
+
+def get_source(builder, filename):
+    '''
+    Returns the content hash and (width, height) of an image. Images are
+    only read once per build.
+    '''
+    sources = builder.app.blog_image_sources
+    if filename not in sources:
+        with open(filename, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        with Image.open(filename) as image:
+            sources[filename] = digest, image.size
+    return sources[filename]
+
+
+def resize(source, destination, width, size):
+    '''
+    Writes the source image scaled to the given width.
+    '''
+    height = max(int(round(size[1] * width / float(size[0]))), 1)
+    options = {"optimize": True}
+    with Image.open(source) as image:
+        if image.format == "JPEG":
+            options["quality"] = 85
+        image.resize((width, height), Image.LANCZOS).save(
+            destination, image.format, **options)
+
+
+def make_derivative(translator, source, name, width, digest, size):
+    '''
+    Writes a resized image to the output directory, reusing the cached one if
+    the source was resized before. Returns the file name of the image.
+    '''
+    builder = translator.builder
+    stem, ext = os.path.splitext(name)
+    derivative = "%s-%dw%s" % (stem, width, ext)
+
+    cache = utils.get_cache_path(builder.srcdir, "images")
+    cached = os.path.join(cache, "%s-%d%s" % (digest, width, ext))
+    if not os.path.exists(cached):
+        utils.get_path(cache)
+        # write to a temporary file so a failed resize doesn't leave a
+        # broken image in the cache
+        temp = "%s.%d.tmp%s" % (cached, os.getpid(), ext)
+        resize(source, temp, width, size)
+        os.rename(temp, cached)
+
+    outdir = os.path.join(builder.outdir, builder.imagedir)
+    if not os.path.exists(outdir):
+        os.makedirs(outdir)
+    shutil.copyfile(cached, os.path.join(outdir, derivative))
+    return derivative
+
+
+def visit_image(self, node):
+    '''
+    Emits a responsive <img> tag for raster images of the environment with
+    no explicit size, or calls Sphinx otherwise. Called by the blog
+    translator.
+    '''
+    config = self.builder.config
+    uri = node["uri"]
+    if (not config.image_widths or Image is None or
+            uri not in self.builder.images or
+            os.path.splitext(uri)[1].lower() not in RESIZABLE or
+            any(option in node for option in ["width", "height", "scale"])):
+        return sphinx_visit_image(self, node)
+
+    source = os.path.join(self.builder.srcdir, uri)
+    try:
+        digest, size = get_source(self.builder, source)
+    except (IOError, OSError):
+        return sphinx_visit_image(self, node)
+
+    name = self.builder.images[uri]
+    node["uri"] = posixpath.join(self.builder.imgpath, name)
+
+    atts = {"src": node["uri"], "alt": node.get("alt", uri),
+            "width": str(size[0]), "height": str(size[1])}
+
+    widths = sorted(set(width for width in config.image_widths
+                        if width < size[0]))
+    if widths:
+        candidates = [
+            "%s %dw" % (posixpath.join(self.builder.imgpath, make_derivative(
+                self, source, name, width, digest, size)), width)
+            for width in widths]
+        candidates.append("%s %dw" % (node["uri"], size[0]))
+        atts["srcset"] = ", ".join(candidates)
+        atts["sizes"] = config.image_sizes
+
+    if "align" in node:
+        atts["class"] = "align-%s" % node["align"]
+
+    if (isinstance(node.parent, nodes.TextElement) or
+            (isinstance(node.parent, nodes.reference) and
+             not isinstance(node.parent.parent, nodes.TextElement))):
+        # inline or surrounded by <a>...</a>
+        suffix = ""
+    else:
+        suffix = "\n"
+    self.body.append(self.emptytag(node, "img", suffix, **atts))
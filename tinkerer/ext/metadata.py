@@ -16,15 +16,19 @@ from sphinx.util.compat import Directive
 from babel.core import Locale
 from babel.dates import format_date
 import tinkerer
+from tinkerer.ext.aggregator import get_home
+from tinkerer.ext.related import get_related
 from tinkerer.ext.uistr import UIStr
 from tinkerer.utils import name_from_title
 
 
 def initialize(app):
     '''
-    Initializes metadata in environment.
+    Initializes metadata in environment. Metadata of an environment loaded
+    from a previous build is kept for documents that are not re-read.
     '''
-    app.builder.env.blog_metadata = dict()
+    if not hasattr(app.builder.env, "blog_metadata"):
+        app.builder.env.blog_metadata = dict()
 
 
 class Metadata:
@@ -112,8 +116,13 @@ def get_metadata(app, docname, source):
 
         # If we have one, create a date from it
         if created:
-            # print m.groups()[0]
-            date_object = datetime.datetime.strptime(created.groups()[0].strip(), '%b %d, %Y')
+            try:
+                date_object = datetime.datetime.strptime(
+                    created.groups()[0].strip(), '%b %d, %Y')
+            except ValueError:
+                env.warn(docname, "Invalid date in created directive: %s" %
+                         created.groups()[0].strip())
+                return
 
             metadata.is_article = True
             metadata.link = docname
@@ -126,7 +135,8 @@ def get_metadata(app, docname, source):
 
             return
         else:
-            app.warn('Error: No date (created directive) was found for `%s` in `blog`' % docname)
+            env.warn(docname,
+                     "No date (created directive) was found in `blog`")
             return
 
     # if it's a page
@@ -141,9 +151,15 @@ def get_metadata(app, docname, source):
     if not match:
         return
 
+    try:
+        date = datetime.datetime.strptime(match.group(), "%Y/%m/%d/")
+    except ValueError:
+        env.warn(docname, "Invalid post date in path: %s" % match.group())
+        return
+
     metadata.is_post = True
     metadata.link = docname
-    metadata.date = datetime.datetime.strptime(match.group(), "%Y/%m/%d/")
+    metadata.date = date
 
     # we format date here instead of inside template due to localization issues
     # and Python2 vs Python3 incompatibility
@@ -151,6 +167,22 @@ def get_metadata(app, docname, source):
     metadata.formatted_date_short = format_short_ui_short(metadata.date)
 
 
+def purge_metadata(app, env, docname):
+    '''
+    Removes metadata of a document about to be re-read or removed.
+    '''
+    env.blog_metadata.pop(docname, None)
+
+
+def merge_metadata(app, env, docnames, other):
+    '''
+    Merges metadata of the given documents read by a parallel worker.
+    '''
+    for docname in docnames:
+        if docname in other.blog_metadata:
+            env.blog_metadata[docname] = other.blog_metadata[docname]
+
+
 def process_metadata(app, env):
     '''
     Processes metadata after all sources are read - the function determines
@@ -180,8 +212,12 @@ def process_metadata(app, env):
                 elif env.blog_metadata[doc].is_page:
                     env.blog_pages.append(doc)
 
-    # Get all docs not in the master doc (unrelated article items)
-    unrelated_posts = [x for x in env.blog_metadata if x not in env.blog_posts]
+    # Get all posts and articles not in the master doc (unrelated article
+    # items), pages and other documents have no date to be listed with
+    unrelated_posts = [x for x in env.blog_metadata
+                       if x not in env.blog_posts and
+                       (env.blog_metadata[x].is_post or
+                        env.blog_metadata[x].is_article)]
 
     for post in unrelated_posts:
         if post not in ['glossary', 'master']:
@@ -197,7 +233,7 @@ def process_metadata(app, env):
 
     # if using a custom landing page, that should be at the top of the nav menu
     if app.config.landing_page:
-        env.blog_page_list.insert(1, ("page1", UIStr.HOME))
+        env.blog_page_list.insert(1, (get_home(app), UIStr.HOME))
     # otherwise first aggregated page is at the top
     else:
         env.blog_page_list.insert(0, ("index", UIStr.HOME))
@@ -225,6 +261,7 @@ def add_metadata(app, pagename, context):
     context["text_tags"] = UIStr.TAGS
     context["text_tags_cloud"] = UIStr.TAGS_CLOUD
     context["text_categories"] = UIStr.CATEGORIES
+    context["text_related_posts"] = UIStr.RELATED_POSTS
 
     # recent posts
     context["recent"] = [(post, env.titles[post].astext()) for post
@@ -232,8 +269,9 @@ def add_metadata(app, pagename, context):
     # tags & categories
     tags, categories = [dict([(p, 0) for p in env.filing[c] if not
                         p.startswith('{{')]) for c in ["tags", "categories"]]
-    taglinks = dict((t, name_from_title(t)) for t in tags)
-    catlinks = dict([(c, name_from_title(c)) for c in categories])
+    word_sep = app.config.slug_word_separator
+    taglinks = dict((t, name_from_title(t, word_sep)) for t in tags)
+    catlinks = dict([(c, name_from_title(c, word_sep)) for c in categories])
 
     for post in env.blog_posts:
         p = env.blog_metadata[post]
@@ -255,6 +293,9 @@ def add_metadata(app, pagename, context):
             # save body
             env.blog_metadata[pagename].body = context["body"]
 
+            # posts sharing tags and categories
+            context["related_posts"] = get_related(env, pagename)
+
             # no prev link if first post, no next link for last post
             if pagename == env.blog_posts[0]:
                 context["prev"] = None
@@ -0,0 +1,127 @@
+'''
+    parallel
+    ~~~~~~~~
+
+    Helpers for running parts of the blog build across worker processes.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import itertools
+import sphinx
+import time
+
+try:
+    from sphinx.errors import SphinxParallelError
+    from sphinx.util.parallel import ParallelTasks, parallel_available
+except ImportError:
+    # Sphinx versions without parallel build support
+    ParallelTasks, parallel_available = None, False
+
+
+# number of pages rendered by each worker process
+PAGES_PER_TASK = 20
+
+# application dicts filled by html-page-context handlers while rendering
+# pages, workers send their new entries back to the main process
+SHARED_STATE = ["blog_sidebar_fragments"]
+
+
+# Sphinx implementation replaced by join_one during blog builds
+sphinx_join_one = (vars(ParallelTasks).get("_join_one")
+                   if ParallelTasks is not None else None)
+
+
+def join_one(self):
+    '''
+    Similar to Sphinx but drops the pipe of a finished task so it is not
+    polled (and read past EOF) again.
+    '''
+    for tid, pipe in list(self._precvs.items()):
+        if pipe.poll():
+            exc, result = pipe.recv()
+            if exc:
+                raise SphinxParallelError(*result)
+            self._result_funcs.pop(tid)(self._args.pop(tid), result)
+            self._procs.pop(tid).join()
+            del self._precvs[tid]
+            self._pworking -= 1
+            break
+    else:
+        time.sleep(0.02)
+    while self._precvsWaiting and self._pworking < self.nproc:
+        newtid, newprecv = self._precvsWaiting.popitem()
+        self._precvs[newtid] = newprecv
+        self._procs[newtid].start()
+        self._pworking += 1
+
+
+def patch_parallel_tasks(app):
+    '''
+    Monkey-patches the Sphinx parallel task executor so the parallel reads
+    of a blog build complete. Only Sphinx versions before 1.6 are patched,
+    later ones send results join_one can't read. Returns True if Sphinx was
+    patched, restore_parallel_tasks should then be called once the build is
+    finished.
+    '''
+    if (not is_enabled(app) or sphinx.version_info[:2] >= (1, 6) or
+            sphinx_join_one is None):
+        return False
+    ParallelTasks._join_one = join_one
+    return True
+
+
+def restore_parallel_tasks():
+    '''
+    Restores the Sphinx parallel task executor, so other Sphinx projects
+    built in the same process are not affected.
+    '''
+    if sphinx_join_one is not None:
+        ParallelTasks._join_one = sphinx_join_one
+
+
+def is_enabled(app):
+    '''
+    Returns True if additional pages should be rendered in parallel.
+    '''
+    return bool(parallel_available and app.parallel > 1)
+
+
+def write_pages(app, pages):
+    '''
+    Renders the given (pagename, context, template) tuples across worker
+    processes. Pages are collected in the main process and forked workers
+    inherit their contexts, so post bodies are patched by the worker writing
+    the page. Each page is written to its own file so output doesn't depend
+    on scheduling.
+
+    html-collected-context and html-page-context handlers run in the
+    workers, so changes they make to the application or environment are
+    lost, except for new entries of the SHARED_STATE dicts which are merged
+    back. Blog handlers only change the page context for collected pages,
+    apart from the sidebar fragment cache.
+    '''
+    def write_process(chunk):
+        known = dict((name, set(getattr(app, name, {})))
+                     for name in SHARED_STATE)
+        for name, context, template in chunk:
+            app.emit("html-collected-context", name, template, context)
+            app.builder.handle_page(name, context, template)
+        return dict((name, dict((key, value) for key, value
+                                in getattr(app, name, {}).items()
+                                if key not in known[name]))
+                    for name in SHARED_STATE)
+
+    def write_done(chunk, result):
+        for name, entries in result.items():
+            getattr(app, name).update(entries)
+
+    tasks = ParallelTasks(app.parallel)
+    pages = iter(pages)
+    while True:
+        chunk = list(itertools.islice(pages, PAGES_PER_TASK))
+        if not chunk:
+            break
+        tasks.add_task(write_process, chunk, write_done)
+    tasks.join()
@@ -22,8 +22,9 @@ def patch_aggregated_metadata(context):
     Patches context in aggregated pages
     """
     for metadata in context["posts"]:
+        # posts with a "more" marker are aggregated by their excerpt
         metadata.body = patch_links(
-            metadata.body,
+            metadata.excerpt or metadata.body,
             metadata.link[:11],  # first 11 characters is path (YYYY/MM/DD/)
             metadata.link[11:],  # following characters represent filename
             True)      # hyperlink title to post
@@ -83,13 +84,36 @@ def collapse_path(path_url):
     return path.normpath(path_url).replace("\\", "/").replace(":/", "://")
 
 
+def patch_url(url, docpath):
+    '''
+    Rebases a URL relative to the parent directory, like image sources, on
+    docpath and normalizes it.
+    '''
+    if url.startswith(".."):
+        url = docpath + url
+    return collapse_path(url)
+
+
+def patch_srcset(srcset, docpath):
+    '''
+    Rebases the URLs of the candidates in a srcset attribute on docpath.
+    '''
+    candidates = []
+    for candidate in srcset.split(","):
+        parts = candidate.split()
+        if parts:
+            candidates.append(" ".join([patch_url(parts[0], docpath)] +
+                                       parts[1:]))
+    return ", ".join(candidates)
+
+
 def patch_node(node, docpath, docname=None):
     for img in node.find('img'):
-        src = img.get('src', '')
-        if src.startswith(".."):
-            src = docpath + src
-        src = collapse_path(src)
-        img.set('src', src)
+        img.set('src', patch_url(img.get('src', ''), docpath))
+
+        srcset = img.get('srcset')
+        if srcset and "data:" not in srcset:
+            img.set('srcset', patch_srcset(srcset, docpath))
 
     for anchor in node.find('a'):
         ref = anchor.get('href')
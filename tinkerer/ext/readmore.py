@@ -2,7 +2,10 @@
     readmore
     ~~~~~~~~
 
-    Read more directive.
+    Read more directive and post excerpts. The excerpt of a post ends at the
+    "more" marker, or after excerpt_words words when set and the post has no
+    marker. Excerpts are cut from the resolved doctree and rendered on their
+    own, so aggregated pages and feeds don't parse full post bodies.
 
     :copyright: Copyright 2012 by Christian Jann
     :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
@@ -10,9 +13,28 @@
     :license: FreeBSD, see LICENSE file
 '''
 from docutils import nodes
+from docutils.io import StringOutput
 from sphinx.util.compat import Directive
 
 
+# HTML of the "more" marker, replaced by a link on aggregated pages and feeds
+MARKER = '<div id="more"> </div>'
+
+
+def make_marker():
+    '''
+    Returns a new "more" marker node.
+    '''
+    return nodes.raw("", MARKER, format="html")
+
+
+def is_marker(node):
+    '''
+    Returns True if node is a "more" marker.
+    '''
+    return isinstance(node, nodes.raw) and node.astext() == MARKER
+
+
 class InsertReadMoreLink(Directive):
     '''
     Sphinx extension for inserting a "Read more..." link.
@@ -22,4 +44,108 @@ class InsertReadMoreLink(Directive):
     required_arguments = 0
 
     def run(self):
-        return [nodes.raw("", '<div id="more"> </div>', format="html")]
+        return [make_marker()]
+
+
+def initialize(app):
+    '''
+    Initializes excerpts collected while writing.
+    '''
+    app.blog_excerpts = dict()
+
+
+def iter_blocks(node):
+    '''
+    Yields the visible body elements of node in document order, looking into
+    sections instead of yielding them.
+    '''
+    for child in node.children:
+        if isinstance(child, nodes.section):
+            for block in iter_blocks(child):
+                yield block
+        elif not isinstance(child, (nodes.title, nodes.Invisible,
+                                    nodes.raw)):
+            yield child
+
+
+def mark_excerpt(app, doctree):
+    '''
+    Inserts a "more" marker after the block reaching excerpt_words words in
+    posts which don't have one.
+    '''
+    env = app.builder.env
+    metadata = env.blog_metadata.get(env.docname)
+    if (not app.config.excerpt_words or metadata is None or
+            not (metadata.is_post or metadata.is_article) or
+            any(doctree.traverse(is_marker))):
+        return
+
+    words, last = 0, None
+    for block in iter_blocks(doctree):
+        if last is not None:
+            # there is more to read after the excerpt
+            last.parent.insert(last.parent.index(last) + 1, make_marker())
+            return
+        words += len(block.astext().split())
+        if words >= app.config.excerpt_words:
+            last = block
+
+
+def copy_until(node, marker):
+    '''
+    Returns a copy of node holding its content up to and including marker.
+    '''
+    ancestors = set()
+    parent = marker.parent
+    while parent is not None:
+        ancestors.add(id(parent))
+        parent = parent.parent
+
+    def copy_node(node):
+        copy = node.copy()
+        for child in node.children:
+            if child is marker:
+                copy.append(child.deepcopy())
+                break
+            if id(child) in ancestors:
+                copy.append(copy_node(child))
+                break
+            copy.append(child.deepcopy())
+        return copy
+
+    return copy_node(node)
+
+
+def collect_excerpt(app, doctree, docname):
+    '''
+    Copies the excerpt of a post once its doctree is resolved, before it is
+    changed by writing.
+    '''
+    env = app.builder.env
+    if docname not in env.blog_posts:
+        return
+
+    for marker in doctree.traverse(is_marker):
+        app.blog_excerpts[docname] = copy_until(doctree, marker)
+        break
+
+
+def render_excerpt(app, pagename):
+    '''
+    Renders the excerpt of a post while the post is written and stores the
+    HTML in its metadata.
+    '''
+    env = app.builder.env
+    if pagename not in env.blog_posts:
+        return
+
+    excerpt = app.blog_excerpts.pop(pagename, None)
+    if excerpt is None:
+        env.blog_metadata[pagename].excerpt = None
+        return
+
+    builder = app.builder
+    excerpt.settings = builder.docsettings
+    builder.docwriter.write(excerpt, StringOutput(encoding="utf-8"))
+    builder.docwriter.assemble_parts()
+    env.blog_metadata[pagename].excerpt = builder.docwriter.parts["fragment"]
@@ -0,0 +1,164 @@
+'''
+    related
+    ~~~~~~~
+
+    Related posts, computed once all documents are read. Posts are compared
+    by the tags and categories they share: each tag and category is weighted
+    by its inverse document frequency, so rare ones count more, and posts
+    are ranked by the cosine similarity of their weighted tags and
+    categories. Ties go to the newer post.
+
+    Similarities are computed from a sparse post x tag/category matrix with
+    NumPy and SciPy if these modules are installed, or from an inverted
+    index otherwise. Both only compare posts sharing a tag or category.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import heapq
+import math
+
+try:
+    import numpy
+    from scipy import sparse
+except ImportError:
+    numpy = sparse = None
+
+
+# rows of the similarity matrix computed at once
+CHUNK_SIZE = 1024
+
+# similarities are rounded so ties are broken the same way by both
+# implementations
+PRECISION = 9
+
+
+def get_features(env, posts):
+    '''
+    Returns the tags and categories of each post, as lists of
+    (filing, name) pairs.
+    '''
+    return [sorted(set((name, item[1]) for name in ["tags", "categories"]
+                       for item in env.blog_metadata[post].filing[name]))
+            for post in posts]
+
+
+def get_weights(features):
+    '''
+    Returns the inverse document frequency of each tag and category.
+    '''
+    counts = {}
+    for post_features in features:
+        for feature in post_features:
+            counts[feature] = counts.get(feature, 0) + 1
+    return dict((feature, 1 + math.log(float(len(features)) / count))
+                for feature, count in counts.items())
+
+
+def top_related(scores, count):
+    '''
+    Returns the indexes of the count posts with the highest of the given
+    {index: similarity}, newer posts first on ties.
+    '''
+    return [index for _, index in heapq.nsmallest(
+        count, [(-round(score, PRECISION), index)
+                for index, score in scores.items()])]
+
+
+def compute_python(features, weights, count):
+    '''
+    Returns the indexes of related posts of each post, accumulating
+    similarities over the posts sharing each tag or category.
+    '''
+    vectors = []
+    for post_features in features:
+        norm = math.sqrt(sum(weights[f] ** 2 for f in post_features))
+        vectors.append([(f, weights[f] / norm) for f in post_features
+                        if norm])
+
+    postings = {}
+    for index, vector in enumerate(vectors):
+        for feature, value in vector:
+            postings.setdefault(feature, []).append((index, value))
+
+    related = []
+    for index, vector in enumerate(vectors):
+        scores = {}
+        for feature, value in vector:
+            for other, other_value in postings[feature]:
+                if other != index:
+                    scores[other] = (scores.get(other, 0) +
+                                     value * other_value)
+        related.append(top_related(scores, count))
+    return related
+
+
+def compute_numpy(features, weights, count):
+    '''
+    Returns the indexes of related posts of each post from the product of
+    the sparse post x tag/category matrix with its transpose, computed a
+    chunk of rows at a time to bound memory.
+    '''
+    columns = dict((feature, column) for column, feature
+                   in enumerate(sorted(weights)))
+    rows, cols, data = [], [], []
+    for index, post_features in enumerate(features):
+        for feature in post_features:
+            rows.append(index)
+            cols.append(columns[feature])
+            data.append(weights[feature])
+
+    matrix = sparse.csr_matrix((data, (rows, cols)),
+                               shape=(len(features), len(columns)))
+    norms = numpy.sqrt(numpy.asarray(matrix.multiply(matrix).sum(axis=1)))
+    norms[norms == 0] = 1
+    matrix = sparse.csr_matrix(matrix.multiply(1 / norms))
+    transposed = matrix.T.tocsc()
+
+    related = []
+    for start in range(0, len(features), CHUNK_SIZE):
+        similarities = (matrix[start:start + CHUNK_SIZE] * transposed).tocsr()
+        for row in range(similarities.shape[0]):
+            begin, end = similarities.indptr[row], similarities.indptr[row + 1]
+            indexes = similarities.indices[begin:end]
+            scores = numpy.round(similarities.data[begin:end], PRECISION)
+            keep = (indexes != start + row) & (scores > 0)
+            indexes, scores = indexes[keep], scores[keep]
+            if len(scores) > count:
+                # only sort the candidates at least as similar as the
+                # count-th post, keeping ties
+                threshold = numpy.partition(scores, -count)[-count]
+                keep = scores >= threshold
+                indexes, scores = indexes[keep], scores[keep]
+            order = numpy.lexsort((indexes, -scores))[:count]
+            related.append([int(index) for index in indexes[order]])
+    return related
+
+
+def update_related(app, env):
+    '''
+    Computes the related posts of each post once all documents are read.
+    '''
+    env.blog_related = dict()
+    count = app.config.related_posts
+    if count <= 0 or not env.blog_posts:
+        return
+
+    posts = env.blog_posts
+    features = get_features(env, posts)
+    weights = get_weights(features)
+    if not weights:
+        return
+
+    compute = compute_numpy if numpy is not None else compute_python
+    for post, indexes in zip(posts, compute(features, weights, count)):
+        env.blog_related[post] = [posts[index] for index in indexes]
+
+
+def get_related(env, pagename):
+    '''
+    Returns [(docname, title)] of the posts related to a post.
+    '''
+    return [(post, env.blog_metadata[post].title)
+            for post in getattr(env, "blog_related", {}).get(pagename, [])]
@@ -8,7 +8,9 @@
     CONTRIBUTORS file)
     :license: FreeBSD, see LICENSE file
 '''
+import codecs
 import email.utils
+import os
 import time
 
 import pyquery
@@ -19,6 +21,8 @@ from tinkerer.ext import patch
 def remove_header_link(body):
     """Remove any headerlink class anchor tags from the body.
     """
+    if "headerlink" not in body:
+        return body
     doc = pyquery.PyQuery(body)
     doc.remove('a.headerlink')
     body = doc.html()
@@ -32,9 +36,19 @@ def add_rss(app, context):
     context["rss_service"] = app.config.rss_service
 
 
+def get_pubdate(env, post):
+    '''
+    Returns the RFC 822 publication date of a post.
+    '''
+    return email.utils.formatdate(
+        time.mktime(env.blog_metadata[post].date.timetuple()),
+        localtime=True)
+
+
 def generate_feed(app):
     '''
-    Generates RSS feed.
+    Generates RSS feed and, when rss_archive_size is set, RFC 5005 archived
+    feeds holding all posts.
     '''
     env = app.builder.env
 
@@ -43,32 +57,65 @@ def generate_feed(app):
         return
 
     posts = env.blog_posts
-    if app.config.rss_max_items > 0:
-        posts = posts[:app.config.rss_max_items]
+    archive_size = app.config.rss_archive_size
+    max_items = app.config.rss_max_items
+    if archive_size > 0:
+        # the feed holds at least the posts which are not archived yet
+        max_items = max(max_items, archive_size)
+    if max_items > 0:
+        posts = posts[:max_items]
 
     context = make_feed_context(app, None, posts)
-    yield ("rss", context, "rss.html")
+    if archive_size <= 0:
+        yield ("rss", context, "rss.html")
+        return
 
+    # archives are numbered from the oldest post and only full archives are
+    # written, so they don't change as new posts are published
+    posts = env.blog_posts
+    count = len(posts) // archive_size
+    website = app.config.website
 
-def make_feed_context(app, feed_name, posts):
-    env = app.builder.env
-    context = dict()
+    context["feed_links"] = []
+    if count:
+        context["feed_links"].append(("prev-archive",
+                                      "%srss%d.html" % (website, count)))
+    yield ("rss", context, "rss.html")
 
-    # feed items
-    context["items"] = []
+    for i in range(count):
+        context = make_feed_context(
+            app, None, posts[len(posts) - (i + 1) * archive_size:
+                             len(posts) - i * archive_size])
+        context["archive"] = True
+        context["feed_links"] = [("current", "%srss.html" % website)]
+        if i > 0:
+            context["feed_links"].append(("prev-archive",
+                                          "%srss%d.html" % (website, i)))
+        if i < count - 1:
+            context["feed_links"].append(("next-archive",
+                                          "%srss%d.html" % (website, i + 2)))
+        yield ("rss%d" % (i + 1), context, "rss.html")
+
+
+def make_feed_items(app, posts):
+    '''
+    Yields the items of a feed one at a time so bodies of all posts are not
+    patched and held at once.
+    '''
+    env = app.builder.env
     for post in posts:
         link = "%s%s.html" % (app.config.website, post)
 
-        timestamp = email.utils.formatdate(
-            time.mktime(env.blog_metadata[post].date.timetuple()),
-            localtime=True)
-
         categories = [category[1] for category in
                       env.blog_metadata[post].filing["categories"]]
 
+        body = env.blog_metadata[post].body
+        if not app.config.rss_generate_full_posts:
+            body = env.blog_metadata[post].excerpt or body
+
         description = patch.strip_xml_declaration(
             patch.patch_links(
-                env.blog_metadata[post].body,
+                body,
                 # first 11 characters of post is the path (YYYY/MM/DD/)
                 app.config.website + post[:11],
                 # following characters represent filename
@@ -78,13 +125,21 @@ def make_feed_context(app, feed_name, posts):
         )
         description = remove_header_link(description)
 
-        context["items"].append({
+        yield {
             "title": env.titles[post].astext(),
             "link": link,
             "description": description,
             "categories": categories,
-            "pubDate": timestamp
-        })
+            "pubDate": get_pubdate(env, post)
+        }
+
+
+def make_feed_context(app, feed_name, posts):
+    env = app.builder.env
+    context = dict()
+
+    # feed items, generated while the feed is written
+    context["items"] = make_feed_items(app, posts)
 
     # feed metadata
     if feed_name:
@@ -96,7 +151,36 @@ def make_feed_context(app, feed_name, posts):
     context["language"] = "en-us"
 
     # feed pubDate is equal to latest post pubDate
-    if context['items']:
-        context["pubDate"] = context["items"][0]["pubDate"]
+    if posts:
+        context["pubDate"] = get_pubdate(env, posts[0])
 
     return context
+
+
+def write_feed(app, pagename, context, template):
+    '''
+    Renders a feed like Sphinx renders pages, but writes the output as it is
+    generated instead of rendering it to a string first.
+    '''
+    builder = app.builder
+    environment = getattr(builder.templates, "environment", None)
+    if environment is None:
+        # custom template bridges can only render to a string
+        app.emit("html-collected-context", pagename, template, context)
+        builder.handle_page(pagename, context, template)
+        return
+
+    ctx = builder.globalcontext.copy()
+    ctx["pagename"] = ctx["current_page_name"] = pagename
+    ctx["encoding"] = encoding = app.config.html_output_encoding
+    ctx.update(context)
+
+    app.emit("html-collected-context", pagename, template, ctx)
+    app.emit("html-page-context", pagename, template, ctx, None)
+
+    filename = builder.get_outfilename(pagename)
+    if not os.path.exists(os.path.dirname(filename)):
+        os.makedirs(os.path.dirname(filename))
+    with codecs.open(filename, "w", encoding, "xmlcharrefreplace") as f:
+        for chunk in environment.get_template(template).generate(ctx):
+            f.write(chunk)
@@ -0,0 +1,200 @@
+'''
+    search
+    ~~~~~~
+
+    Sharded client-side search index of posts and pages. Terms of each
+    document are collected in its metadata when it is read. The index is
+    written to the _search directory as shards of terms sharing a prefix,
+    chunks of document titles and links, and a small manifest, so the search
+    page only downloads the shards of the searched terms.
+
+    Documents keep their id across builds and shards and chunks are named
+    after their content hash, so a build only writes the files affected by
+    changed documents.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import binascii
+from collections import Counter
+import hashlib
+import json
+import os
+import re
+from sphinx.search.en import english_stopwords
+
+
+# words, underscore splits words as the client does
+TOKEN = re.compile(r"[^\W_]+", re.UNICODE)
+
+# terms shorter than this are not indexed
+MIN_TERM_LENGTH = 2
+
+# score of a term in the title, tags and categories relative to the body
+TITLE_WEIGHT = 5
+FILING_WEIGHT = 3
+
+# number of documents in each chunk of titles and links
+CHUNK_SIZE = 200
+
+# output directory of the index
+INDEX_DIR = "_search"
+
+
+def get_terms(text):
+    '''
+    Returns the indexed terms of text.
+    '''
+    return [term for term in TOKEN.findall(text.lower())
+            if len(term) >= MIN_TERM_LENGTH and term not in english_stopwords]
+
+
+def initialize(app):
+    '''
+    Initializes document ids unless already loaded with the environment from
+    a previous build.
+    '''
+    if not hasattr(app.builder.env, "blog_search_ids"):
+        app.builder.env.blog_search_ids = dict()
+
+
+def collect_terms(app, doctree):
+    '''
+    Stores the scored terms of a document in its metadata.
+    '''
+    env = app.builder.env
+    if not app.config.blog_search or env.docname not in env.blog_metadata:
+        return
+
+    metadata = env.blog_metadata[env.docname]
+    terms = Counter(get_terms(doctree.astext()))
+    if env.docname in env.titles:
+        for term in get_terms(env.titles[env.docname].astext()):
+            terms[term] += TITLE_WEIGHT
+    for name in ["tags", "categories"]:
+        for _, item in metadata.filing[name]:
+            for term in get_terms(item):
+                terms[term] += FILING_WEIGHT
+    metadata.search_terms = dict(terms)
+
+
+def update_ids(app, env):
+    '''
+    Assigns ids to new posts and pages once all documents are read. Ids of
+    removed documents are not reused.
+    '''
+    if not app.config.blog_search:
+        return
+
+    docnames = set(docname for docname in env.blog_posts + env.blog_pages
+                   if getattr(env.blog_metadata[docname], "search_terms",
+                              None) is not None)
+    for docname in list(env.blog_search_ids):
+        if docname not in docnames:
+            del env.blog_search_ids[docname]
+
+    next_id = max(list(env.blog_search_ids.values()) + [-1]) + 1
+    for docname in sorted(docnames):
+        if docname not in env.blog_search_ids:
+            env.blog_search_ids[docname] = next_id
+            next_id += 1
+
+
+def shard_name(prefix):
+    '''
+    Returns the file name of a shard, hex-encoded unless the prefix is
+    plain ASCII.
+    '''
+    if re.match(r"^[a-z0-9]+$", prefix):
+        return prefix
+    return "x" + binascii.hexlify(prefix.encode("utf-8")).decode("ascii")
+
+
+def write_file(outdir, subdir, name, data, written):
+    '''
+    Writes data to a file named after its hash unless it already exists,
+    adds it to written and returns its path relative to outdir.
+    '''
+    data = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    data = data.encode("utf-8")
+    path = "%s/%s.%s.json" % (subdir, name,
+                              hashlib.sha1(data).hexdigest()[:10])
+    filename = os.path.join(outdir, subdir, path.split("/")[1])
+    if not os.path.exists(filename):
+        with open(filename, "wb") as f:
+            f.write(data)
+    written.add(filename)
+    return path
+
+
+def make_index(app):
+    '''
+    Returns ({prefix: {term: [[id, score], ...]}}, [[doc] * CHUNK_SIZE]) for
+    all documents with an id, where doc is [link, title, date] or None.
+    '''
+    env = app.builder.env
+    prefix_length = app.config.blog_search_prefix_length
+
+    shards = {}
+    chunks = [[None] * CHUNK_SIZE for _ in range(
+        (max(list(env.blog_search_ids.values()) + [-1]) // CHUNK_SIZE) + 1)]
+    for docname, doc_id in env.blog_search_ids.items():
+        metadata = env.blog_metadata[docname]
+        for term, score in metadata.search_terms.items():
+            shard = shards.setdefault(term[:prefix_length], {})
+            shard.setdefault(term, []).append([doc_id, score])
+        chunks[doc_id // CHUNK_SIZE][doc_id % CHUNK_SIZE] = [
+            docname, env.titles[docname].astext(),
+            metadata.formatted_date or ""]
+
+    for shard in shards.values():
+        for postings in shard.values():
+            postings.sort()
+    return shards, chunks
+
+
+def write_index(app, exception):
+    '''
+    Writes the search index once the build is finished and removes files of
+    the previous index which are no longer used.
+    '''
+    if exception is not None or not app.config.blog_search:
+        return
+
+    outdir = os.path.join(app.outdir, INDEX_DIR)
+    for subdir in ["shards", "docs"]:
+        if not os.path.exists(os.path.join(outdir, subdir)):
+            os.makedirs(os.path.join(outdir, subdir))
+
+    shards, chunks = make_index(app)
+    written = set()
+    manifest = {
+        "version": 1,
+        "prefix_length": app.config.blog_search_prefix_length,
+        "min_term_length": MIN_TERM_LENGTH,
+        "stopwords": sorted(english_stopwords),
+        "chunk_size": CHUNK_SIZE,
+        "shards": dict((prefix, write_file(outdir, "shards",
+                                           shard_name(prefix), shard,
+                                           written))
+                       for prefix, shard in shards.items()),
+        "docs": [write_file(outdir, "docs", str(number), chunk, written)
+                 for number, chunk in enumerate(chunks)],
+    }
+
+    with open(os.path.join(outdir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, sort_keys=True, separators=(",", ":"))
+
+    for subdir in ["shards", "docs"]:
+        for name in os.listdir(os.path.join(outdir, subdir)):
+            filename = os.path.join(outdir, subdir, name)
+            if filename not in written:
+                os.remove(filename)
+
+
+def add_search(app, context):
+    '''
+    Tells templates whether the blog search index is used.
+    '''
+    context["blog_search"] = app.config.blog_search
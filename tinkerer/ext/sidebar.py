@@ -0,0 +1,65 @@
+'''
+    sidebar
+    ~~~~~~~
+
+    Sidebar fragment cache. Widgets such as recent posts, tags and categories
+    render the same HTML on every page except for the relative prefix of
+    their links, so each of the widgets listed in sidebar_cache is rendered
+    once per directory depth and the fragment is passed to the layout, which
+    includes the widget template only when there is no cached fragment.
+
+    Links in cached fragments go up to the root and down to the target, so
+    they don't depend on the directory of the page, only on its depth.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+from markupsafe import Markup
+
+
+def initialize(app):
+    '''
+    Clears fragments rendered by a previous build of the application.
+    '''
+    app.blog_sidebar_fragments = dict()
+
+
+def make_pathto(builder, depth):
+    '''
+    Returns a pathto function for templates rendered for all pages of the
+    given directory depth.
+    '''
+    def pathto(otheruri, resource=False):
+        if resource and "://" in otheruri:
+            # non-local resources are not relative
+            return otheruri
+        elif not resource:
+            otheruri = builder.get_target_uri(otheruri)
+        return "../" * depth + otheruri or "#"
+    return pathto
+
+
+def render_fragment(app, template, depth, context):
+    '''
+    Renders a widget template for pages of the given depth unless it was
+    already rendered during this build.
+    '''
+    key = (template, depth)
+    if key not in app.blog_sidebar_fragments:
+        context = dict(context)
+        context["pathto"] = make_pathto(app.builder, depth)
+        app.blog_sidebar_fragments[key] = Markup(
+            app.builder.templates.render(template, context))
+    return app.blog_sidebar_fragments[key]
+
+
+def add_sidebar(app, pagename, context):
+    '''
+    Passes cached fragments of the page sidebar widgets to templates.
+    '''
+    depth = app.builder.get_target_uri(pagename).count("/")
+    context["sidebar_fragments"] = dict(
+        (template, render_fragment(app, template, depth, context))
+        for template in context.get("sidebars") or []
+        if template in app.config.sidebar_cache)
@@ -0,0 +1,200 @@
+'''
+    sitemap
+    ~~~~~~~
+
+    Sitemap of posts, pages and generated pages. The lastmod date of a post
+    or page is the date its source hash last changed, starting from the date
+    of the post or the modification time of the page source, and generated
+    pages take the newest date of the posts they list, so dates don't move on
+    every build.
+
+    URLs are listed with posts from the oldest first, so new posts are added
+    at the end. Sitemaps above 50,000 URLs or 50MB are split into shards
+    listed by a sitemap index. Shards whose content didn't change are not
+    written again.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import calendar
+import os
+import re
+import time
+from xml.sax.saxutils import escape
+from tinkerer import utils
+from tinkerer.ext import aggregator
+
+
+# limits of a single sitemap file
+MAX_URLS = 50000
+MAX_BYTES = 50 * 1024 * 1024
+
+NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+# shards are named sitemap-<number>.xml
+SHARD = re.compile(r"^sitemap-\d+\.xml$")
+
+
+def update_dates(app, env):
+    '''
+    Updates the date of the last change of posts and pages once all
+    documents are read. Posts seen for the first time are dated by their
+    post date, pages by the modification time of their source, which is the
+    checkout time in fresh clones.
+    '''
+    if not app.config.blog_sitemap:
+        return
+
+    if not hasattr(env, "blog_sitemap_dates"):
+        env.blog_sitemap_dates = dict()
+
+    docnames = set(env.blog_posts + env.blog_pages)
+    for docname in list(env.blog_sitemap_dates):
+        if docname not in docnames:
+            del env.blog_sitemap_dates[docname]
+
+    now = time.time()
+    for docname in docnames:
+        digest = env.blog_source_hashes.get(docname)
+        previous = env.blog_sitemap_dates.get(docname)
+        if previous is None:
+            metadata = env.blog_metadata.get(docname)
+            if metadata is not None and metadata.is_post and metadata.date:
+                timestamp = calendar.timegm(metadata.date.timetuple())
+            else:
+                try:
+                    timestamp = os.path.getmtime(env.doc2path(docname))
+                except OSError:
+                    timestamp = now
+        elif previous[0] != digest:
+            timestamp = now
+        else:
+            continue
+        env.blog_sitemap_dates[docname] = (digest, timestamp)
+
+
+def get_entries(app):
+    '''
+    Returns [(pagename, timestamp)] of all pages in the sitemap.
+    '''
+    env = app.builder.env
+    dates = dict((docname, timestamp) for docname, (_, timestamp)
+                 in env.blog_sitemap_dates.items())
+
+    def newest(posts):
+        return max([dates.get(post, 0) for post in posts] or [0])
+
+    entries = [(post, dates.get(post, 0)) for post in reversed(env.blog_posts)]
+    entries += [(page, dates.get(page, 0)) for page in env.blog_pages]
+
+    # generated pages
+    groups = aggregator.get_groups(app)
+    if app.config.aggregated_max_pages > 0:
+        groups = groups[:app.config.aggregated_max_pages]
+    entries += [(pagename, newest(posts)) for pagename, _, posts in groups]
+    if env.blog_posts:
+        entries.append(("archive", newest(env.blog_posts)))
+    for name in ["tags", "categories"]:
+        for item, posts in sorted(env.filing[name].items()):
+            entries.append(("%s/%s" % (name, utils.name_from_title(
+                item, app.config.slug_word_separator)), newest(posts)))
+    return entries
+
+
+def make_url(app, pagename, timestamp):
+    '''
+    Returns the <url> element of a page.
+    '''
+    url = "<url><loc>%s</loc>" % escape(
+        app.config.website + app.builder.get_target_uri(pagename))
+    if timestamp:
+        url += "<lastmod>%s</lastmod>" % format_date(timestamp)
+    return url + "</url>\n"
+
+
+def format_date(timestamp):
+    '''
+    Returns the W3C date of a timestamp.
+    '''
+    return time.strftime("%Y-%m-%d", time.gmtime(timestamp))
+
+
+def make_sitemap(urls):
+    '''
+    Returns the XML of a sitemap holding the given <url> elements.
+    '''
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<urlset xmlns="%s">\n%s</urlset>\n' % (NAMESPACE, "".join(urls)))
+
+
+def split(urls):
+    '''
+    Splits <url> elements into lists fitting the sitemap limits.
+    '''
+    overhead = len(make_sitemap([]).encode("utf-8"))
+    shards, size = [[]], overhead
+    for url in urls:
+        length = len(url.encode("utf-8"))
+        if shards[-1] and (len(shards[-1]) >= MAX_URLS or
+                           size + length > MAX_BYTES):
+            shards.append([])
+            size = overhead
+        shards[-1].append(url)
+        size += length
+    return shards
+
+
+def write_file(filename, data):
+    '''
+    Writes data to a file unless the file already has the same content.
+    '''
+    data = data.encode("utf-8")
+    if os.path.exists(filename):
+        with open(filename, "rb") as f:
+            if f.read() == data:
+                return
+    with open(filename, "wb") as f:
+        f.write(data)
+
+
+def write_sitemap(app, exception):
+    '''
+    Writes the sitemap, or a sitemap index and its shards, once the build is
+    finished.
+    '''
+    if exception is not None or not app.config.blog_sitemap:
+        return
+
+    entries = get_entries(app)
+    shards = split([make_url(app, pagename, timestamp)
+                    for pagename, timestamp in entries])
+
+    written = set()
+    if len(shards) == 1:
+        data = make_sitemap(shards[0])
+    else:
+        sitemaps = []
+        position = 0
+        for number, urls in enumerate(shards):
+            name = "sitemap-%d.xml" % (number + 1)
+            write_file(os.path.join(app.outdir, name), make_sitemap(urls))
+            written.add(name)
+
+            newest = max([timestamp for _, timestamp
+                          in entries[position:position + len(urls)]])
+            position += len(urls)
+            sitemaps.append("<sitemap><loc>%s</loc>%s</sitemap>\n" % (
+                escape(app.config.website + name),
+                "<lastmod>%s</lastmod>" % format_date(newest)
+                if newest else ""))
+
+        data = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<sitemapindex xmlns="%s">\n%s</sitemapindex>\n' %
+                (NAMESPACE, "".join(sitemaps)))
+    write_file(os.path.join(app.outdir, "sitemap.xml"), data)
+
+    # remove shards of a previous, larger sitemap
+    for name in os.listdir(app.outdir):
+        if SHARD.match(name) and name not in written:
+            os.remove(os.path.join(app.outdir, name))
@@ -37,6 +37,7 @@ class UIStr:
         UIStr.TAGS = unicode(_("Tags"), "utf-8")
         UIStr.TAGS_CLOUD = unicode(_("Tags Cloud"), "utf-8")
         UIStr.CATEGORIES = unicode(_("Categories"), "utf-8")
+        UIStr.RELATED_POSTS = unicode(_("Related Posts"), "utf-8")
         UIStr.TIMESTAMP_FMT = unicode(_('MMMM dd, yyyy'), "utf-8")
         UIStr.TIMESTAMP_FMT_SHORT = unicode(_('MMM dd'), "utf-8")
         UIStr.TAGGED_WITH_FMT = unicode(
@@ -8,30 +8,30 @@
     CONTRIBUTORS file)
     :license: FreeBSD, see LICENSE file
 '''
-from tinkerer import paths
+from tinkerer.blog import get_blog
 
 
-def read_master():
+def read_master(blog=None):
     '''
     Reads master file into a list.
     '''
-    with open(paths.master_file, "r") as f:
+    with open(get_blog(blog).master_file, "r") as f:
         return f.readlines()
 
 
-def write_master(lines):
+def write_master(lines, blog=None):
     '''
     Overwrites master file with given lines.
     '''
-    with open(paths.master_file, "w") as f:
+    with open(get_blog(blog).master_file, "w") as f:
         f.writelines(lines)
 
 
-def prepend_doc(docname):
+def prepend_doc(docname, blog=None):
     '''
     Inserts document at the top of the TOC.
     '''
-    lines = read_master()
+    lines = read_master(blog)
 
     # find maxdepth directive
     line_no = 0
@@ -42,18 +42,18 @@ def prepend_doc(docname):
     # insert docname after it with 3 space alignment
     lines.insert(line_no + 2, "   %s\n" % docname)
 
-    write_master(lines)
+    write_master(lines, blog)
 
 
-def append_doc(docname):
+def append_doc(docname, blog=None):
     '''
     Appends document at the end of the TOC.
     '''
-    lines = read_master()
+    lines = read_master(blog)
 
     # find second blank line after maxdepth directive
     blank, line_no = 0, 0
-    for line_no, line in enumerate(read_master()):
+    for line_no, line in enumerate(lines):
         if blank == 3:
             break
         if "maxdepth" in line:
@@ -63,22 +63,23 @@ def append_doc(docname):
 
     lines.insert(line_no, "   %s\n" % docname)
 
-    write_master(lines)
+    write_master(lines, blog)
 
 
-def exists_doc(docname):
+def exists_doc(docname, blog=None):
     '''
     Return true if document in TOC.
     '''
-    return ("   %s\n" % docname) in read_master()
+    return ("   %s\n" % docname) in read_master(blog)
 
 
-def remove_doc(docname):
+def remove_doc(docname, blog=None):
     '''
     Removes document from the TOC.
     '''
     # rewrite file filtering line containing docname
     write_master(filter(
         lambda line: line != "   %s\n" % docname,
-        read_master())
+        read_master(blog)),
+        blog
     )
@@ -12,6 +12,7 @@ import os
 import shutil
 import tinkerer
 from tinkerer import master, paths, utils, writer
+from tinkerer.blog import get_blog
 
 
 class Page():
@@ -19,22 +20,24 @@ class Page():
     The class provides methods to create a new page and insert it into the
     master document.
     '''
-    def __init__(self, title=None, path=None):
+    def __init__(self, title=None, path=None, blog=None):
         '''
         Determines page filename based on title or given path and creates the
         path to the page if it doesn't already exist.
         '''
         self.title = title
+        self.blog = get_blog(blog)
 
         # get name from path if specified, otherwise from title
         if path:
             self.name = utils.name_from_path(path)
         else:
-            self.name = utils.name_from_title(title)
+            self.name = utils.name_from_title(title,
+                                              self.blog.word_separator)
 
         # create page directory if it doesn't exist and get page path
         self.path = os.path.join(
-            utils.get_path(paths.root, "pages"),
+            utils.get_path(self.blog.root, "pages"),
             self.name) + tinkerer.source_suffix
 
         # docname as it should appear in TOC
@@ -47,32 +50,33 @@ class Page():
         template = template or paths.page_template
         writer.render(template, self.path,
                       {"title": self.title,
-                       "content": content})
+                       "content": content},
+                      blog=self.blog)
 
 
-def create(title, template=None):
+def create(title, template=None, blog=None):
     '''
     Creates a new page given its title.
     '''
-    page = Page(title, path=None)
+    page = Page(title, path=None, blog=blog)
     if os.path.exists(page.path):
         raise Exception("Page '%s' already exists at '%s" %
                         (title, page.path))
     page.write(template=template)
-    if not master.exists_doc(page.docname):
-        master.append_doc(page.docname)
+    if not master.exists_doc(page.docname, page.blog):
+        master.append_doc(page.docname, page.blog)
     return page
 
 
-def move(path, date=None):
+def move(path, date=None, blog=None):
     '''
     Moves a page given its path.
     '''
-    page = Page(title=None, path=path)
+    page = Page(title=None, path=path, blog=blog)
     if os.path.exists(page.path):
         raise Exception("Page '%s' already exists" %
                         (page.path, ))
     shutil.move(path, page.path)
-    if not master.exists_doc(page.docname):
-        master.append_doc(page.docname)
+    if not master.exists_doc(page.docname, page.blog):
+        master.append_doc(page.docname, page.blog)
     return page
@@ -10,7 +10,6 @@
 '''
 import os
 import tinkerer
-import sys
 
 
 # package path
@@ -19,11 +18,17 @@ __package_path = os.path.abspath(os.path.dirname(__file__))
 
 # absolute path to assets
 __internal_templates_abs_path = os.path.join(__package_path, "__templates")
-templates = os.path.join(os.path.abspath("."), "_templates")
 themes = os.path.join(__package_path, "themes")
 static = os.path.join(__package_path, "static")
 
 
+# per-user cache of compiled templates, shared by all blogs
+cache = os.getenv("TINKERER_CACHE_PATH", os.path.join(
+    os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"),
+                                             ".cache")),
+    "tinkerer"))
+
+
 # template names
 post_template = "post.rst"
 page_template = "page.rst"
@@ -33,16 +38,13 @@ page_template = "page.rst"
 favicon = "tinkerer.ico"
 
 
-# add "./exts" path to os search path so Sphinx can pick up any extensions
-# from there
-sys.path.append(os.path.abspath("./_exts"))
-
-
 def set_paths(root_path="."):
     '''
-    Computes required relative paths based on given root path.
+    Computes required relative paths based on given root path. These are the
+    paths of the blog used when no tinkerer.blog.Blog is given explicitly.
     '''
     global root, blog, doctree, html, master_file, index_file, conf_file
+    global templates
     root = os.path.abspath(root_path)
     blog = os.path.join(root, os.getenv("TINKERER_BLOG_PATH", "blog"))
     doctree = os.path.join(blog, "doctrees")
@@ -51,9 +53,7 @@ def set_paths(root_path="."):
                                tinkerer.master_doc + tinkerer.source_suffix)
     index_file = os.path.join(root, "index.html")
     conf_file = os.path.join(root, "conf.py")
-
-    # relative path to assets required by conf.py
-    global themes, templates, static
+    templates = os.path.join(root, "_templates")
 
 
 # compute paths on import
@@ -12,6 +12,7 @@ import os
 import shutil
 import tinkerer
 from tinkerer import master, paths, utils, writer
+from tinkerer.blog import get_blog
 
 
 class Post():
@@ -20,12 +21,13 @@ class Post():
     master document.
     '''
 
-    def __init__(self, title=None, path=None, date=None):
+    def __init__(self, title=None, path=None, date=None, blog=None):
         '''
         Initializes a new post and creates path to it if it doesn't already
         exist.
         '''
         self.title = title
+        self.blog = get_blog(blog)
 
         # get year, month and day from date
         self.year, self.month, self.day = utils.split_date(date)
@@ -34,12 +36,13 @@ class Post():
         if path:
             self.name = utils.name_from_path(path)
         else:
-            self.name = utils.name_from_title(title)
+            self.name = utils.name_from_title(title,
+                                              self.blog.word_separator)
 
         # create post directory if it doesn't exist and get post path
         self.path = os.path.join(
             utils.get_path(
-                paths.root,
+                self.blog.root,
                 self.year,
                 self.month,
                 self.day),
@@ -60,33 +63,34 @@ class Post():
                        "content":    content,
                        "author":     author,
                        "categories": categories,
-                       "tags":       tags})
+                       "tags":       tags},
+                      blog=self.blog)
 
 
-def create(title, date=None, template=None):
+def create(title, date=None, template=None, blog=None):
     '''
     Creates a new post given its title.
     '''
-    post = Post(title, path=None, date=date)
+    post = Post(title, path=None, date=date, blog=blog)
     if os.path.exists(post.path):
         raise Exception("Post '%s' already exists at '%s" %
                         (title, post.path))
 
     post.write(template=template)
-    if not master.exists_doc(post.docname):
-        master.prepend_doc(post.docname)
+    if not master.exists_doc(post.docname, post.blog):
+        master.prepend_doc(post.docname, post.blog)
     return post
 
 
-def move(path, date=None):
+def move(path, date=None, blog=None):
     '''
     Moves a post given its path.
     '''
-    post = Post(title=None, path=path, date=date)
+    post = Post(title=None, path=path, date=date, blog=blog)
     if os.path.exists(post.path):
         raise Exception("Post '%s' already exists" %
                         (post.path,))
     shutil.move(path, post.path)
-    if not master.exists_doc(post.docname):
-        master.prepend_doc(post.docname)
+    if not master.exists_doc(post.docname, post.blog):
+        master.prepend_doc(post.docname, post.blog)
     return post
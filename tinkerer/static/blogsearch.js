@@ -0,0 +1,200 @@
+/* Searches the sharded blog search index written by tinkerer.ext.search */
+
+var BlogSearch = {
+    /* words, split as the index does: runs of letters and digits. Browsers
+       without Unicode property escapes only split on ASCII punctuation */
+    TOKEN: (function () {
+        try {
+            return new RegExp('[\\p{L}\\p{N}]+', 'gu');
+        } catch (e) {
+            return /[^\s!-\/:-@\[-`{-~]+/g;
+        }
+    }()),
+
+    /* maximum number of results displayed */
+    MAX_RESULTS: 50,
+
+    /* Fetches and parses a JSON file */
+    get: function (url, done)
+    {
+        var request = new XMLHttpRequest();
+        request.onreadystatechange = function () {
+            if (request.readyState === 4) {
+                done(request.status === 200 || request.status === 0 ?
+                     JSON.parse(request.responseText) : null);
+            }
+        };
+        request.open('GET', url, true);
+        request.send();
+    },
+
+    /* Fetches all given files of the index, calls done with their content */
+    getAll: function (urls, done)
+    {
+        var results = {}, left = urls.length;
+        if (!left) {
+            done(results);
+        }
+        urls.forEach(function (url) {
+            BlogSearch.get(BlogSearch.root + url, function (data) {
+                results[url] = data || {};
+                if (--left === 0) {
+                    done(results);
+                }
+            });
+        });
+    },
+
+    /* Returns the terms of a query, leaving out the stop words which are
+       not indexed */
+    getTerms: function (query, manifest)
+    {
+        var terms = query.toLowerCase().match(BlogSearch.TOKEN) || [];
+        var stopwords = manifest.stopwords || [];
+        return terms.filter(function (term, i) {
+            return term.length >= manifest.min_term_length &&
+                stopwords.indexOf(term) < 0 &&
+                terms.indexOf(term) === i;
+        });
+    },
+
+    /* Returns the prefixes of the shards holding terms starting with term */
+    getPrefixes: function (term, manifest)
+    {
+        var prefix = term.substr(0, manifest.prefix_length);
+        return Object.keys(manifest.shards).filter(function (key) {
+            return key.substr(0, prefix.length) === prefix;
+        });
+    },
+
+    /* Returns [[id, score]] of documents matching all terms, best first.
+       Indexed terms starting with a query term match it. */
+    score: function (terms, manifest, shards)
+    {
+        var scores = null;
+        terms.forEach(function (term) {
+            var matches = {};
+            BlogSearch.getPrefixes(term, manifest).forEach(function (prefix) {
+                var shard = shards[manifest.shards[prefix]];
+                Object.keys(shard).forEach(function (key) {
+                    if (key.substr(0, term.length) !== term) {
+                        return;
+                    }
+                    shard[key].forEach(function (posting) {
+                        matches[posting[0]] =
+                            (matches[posting[0]] || 0) + posting[1];
+                    });
+                });
+            });
+            if (scores === null) {
+                scores = matches;
+            } else {
+                Object.keys(scores).forEach(function (id) {
+                    if (id in matches) {
+                        scores[id] += matches[id];
+                    } else {
+                        delete scores[id];
+                    }
+                });
+            }
+        });
+
+        return Object.keys(scores || {}).map(function (id) {
+            return [parseInt(id, 10), scores[id]];
+        }).sort(function (a, b) {
+            return b[1] - a[1] || b[0] - a[0];
+        });
+    },
+
+    /* Displays the documents with the given ids */
+    display: function (ids, manifest, chunks)
+    {
+        var results = document.getElementById('search-results');
+        var progress = document.getElementById('search-progress');
+        var list = document.createElement('ul');
+
+        ids.forEach(function (id) {
+            var chunk = chunks[manifest.docs[Math.floor(id / manifest.chunk_size)]];
+            var doc = chunk[id % manifest.chunk_size];
+            if (!doc) {
+                return;
+            }
+            var item = document.createElement('li');
+            var link = document.createElement('a');
+            link.href = BlogSearch.urlRoot + doc[0] + '.html';
+            link.textContent = doc[1];
+            item.appendChild(link);
+            if (doc[2]) {
+                var date = document.createElement('span');
+                date.className = 'timestamp';
+                date.textContent = ' ' + doc[2];
+                item.appendChild(date);
+            }
+            list.appendChild(item);
+        });
+
+        results.appendChild(list);
+        if (progress) {
+            progress.textContent = ids.length ?
+                ids.length + ' result(s)' : 'No results';
+        }
+    },
+
+    /* Runs the query, downloading only the shards of its terms */
+    query: function (query)
+    {
+        BlogSearch.get(BlogSearch.manifestUrl, function (manifest) {
+            var terms = BlogSearch.getTerms(query, manifest || {});
+            if (!manifest || !terms.length) {
+                BlogSearch.display([], manifest, {});
+                return;
+            }
+
+            var urls = [];
+            terms.forEach(function (term) {
+                BlogSearch.getPrefixes(term, manifest).forEach(function (prefix) {
+                    if (urls.indexOf(manifest.shards[prefix]) < 0) {
+                        urls.push(manifest.shards[prefix]);
+                    }
+                });
+            });
+
+            BlogSearch.getAll(urls, function (shards) {
+                var ids = BlogSearch.score(terms, manifest, shards)
+                    .slice(0, BlogSearch.MAX_RESULTS)
+                    .map(function (result) { return result[0]; });
+                var chunks = [];
+                ids.forEach(function (id) {
+                    var url = manifest.docs[Math.floor(id / manifest.chunk_size)];
+                    if (chunks.indexOf(url) < 0) {
+                        chunks.push(url);
+                    }
+                });
+                BlogSearch.getAll(chunks, function (docs) {
+                    BlogSearch.display(ids, manifest, docs);
+                });
+            });
+        });
+    },
+
+    /* Searches for the q parameter of the page URL, if any */
+    init: function (manifestUrl, urlRoot)
+    {
+        BlogSearch.manifestUrl = manifestUrl;
+        BlogSearch.root = manifestUrl.substr(0, manifestUrl.lastIndexOf('/') + 1);
+        BlogSearch.urlRoot = urlRoot;
+
+        document.addEventListener('DOMContentLoaded', function () {
+            var match = /[?&]q=([^&]*)/.exec(window.location.search);
+            if (!match) {
+                return;
+            }
+            var query = decodeURIComponent(match[1].replace(/\+/g, ' '));
+            var input = document.querySelector('input[name="q"]');
+            if (input) {
+                input.value = query;
+            }
+            BlogSearch.query(query);
+        });
+    }
+};
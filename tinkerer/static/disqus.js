@@ -18,3 +18,56 @@ function disqus_count()
     s.src = 'http://' + disqus_shortname + '.disqus.com/count.js';
     (document.getElementsByTagName('HEAD')[0] || document.getElementsByTagName('BODY')[0]).appendChild(s);
 }
+
+/* Calls load once element scrolls into view */
+function disqus_when_visible(element, load)
+{
+    if (!('IntersectionObserver' in window)) {
+        load();
+        return;
+    }
+    var observer = new IntersectionObserver(function(entries) {
+        for (var i = 0; i < entries.length; i++) {
+            if (entries[i].isIntersecting) {
+                observer.disconnect();
+                load();
+                return;
+            }
+        }
+    }, { rootMargin: '200px' });
+    observer.observe(element);
+}
+
+/* Loads threads and comment counts configured in data- attributes */
+function disqus_lazy_load()
+{
+    var thread = document.getElementById('disqus_thread');
+    if (thread && thread.getAttribute('data-disqus-shortname')) {
+        disqus_when_visible(thread, function() {
+            window.disqus_shortname = thread.getAttribute('data-disqus-shortname');
+            window.disqus_identifier = thread.getAttribute('data-disqus-identifier');
+            disqus_thread();
+        });
+    }
+
+    /* a single count.js fetches the counts of all links on the page */
+    var links = document.querySelectorAll('a[data-disqus-shortname]');
+    var loaded = false;
+    var load_count = function(link) {
+        return function() {
+            if (loaded) return;
+            loaded = true;
+            window.disqus_shortname = link.getAttribute('data-disqus-shortname');
+            disqus_count();
+        };
+    };
+    for (var i = 0; i < links.length; i++) {
+        disqus_when_visible(links[i], load_count(links[i]));
+    }
+}
+
+if (document.readyState == 'loading') {
+    document.addEventListener('DOMContentLoaded', disqus_lazy_load);
+} else {
+    disqus_lazy_load();
+}
@@ -9,24 +9,28 @@
     :license: FreeBSD, see LICENSE file
 '''
 import datetime
+import hashlib
 import imp
 import os
 import re
+from tinkerer import paths
 
 
 UNICODE_ALNUM_PTN = re.compile(r"[\W_]+", re.U)
 
 
-def name_from_title(title):
+def name_from_title(title, word_sep=None):
     '''
     Returns a doc name from a title by replacing all groups of
     characters which are not alphanumeric or '_' with the word
-    separator character.
+    separator character. If no separator is given, it is read from conf.py
+    in the current directory.
     '''
-    try:
-        word_sep = get_conf().slug_word_separator
-    except:
-        word_sep = "_"
+    if word_sep is None:
+        try:
+            word_sep = get_conf().slug_word_separator
+        except:
+            word_sep = "_"
 
     return UNICODE_ALNUM_PTN.sub(word_sep, title).lower().strip(word_sep)
 
@@ -49,6 +53,16 @@ def get_path(*args):
     return path
 
 
+def get_cache_path(root, *args):
+    '''
+    Returns a path in the per-user cache belonging to the blog at the given
+    root. Build caches live there rather than in the blog directory so they
+    survive clean builds. The path is not created.
+    '''
+    digest = hashlib.sha1(os.path.abspath(root).encode("utf-8")).hexdigest()
+    return os.path.join(paths.cache, "blogs", digest[:16], *args)
+
+
 def split_date(date=None):
     '''
     Splits a date into formatted year, month and day strings. If not date is
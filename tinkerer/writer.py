@@ -9,29 +9,66 @@
     :license: FreeBSD, see LICENSE file
 '''
 
-from jinja2 import ChoiceLoader, Environment, FileSystemLoader, PackageLoader
+from jinja2 import (ChoiceLoader, Environment, FileSystemBytecodeCache,
+                    FileSystemLoader)
 import os
 import shutil
 from tinkerer import paths, utils
+from tinkerer.blog import get_blog
 
 
-# jinja environment
-env = Environment(loader=ChoiceLoader([
-    # first choice is _templates subdir from blog root
-    FileSystemLoader(paths.templates),
-    # if template is not there, use tinkerer builtin
-    PackageLoader("tinkerer", "__templates")]))
+class BytecodeCache(FileSystemBytecodeCache):
+    '''
+    Bytecode cache creating its directory when the first compiled template is
+    stored, so commands which don't compile templates leave no directory
+    behind.
+    '''
+
+    def dump_bytecode(self, bucket):
+        '''
+        Stores a compiled template, skipped if the directory can't be
+        created.
+        '''
+        try:
+            utils.get_path(self.directory)
+        except (IOError, OSError):
+            return
+        FileSystemBytecodeCache.dump_bytecode(self, bucket)
+
+
+def get_bytecode_cache():
+    '''
+    Returns a bytecode cache storing compiled templates under the Tinkerer
+    cache directory. Cached code is keyed by template path and discarded when
+    the template source changes.
+    '''
+    return BytecodeCache(paths.cache)
+
+
+def make_env(templates):
+    '''
+    Returns a jinja environment for a blog with the given templates directory.
+    '''
+    return Environment(loader=ChoiceLoader([
+        # first choice is _templates subdir from blog root
+        FileSystemLoader(templates),
+        # if template is not there, use tinkerer builtin (loaded from the
+        # package directory like copy_templates does, PackageLoader would
+        # import pkg_resources on every command)
+        FileSystemLoader(paths.__internal_templates_abs_path)]),
+        bytecode_cache=get_bytecode_cache())
 
 
-def render(template, destination, context={}, safe=False):
+def render(template, destination, context={}, safe=False, blog=None):
     '''
     Renders the given template at the given destination with the given context.
     '''
+    env = get_blog(blog).env
     with open(destination, "wb") as dest:
         dest.write(env.get_template(template).render(context).encode("utf8"))
 
 
-def render_safe(template, destination, context={}):
+def render_safe(template, destination, context={}, blog=None):
     '''
     Similar to render but only renders the template if the destination doesn't
     already exist.
@@ -40,26 +77,27 @@ def render_safe(template, destination, context={}):
     if os.path.exists(destination):
         return False
 
-    render(template, destination, context)
+    render(template, destination, context, blog=blog)
 
     return True
 
 
-def write_master_file():
+def write_master_file(blog=None):
     '''
     Writes the blog master document.
     '''
-    return render_safe("master.rst", paths.master_file)
+    return render_safe("master.rst", get_blog(blog).master_file, blog=blog)
 
 
-def write_index_file():
+def write_index_file(blog=None):
     '''
     Writes the root index.html file.
     '''
     return render_safe(
         "index.html",
-        paths.index_file,
-        {"redirect_url": "./blog/html/index.html"}
+        get_blog(blog).index_file,
+        {"redirect_url": "./blog/html/index.html"},
+        blog=blog
     )
 
 
@@ -72,49 +110,52 @@ DEFAULT_EXTENSIONS = [
 ]
 
 
-def write_conf_file(extensions=DEFAULT_EXTENSIONS, theme="flat"):
+def write_conf_file(extensions=DEFAULT_EXTENSIONS, theme="flat", blog=None):
     '''
     Writes the Sphinx configuration file.
     '''
     return render_safe(
-        "conf.py", paths.conf_file,
+        "conf.py", get_blog(blog).conf_file,
         {"extensions": ", ".join(["'%s'" % ext for ext in extensions]),
-         "theme": theme})
+         "theme": theme},
+        blog=blog)
 
 
-def copy_templates():
+def copy_templates(blog=None):
     '''
     Copies Tinkerer post and page templates to blog _templates directory.
     '''
+    blog = get_blog(blog)
     for template in [paths.post_template, paths.page_template]:
-        if not os.path.exists(os.path.join(paths.root, "_templates",
-                                           template)):
+        if not os.path.exists(os.path.join(blog.templates, template)):
             shutil.copy(
                 os.path.join(paths.__internal_templates_abs_path, template),
-                os.path.join(paths.root, "_templates")
+                blog.templates
             )
 
 
-def copy_static():
+def copy_static(blog=None):
     '''
     Copies Tinkerer favicon to blog _static directory.
     '''
-    if not os.path.exists(os.path.join(paths.root, "_static", paths.favicon)):
+    blog = get_blog(blog)
+    if not os.path.exists(os.path.join(blog.root, "_static", paths.favicon)):
         shutil.copy(
             os.path.join(paths.static, paths.favicon),
-            os.path.join(paths.root, "_static")
+            os.path.join(blog.root, "_static")
         )
 
 
-def setup_blog():
+def setup_blog(blog=None):
     '''
     Sets up a new blog.
     '''
-    utils.get_path(paths.root, "_static")
-    utils.get_path(paths.root, "_templates")
-    utils.get_path(paths.root, "drafts")
-    copy_templates()
-    copy_static()
-    write_master_file()
-    write_index_file()
-    return write_conf_file()
+    blog = get_blog(blog)
+    utils.get_path(blog.root, "_static")
+    utils.get_path(blog.templates)
+    utils.get_path(blog.root, "drafts")
+    copy_templates(blog)
+    copy_static(blog)
+    write_master_file(blog)
+    write_index_file(blog)
+    return write_conf_file(blog=blog)
@@ -0,0 +1,14 @@
+'''
+    Benchmarks
+    ~~~~~~~~~~
+
+    Performance benchmarks on synthetic blogs. Run with::
+
+        python -m tinkertest.benchmark --posts 1000 10000 --output results.json
+
+    and compare against a previous run with ``--compare old.json``.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
@@ -0,0 +1,79 @@
+'''
+    Benchmark command line
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Runs all scenarios for each requested blog size and writes the results as
+    JSON.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+from tinkertest.benchmark import scenarios
+
+
+def main(argv=None):
+    '''
+    Parses command line and runs the benchmarks.
+    '''
+    parser = argparse.ArgumentParser(prog="python -m tinkertest.benchmark")
+    parser.add_argument(
+        "--posts", nargs="+", type=int, default=[1000],
+        help="number of posts of each generated blog (default 1000)")
+    parser.add_argument("--pages", type=int, default=10,
+                        help="number of pages of each generated blog")
+    parser.add_argument("--drafts", type=int, default=10,
+                        help="number of drafts of each generated blog")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of parallel processes used by builds")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="random seed of the blog generator")
+    parser.add_argument("--output", help="write JSON results to OUTPUT "
+                        "instead of stdout")
+    parser.add_argument(
+        "--compare", metavar="BASELINE",
+        help="compare results with a previous run and exit with a non-zero "
+        "code if any scenario regressed")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2,
+        help="fraction a scenario may be slower than BASELINE before it is "
+        "reported as a regression (default 0.2)")
+
+    command = parser.parse_args(argv)
+
+    results = {"environment": scenarios.environment(), "runs": []}
+    for posts in command.posts:
+        root = tempfile.mkdtemp()
+        try:
+            results["runs"].append(scenarios.run(
+                root, posts, command.pages, command.drafts, command.jobs,
+                command.seed))
+        finally:
+            shutil.rmtree(root, True)
+
+    if command.output:
+        with open(command.output, "w") as f:
+            scenarios.write_results(results, f)
+    else:
+        scenarios.write_results(results, sys.stdout)
+
+    if command.compare:
+        with open(command.compare, "r") as f:
+            baseline = json.load(f)
+        regressions = scenarios.compare(baseline, results, command.tolerance)
+        for posts, scenario, old, new in regressions:
+            sys.stderr.write("%d posts: %s regressed from %.4fs to %.4fs\n" %
+                             (posts, scenario, old, new))
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
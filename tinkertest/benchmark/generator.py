@@ -0,0 +1,170 @@
+'''
+    Synthetic blog generator
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Generates blogs of arbitrary size for benchmarking. Posts are spread over
+    a number of years and get Zipf-distributed tags and categories, so a few
+    are used by most posts and a long tail is used by only a handful. Post
+    bodies mix paragraphs, code blocks, images and "more" markers. Output is
+    fully determined by the random seed.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import base64
+import bisect
+import datetime
+import os
+import random
+from tinkerer import draft, master, page, paths, post, writer
+
+
+# 1x1 transparent PNG referenced by generated posts
+IMAGE = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA"
+    "60e6kgAAAABJRU5ErkJggg==")
+
+IMAGE_NAME = "benchmark.png"
+
+WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do "
+         "eiusmod tempor incididunt ut labore et dolore magna aliqua").split()
+
+CODE = '''.. code-block:: python
+
+    def fibonacci(n):
+        a, b = 0, 1
+        for _ in range(n):
+            a, b = b, a + b
+        return a
+'''
+
+# last day on which generated posts are published
+LAST_DATE = datetime.date(2016, 12, 31)
+
+
+class ZipfSampler():
+    '''
+    Samples items with probability inversely proportional to a power of their
+    rank.
+    '''
+    def __init__(self, items, exponent=1.1, rng=random):
+        self.items = items
+        self.rng = rng
+        self.cumulative = []
+        total = 0.0
+        for rank in range(1, len(items) + 1):
+            total += 1.0 / rank ** exponent
+            self.cumulative.append(total)
+
+    def sample(self):
+        '''
+        Returns a single item.
+        '''
+        value = self.rng.random() * self.cumulative[-1]
+        return self.items[bisect.bisect(self.cumulative, value)]
+
+    def sample_distinct(self, count):
+        '''
+        Returns up to count distinct items.
+        '''
+        items = []
+        for _ in range(count * 4):
+            item = self.sample()
+            if item not in items:
+                items.append(item)
+            if len(items) == count:
+                break
+        return items
+
+
+def make_paragraph(rng, words=40):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_content(rng):
+    '''
+    Returns a post body with paragraphs, code, an image and, for most posts,
+    a "more" marker.
+    '''
+    blocks = [make_paragraph(rng)]
+    if rng.random() < 0.7:
+        blocks.append(".. more::")
+    blocks.append(make_paragraph(rng))
+    if rng.random() < 0.5:
+        blocks.append(CODE)
+    if rng.random() < 0.3:
+        blocks.append(".. image:: /_static/%s" % IMAGE_NAME)
+    blocks.append(make_paragraph(rng))
+    return "\n\n".join(blocks)
+
+
+def post_dates(count, years):
+    '''
+    Returns count dates evenly spread over the given number of years, oldest
+    first.
+    '''
+    first = datetime.date(LAST_DATE.year - years + 1, 1, 1)
+    days = (LAST_DATE - first).days
+    return [first + datetime.timedelta(days=i * days // max(count - 1, 1))
+            for i in range(count)]
+
+
+def add_docs(docnames):
+    '''
+    Adds documents to the master TOC in a single write, same order as if
+    they were prepended one by one in reverse.
+    '''
+    lines = master.read_master()
+
+    line_no = 0
+    for line_no, line in enumerate(lines):
+        if "maxdepth" in line:
+            break
+
+    lines[line_no + 2:line_no + 2] = ["   %s\n" % doc for doc in docnames]
+    master.write_master(lines)
+
+
+def generate(root, posts=1000, pages=10, drafts=10, years=5, tags=200,
+             categories=20, seed=0):
+    '''
+    Generates a blog at the given root and returns the paths of the posts,
+    pages and drafts created.
+    '''
+    rng = random.Random(seed)
+    tag_sampler = ZipfSampler(["tag %d" % i for i in range(tags)], rng=rng)
+    category_sampler = ZipfSampler(
+        ["category %d" % i for i in range(categories)], rng=rng)
+
+    paths.set_paths(root)
+    writer.setup_blog()
+    with open(os.path.join(root, "_static", IMAGE_NAME), "wb") as f:
+        f.write(IMAGE)
+
+    blog = {"posts": [], "pages": [], "drafts": []}
+    post_docnames, page_docnames = [], []
+
+    for i, date in enumerate(post_dates(posts, years)):
+        new_post = post.Post("Post %d %s" % (i, rng.choice(WORDS)), date=date)
+        new_post.write(
+            content=make_content(rng),
+            tags=", ".join(tag_sampler.sample_distinct(rng.randint(1, 4))),
+            categories=", ".join(
+                category_sampler.sample_distinct(rng.randint(1, 2))))
+        blog["posts"].append(new_post.path)
+        post_docnames.append(new_post.docname)
+
+    for i in range(pages):
+        new_page = page.Page("Page %d" % i)
+        new_page.write(content=make_paragraph(rng))
+        blog["pages"].append(new_page.path)
+        page_docnames.append(new_page.docname)
+
+    for i in range(drafts):
+        blog["drafts"].append(draft.create("Draft %d" % i))
+
+    # newest posts first, followed by pages
+    add_docs(post_docnames[::-1] + page_docnames)
+
+    return blog
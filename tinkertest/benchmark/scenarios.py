@@ -0,0 +1,210 @@
+'''
+    Benchmark scenarios
+    ~~~~~~~~~~~~~~~~~~~
+
+    Timed scenarios run against a generated blog. Builds run in-process with
+    the same source, doctree and output directories as ``tinker -b`` so only
+    Sphinx startup is left out; ``tinker -p`` is timed in a fresh interpreter
+    as that is mostly import cost.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+import pyquery
+import sphinx
+from sphinx.application import Sphinx
+import tinkerer
+from tinkerer import paths, post
+from tinkerer.ext import patch, rss
+from tinkertest.benchmark import generator
+
+try:
+    # Python 2
+    from StringIO import StringIO
+except ImportError:
+    # Python 3
+    from io import StringIO
+
+
+# order in which scenarios are run and reported
+SCENARIOS = [
+    "clean_build",
+    "noop_rebuild",
+    "edit_post",
+    "new_post",
+    "tinker_post",
+    "patch_links",
+    "make_feed_context",
+]
+
+# scenarios measured per call rather than per run
+MICRO_ITERATIONS = 100
+
+# runs "tinker -p" in a fresh interpreter
+TINKER_POST_SCRIPT = (
+    "import sys\n"
+    "from tinkerer import cmdline\n"
+    "sys.exit(cmdline.main(['-q', '-p', %r]))\n")
+
+
+def timed(func, *args):
+    '''
+    Calls func and returns its result and elapsed wall time in seconds.
+    '''
+    start = time.time()
+    result = func(*args)
+    return result, time.time() - start
+
+
+def run_build(jobs=1, fresh=False):
+    '''
+    Builds the blog in-process and returns the Sphinx application.
+    '''
+    if fresh and os.path.exists(paths.blog):
+        shutil.rmtree(paths.blog)
+
+    app = Sphinx(paths.root, paths.root, paths.html, paths.doctree, "html",
+                 status=None, warning=StringIO(), freshenv=fresh,
+                 parallel=jobs)
+    app.build()
+    return app
+
+
+def edit_post(path):
+    '''
+    Appends a paragraph to an existing post.
+    '''
+    with open(path, "r") as f:
+        lines = f.readlines()
+
+    # insert before the author/categories/tags directives at the end
+    index = next(i for i, line in enumerate(lines)
+                 if line.startswith(".. author::"))
+    lines.insert(index, "Edited for benchmarking.\n\n")
+
+    with open(path, "w") as f:
+        f.writelines(lines)
+
+
+def new_post():
+    '''
+    Creates a post newer than all generated posts.
+    '''
+    date = generator.LAST_DATE + datetime.timedelta(days=1)
+    post.create("Benchmark new post", date).write(
+        content="Lorem ipsum\n\n.. more::\n\nDolor sit amet",
+        tags="tag 0", categories="category 0")
+
+
+def tinker_post():
+    '''
+    Runs "tinker -p" in a fresh interpreter from the blog root.
+    '''
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.dirname(os.path.dirname(tinkerer.__file__)),
+         env.get("PYTHONPATH", "")])
+    subprocess.check_call(
+        [sys.executable, "-c", TINKER_POST_SCRIPT % "Benchmark tinker post"],
+        cwd=paths.root, env=env)
+
+
+def sample_body(app):
+    '''
+    Returns the rendered body of the newest generated post.
+    '''
+    docname = app.env.blog_posts[0]
+    with open(os.path.join(paths.html, docname + ".html"), "rb") as f:
+        doc = pyquery.PyQuery(f.read())
+    return docname, doc("article section").eq(0).outer_html()
+
+
+def micro(func):
+    '''
+    Returns the average time of a call to func.
+    '''
+    start = time.time()
+    for _ in range(MICRO_ITERATIONS):
+        func()
+    return (time.time() - start) / MICRO_ITERATIONS
+
+
+def run(root, posts=1000, pages=10, drafts=10, jobs=1, seed=0):
+    '''
+    Generates a blog with the given number of posts at root, runs all
+    scenarios and returns their timings in seconds.
+    '''
+    results = {}
+
+    blog, results["generate"] = timed(
+        generator.generate, root, posts, pages, drafts, 5, 200, 20, seed)
+
+    app, results["clean_build"] = timed(run_build, jobs, True)
+    _, results["noop_rebuild"] = timed(run_build, jobs)
+
+    edit_post(blog["posts"][len(blog["posts"]) // 2])
+    _, results["edit_post"] = timed(run_build, jobs)
+
+    _, results["new_post"] = timed(lambda: (new_post(), run_build(jobs)))
+
+    # microbenchmarks use the application of the clean build, which still
+    # has all post bodies in memory
+    docname, body = sample_body(app)
+    results["patch_links"] = micro(
+        lambda: patch.patch_links(body, docname[:11], docname[11:], True))
+    results["make_feed_context"] = micro(
+        lambda: list(rss.make_feed_context(
+            app, None, app.env.blog_posts[:10])["items"]))
+
+    _, results["tinker_post"] = timed(tinker_post)
+
+    return {"posts": posts, "pages": pages, "drafts": drafts, "jobs": jobs,
+            "seconds": results}
+
+
+def environment():
+    '''
+    Returns versions of everything that affects timings.
+    '''
+    return {"tinkerer": tinkerer.__version__,
+            "sphinx": sphinx.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(baseline, results, tolerance=0.2):
+    '''
+    Returns a list of (posts, scenario, old, new) for scenarios at least
+    tolerance slower than in baseline, for blogs of the same size.
+    '''
+    old_runs = dict((old_run["posts"], old_run)
+                    for old_run in baseline["runs"])
+    regressions = []
+    for new_run in results["runs"]:
+        old_run = old_runs.get(new_run["posts"])
+        if not old_run:
+            continue
+        for scenario in SCENARIOS:
+            old = old_run["seconds"].get(scenario)
+            new = new_run["seconds"].get(scenario)
+            if old and new and new > old * (1 + tolerance):
+                regressions.append((new_run["posts"], scenario, old, new))
+    return regressions
+
+
+def write_results(results, stream):
+    '''
+    Writes results as JSON to the given stream.
+    '''
+    stream.write(json.dumps(results, indent=2, sort_keys=True))
+    stream.write("\n")
@@ -0,0 +1,68 @@
+'''
+    API Test
+    ~~~~~~~~
+
+    Tests the JSON post index.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import json
+import os
+from tinkerer import paths, post
+from tinkerer.ext import api
+from tinkertest import utils
+
+
+# read a file of the API
+def read_api(*path):
+    with open(os.path.join(paths.html, api.API_DIR, *path), "r") as f:
+        return json.load(f)
+
+
+# test case
+class TestAPI(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
+        post.create("First", datetime.date(2010, 10, 1)).write(
+            content="Intro\n\n.. more::\n\nSee `other <../02/second.html>`_",
+            tags="tag #1, tag #2")
+        post.create("Second", datetime.date(2010, 10, 2)).write(
+            content="Second post")
+        post.create("Third", datetime.date(2010, 10, 3)).write(
+            content="Third post")
+        with open(os.path.join(paths.root, "conf.py"), "a") as f:
+            f.write("\nblog_api = True\nposts_per_page = 2\n")
+
+    # summaries are paginated from the newest post
+    def test_pages(self):
+        first = read_api("posts", "page1.json")
+        self.assertEqual(["Third", "Second"],
+                         [summary["title"] for summary in first["posts"]])
+        self.assertEqual(None, first["prev"])
+        self.assertEqual("api/posts/page2.json", first["next"])
+        self.assertEqual(2, first["pages"])
+
+        second = read_api("posts", "page2.json")
+        self.assertEqual("api/posts/page1.json", second["prev"])
+        self.assertEqual(None, second["next"])
+
+        summary = second["posts"][0]
+        self.assertEqual("2010/10/01/first.html", summary["link"])
+        self.assertEqual("api/posts/2010/10/01/first.json", summary["url"])
+        self.assertEqual("2010-10-01", summary["date"])
+        self.assertEqual(["tag #1", "tag #2"], summary["tags"])
+        self.assertTrue("2010/10/01/first.html#more" in summary["excerpt"])
+        self.assertFalse("other" in summary["excerpt"])
+
+        # posts without excerpt have no summary body
+        self.assertEqual(None, first["posts"][0]["excerpt"])
+
+    # posts hold their full body with links from the root of the blog
+    def test_post(self):
+        first = read_api("posts", "2010", "10", "01", "first.json")
+        self.assertEqual("First", first["title"])
+        self.assertTrue('href="2010/10/02/second.html"' in first["body"])
+        self.assertFalse("readmore" in first["body"])
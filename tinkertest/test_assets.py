@@ -0,0 +1,144 @@
+'''
+    Assets Test
+    ~~~~~~~~~~~
+
+    Tests fingerprinting and bundling of static assets.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import os
+import re
+import shutil
+import tempfile
+from tinkerer import paths, post
+from tinkerer.ext import assets
+from tinkertest import utils
+
+
+# test case
+class TestAssets(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
+        post.create("Post", datetime.date(2010, 10, 1)).write(
+            content="Lorem ipsum")
+        with open(os.path.join(paths.root, "conf.py"), "a") as f:
+            f.write("\nfingerprint_static = True\n")
+
+    # get the local stylesheets and scripts referenced by a page
+    def get_assets(self, *path):
+        html = self.read_html(*path)
+        return (re.findall(r'<link rel="stylesheet" href="([^"]+)"', html),
+                re.findall(r'<script[^>]* src="([^":]+)"', html))
+
+    # adjacent stylesheets and scripts are bundled with hashed names
+    def test_bundles(self):
+        css, js = self.get_assets("2010", "10", "01", "post.html")
+
+        # flat.css has @import rules so it starts a second bundle
+        self.assertEqual(2, len(css))
+        for href in css:
+            self.assertTrue(re.match(r"\.\./\.\./\.\./_static/bundle\."
+                                     r"[0-9a-f]{10}\.css$", href))
+            self.assertTrue(
+                os.path.exists(os.path.normpath(os.path.join(
+                    paths.html, "2010", "10", "01", href))))
+        with open(os.path.join(paths.html, "2010", "10", "01", css[1]),
+                  "r") as f:
+            self.assertTrue(f.read().startswith("@import url("))
+
+        # modernizr is followed by jQuery from a CDN, so it is only
+        # fingerprinted
+        self.assertTrue(re.match(r"\.\./\.\./\.\./_static/vendor/"
+                                 r"modernizr-2\.6\.2\.min\.[0-9a-f]{10}\.js$",
+                                 js[0]))
+        self.assertTrue(any(re.match(r".*_static/bundle\.[0-9a-f]{10}\.js$",
+                                     src) for src in js[1:]))
+
+    # pages share bundles
+    def test_shared(self):
+        self.assertEqual(self.get_assets("2010", "10", "01", "post.html")[0],
+                         ["../../../" + css for css in
+                          self.get_assets("index.html")[0]])
+
+    # bundled stylesheets are minified and keep working references
+    def test_content(self):
+        content = ""
+        for css in self.get_assets("index.html")[0]:
+            with open(os.path.join(paths.html, css), "r") as f:
+                content += f.read()
+
+        self.assertTrue("fontawesome-webfont.woff" in content)
+        self.assertFalse("/*" in content.replace("/*!", ""))
+
+        # originals are kept for other references
+        self.assertTrue(os.path.exists(
+            os.path.join(paths.html, "_static", "main.css")))
+
+    # stylesheets moved to a bundle keep relative references working
+    def test_rebase_css(self):
+        self.assertEqual(
+            "a{background:url('img/a.png?v=1')}b{background:url(data:x)}",
+            assets.rebase_css(
+                "a{background:url('a.png?v=1')}b{background:url(data:x)}",
+                os.path.join("out", "_static", "img"),
+                os.path.join("out", "_static")))
+
+    # relative @import rules are rebased too
+    def test_rebase_import(self):
+        self.assertEqual(
+            '@import "img/a.css";@import url(img/b.css);'
+            '@import "http://example.com/c.css";',
+            assets.rebase_css(
+                '@import "a.css";@import url(b.css);'
+                '@import "http://example.com/c.css";',
+                os.path.join("out", "_static", "img"),
+                os.path.join("out", "_static")))
+
+    # stylesheets with @import rules are not appended to a bundle
+    def test_bundle_import(self):
+        outdir = tempfile.mkdtemp()
+        try:
+            static = os.path.join(outdir, "_static")
+            os.makedirs(os.path.join(static, "sub"))
+            for name, content in [("a.css", "a { color: red; }"),
+                                  ("sub/b.css", '@import "c.css";\nb {}'),
+                                  ("c.css", "c { color: blue; }")]:
+                with open(os.path.join(static, name), "w") as f:
+                    f.write(content)
+            with open(os.path.join(outdir, "index.html"), "w") as f:
+                f.write('<link rel="stylesheet" href="_static/a.css">\n'
+                        '<link rel="stylesheet" href="_static/sub/b.css">\n'
+                        '<link rel="stylesheet" href="_static/c.css">\n')
+
+            assets.Pipeline(outdir).run()
+
+            with open(os.path.join(outdir, "index.html"), "r") as f:
+                css = re.findall(r'href="([^"]+)"', f.read())
+            self.assertTrue(re.match(r"_static/a\.[0-9a-f]{10}\.css$",
+                                     css[0]))
+            self.assertTrue(re.match(r"_static/bundle\.[0-9a-f]{10}\.css$",
+                                     css[1]))
+            with open(os.path.join(outdir, css[1]), "r") as f:
+                self.assertEqual('@import "sub/c.css";b{}\nc{color:blue}',
+                                 f.read())
+        finally:
+            shutil.rmtree(outdir)
+
+    # comments and whitespace are removed from stylesheets
+    def test_minify_css(self):
+        self.assertEqual(
+            "a:hover,b{color:red;margin:0 auto}",
+            assets.minify_css("/* links */\na:hover, b {\n  color: red;\n"
+                              "  margin: 0 auto;\n}\n"))
+
+    # strings and url() values are left as they are
+    def test_minify_css_strings(self):
+        self.assertEqual(
+            "a:before{content:\"a, b: c /* d */\";"
+            "background:url(data:image/png;base64, x)}b{content:'it\\'s ;}'}",
+            assets.minify_css("a:before {\n  content: \"a, b: c /* d */\";\n"
+                              "  background: url(data:image/png;base64, x);\n"
+                              "}\n/* it's */\nb { content: 'it\\'s ;}'; }\n"))
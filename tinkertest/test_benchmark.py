@@ -0,0 +1,70 @@
+'''
+    Benchmark Test
+    ~~~~~~~~~~~~~~
+
+    Tests the synthetic blog generator and benchmark scenarios on a tiny blog.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import collections
+import json
+import os
+import random
+from tinkerer import master, paths
+from tinkertest import utils
+from tinkertest.benchmark import generator, scenarios
+
+
+# test case
+class TestBenchmark(utils.BaseTinkererTest):
+    # generated blog has the requested documents, newest post first in TOC
+    def test_generate(self):
+        blog = generator.generate(paths.root, posts=30, pages=2, drafts=3)
+
+        self.assertEqual(30, len(blog["posts"]))
+        self.assertEqual(2, len(blog["pages"]))
+        self.assertEqual(3, len(blog["drafts"]))
+        for path in blog["posts"] + blog["pages"] + blog["drafts"]:
+            self.assertTrue(os.path.exists(path))
+
+        toc = [line.strip() for line in master.read_master()
+               if line.startswith("   ") and ":" not in line]
+        self.assertEqual(32, len(toc))
+        self.assertTrue(toc[0] > toc[29])
+        self.assertEqual("pages/page_0", toc[30])
+
+    # same seed generates the same blog
+    def test_generate_seed(self):
+        self.assertEqual(
+            generator.make_content(random.Random(1)),
+            generator.make_content(random.Random(1)))
+
+    # first ranks are sampled far more often than the tail
+    def test_zipf(self):
+        sampler = generator.ZipfSampler(list(range(100)),
+                                        rng=random.Random(0))
+        counts = collections.Counter(sampler.sample() for _ in range(5000))
+
+        self.assertTrue(counts[0] > 10 * counts[50])
+        self.assertEqual(3, len(set(sampler.sample_distinct(3))))
+
+    # all scenarios are timed and results are serializable
+    def test_run(self):
+        results = scenarios.run(paths.root, posts=8, pages=1, drafts=1)
+
+        for scenario in scenarios.SCENARIOS:
+            self.assertTrue(results["seconds"][scenario] > 0, scenario)
+        json.dumps(results)
+
+    # slower scenarios are reported as regressions
+    def test_compare(self):
+        baseline = {"runs": [{"posts": 10, "seconds": {"clean_build": 1.0,
+                                                       "new_post": 1.0}}]}
+        results = {"runs": [{"posts": 10, "seconds": {"clean_build": 1.1,
+                                                      "new_post": 2.0}},
+                            {"posts": 20, "seconds": {"clean_build": 9.0}}]}
+
+        self.assertEqual([(10, "new_post", 1.0, 2.0)],
+                         scenarios.compare(baseline, results, 0.2))
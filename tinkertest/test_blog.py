@@ -0,0 +1,105 @@
+'''
+    Blog Context Test
+    ~~~~~~~~~~~~~~~~~
+
+    Tests handling several blogs in the same process.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import mock
+from multiprocessing.pool import ThreadPool
+import os
+from tinkerer import cmdline, master, page, paths, post, writer
+from tinkerer.blog import Blog, get_blog
+from tinkertest import utils
+
+
+# test case
+class TestBlog(utils.BaseTinkererTest):
+    def make_blog(self, name, word_sep):
+        blog = Blog(os.path.join(utils.TEST_ROOT, name))
+        os.makedirs(blog.root)
+        writer.setup_blog(blog)
+        with open(blog.conf_file, "a") as f:
+            f.write("\nslug_word_separator = '%s'\n" % word_sep)
+        with open(os.path.join(blog.templates, "page.rst"), "w") as f:
+            f.write("{{ title }}\n=====\n\nPage of %s\n" % name)
+        return blog
+
+    # default blog follows paths
+    def test_default(self):
+        self.assertEqual(paths.root, get_blog().root)
+        self.assertEqual(paths.html, get_blog().html)
+
+        blog = Blog(utils.TEST_ROOT)
+        self.assertTrue(get_blog(blog) is blog)
+
+    # conf.py is only loaded once for the word separator
+    def test_word_separator(self):
+        blog = self.make_blog("first", "-")
+        with mock.patch.object(blog, "get_conf",
+                               wraps=blog.get_conf) as get_conf:
+            self.assertEqual("-", blog.word_separator)
+            self.assertEqual("-", blog.word_separator)
+        self.assertEqual(1, get_conf.call_count)
+
+        # changes to conf.py are picked up
+        with open(blog.conf_file, "a") as f:
+            f.write("\nslug_word_separator = \"+\"\n")
+        self.assertEqual("+", blog.word_separator)
+
+    # blogs use their own paths, configuration and templates
+    def test_blogs(self):
+        blogs = [self.make_blog("first", "-"), self.make_blog("second", "_")]
+
+        def create(blog):
+            for i in range(5):
+                post.create("A Post %d" % i, datetime.date(2010, 10, i + 1),
+                            blog=blog)
+            return page.create("About Blog", blog=blog)
+
+        pool = ThreadPool(2)
+        try:
+            pages = pool.map(create, blogs)
+        finally:
+            pool.close()
+
+        self.assertEqual(
+            os.path.join(blogs[0].root, "pages", "about-blog.rst"),
+            pages[0].path)
+        self.assertEqual(
+            os.path.join(blogs[1].root, "pages", "about_blog.rst"),
+            pages[1].path)
+        for blog, new_page in zip(blogs, pages):
+            with open(new_page.path, "r") as f:
+                self.assertTrue(os.path.basename(blog.root) in f.read())
+
+        self.assertTrue(master.exists_doc("2010/10/05/a-post-4", blogs[0]))
+        self.assertFalse(master.exists_doc("2010/10/05/a-post-4", blogs[1]))
+        self.assertTrue(master.exists_doc("2010/10/05/a_post_4", blogs[1]))
+
+        # nothing was written to the default blog
+        self.assertFalse(master.exists_doc("pages/about_blog"))
+
+    # blogs can be built concurrently
+    def test_build(self):
+        blogs = [self.make_blog("first", "_"), self.make_blog("second", "_")]
+        for blog in blogs:
+            post.create("Post", datetime.date(2010, 10, 1), blog=blog).write(
+                content="Post of %s" % os.path.basename(blog.root))
+
+        pool = ThreadPool(2)
+        try:
+            results = pool.map(lambda blog: cmdline.build(blog=blog), blogs)
+        finally:
+            pool.close()
+
+        self.assertEqual([0, 0], results)
+        for blog in blogs:
+            with open(os.path.join(blog.html, "2010", "10", "01",
+                                   "post.html"), "r") as f:
+                self.assertTrue("Post of %s" % os.path.basename(blog.root) in
+                                f.read())
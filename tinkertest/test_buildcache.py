@@ -0,0 +1,126 @@
+'''
+    Build Cache Test
+    ~~~~~~~~~~~~~~~~
+
+    Tests content-hash change detection and moving the build cache between
+    blog checkouts.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import os
+import shutil
+import time
+from sphinx.application import Sphinx
+from tinkerer import buildcache, cmdline, paths, post
+from tinkerer.blog import Blog
+from tinkertest import utils
+
+try:
+    # Python 2
+    from StringIO import StringIO
+except ImportError:
+    # Python 3
+    from io import StringIO
+
+
+# build the blog keeping the environment and return the Sphinx status output
+def build(blog):
+    status = StringIO()
+    Sphinx(blog.root, blog.root, blog.html, blog.doctree, "html",
+           status=status, warning=StringIO()).build()
+    return status.getvalue()
+
+
+# copy the blog sources as a fresh checkout would, all files newer than the
+# last build
+def checkout(source, destination):
+    shutil.copytree(source, destination,
+                    ignore=shutil.ignore_patterns("blog"))
+    later = time.time() + 10
+    for root, dirs, files in os.walk(destination):
+        for name in files:
+            os.utime(os.path.join(root, name), (later, later))
+
+
+# test case
+class TestBuildCache(utils.BaseTinkererTest):
+    def setUp(self):
+        utils.BaseTinkererTest.setUp(self)
+        for day in range(1, 4):
+            post.create("Post %d" % day, datetime.date(2010, 10, day)).write(
+                content="Lorem ipsum %d" % day)
+
+    # unchanged sources are not read again even if they are newer
+    def test_unchanged(self):
+        build(Blog(paths.root))
+
+        later = time.time() + 10
+        for day in range(1, 4):
+            os.utime(os.path.join(paths.root, "2010", "10", "0%d" % day,
+                                  "post_%d.rst" % day), (later, later))
+
+        self.assertTrue("0 added, 0 changed, 0 removed" in
+                        build(Blog(paths.root)))
+
+    # cache moves to another checkout where only changed sources are read
+    def test_export_import(self):
+        build(Blog(paths.root))
+        archive = os.path.join(utils.TEST_ROOT, "cache.tar.gz")
+        buildcache.export_cache(archive)
+
+        clone = Blog(os.path.join(utils.TEST_ROOT, "clone"))
+        checkout(paths.root, clone.root)
+        with open(os.path.join(clone.root, "2010", "10", "02", "post_2.rst"),
+                  "a") as f:
+            f.write("\nEdited\n")
+
+        buildcache.import_cache(archive, clone)
+
+        self.assertTrue("0 added, 1 changed, 0 removed" in build(clone))
+        with open(os.path.join(clone.html, "2010", "10", "02", "post_2.html"),
+                  "r") as f:
+            self.assertTrue("Edited" in f.read())
+        with open(os.path.join(clone.html, "2010", "10", "01", "post_1.html"),
+                  "r") as f:
+            self.assertTrue("Lorem ipsum 1" in f.read())
+
+    # changing conf.py falls back to modification times
+    def test_conf_changed(self):
+        build(Blog(paths.root))
+        with open(os.path.join(paths.root, "conf.py"), "a") as f:
+            f.write("\n# changed\n")
+
+        later = time.time() + 10
+        os.utime(os.path.join(paths.root, "2010", "10", "01", "post_1.rst"),
+                 (later, later))
+
+        self.assertTrue("0 added, 1 changed, 0 removed" in
+                        build(Blog(paths.root)))
+
+    # command line exports after building and imports before building
+    def test_cmdline(self):
+        archive = os.path.join(utils.TEST_ROOT, "cache.tar.gz")
+
+        # a missing archive builds from scratch
+        self.assertEqual(
+            0,
+            cmdline.main(["--build", "--cache-import", archive,
+                          "--cache-export", archive, "--quiet"]))
+        self.assertTrue(os.path.exists(archive))
+
+        clone = os.path.join(utils.TEST_ROOT, "clone")
+        checkout(paths.root, clone)
+        paths.set_paths(clone)
+        self.assertEqual(
+            0,
+            cmdline.main(["--build", "--cache-import", archive, "--quiet"]))
+        self.assertTrue(os.path.exists(os.path.join(
+            clone, "blog", "html", "2010", "10", "03", "post_3.html")))
+
+        # build cache only works with --build
+        self.assertNotEqual(
+            0,
+            cmdline.main(["--check", "--cache-import", archive, "--quiet"]))
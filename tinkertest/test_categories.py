@@ -15,10 +15,9 @@ from tinkertest import utils
 
 
 # test case
-class TestCategories(utils.BaseTinkererTest):
-    def test_categories(self):
-        utils.test = self
-
+class TestCategories(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
         # create some posts with categories
 
         # missing category for Post1 ("cateogry #1,") should work,
@@ -29,44 +28,33 @@ class TestCategories(utils.BaseTinkererTest):
             post.create(new_post[0], datetime.date(2010, 10, 1)).write(
                 categories=new_post[1])
 
-        utils.hook_extension("test_categories")
-
-        self.build()
-
-
-# test categories through extension
-def build_finished(app, exception):
-    blog_categories = app.builder.env.filing["categories"]
-
     # check collected categories
-    utils.test.assertEquals(set(["category #1", "category #2"]),
-                            set(blog_categories))
+    def test_categories(self):
+        blog_categories = self.app.env.filing["categories"]
+
+        self.assertEqual(set(["category #1", "category #2"]),
+                         set(blog_categories))
 
-    # check categories
-    for result in [(set(["2010/10/01/post1", "2010/10/01/post12"]),
-                    "category #1"),
-                   (set(["2010/10/01/post2", "2010/10/01/post12"]),
-                    "category #2")]:
-        utils.test.assertEquals(result[0], set(blog_categories[result[1]]))
+        for result in [(set(["2010/10/01/post1", "2010/10/01/post12"]),
+                        "category #1"),
+                       (set(["2010/10/01/post2", "2010/10/01/post12"]),
+                        "category #2")]:
+            self.assertEqual(result[0], set(blog_categories[result[1]]))
 
     # check post metadata
-    for result in [([("category__1", "category #1")], "2010/10/01/post1"),
-                   ([("category__2", "category #2")], "2010/10/01/post2"),
-                   ([("category__1", "category #1"),
-                     ("category__2", "category #2")], "2010/10/01/post12")]:
-        utils.test.assertEquals(
-            result[0],
-            app.builder.env.blog_metadata[result[1]].filing["categories"])
+    def test_post_metadata(self):
+        for result in [([("category_1", "category #1")], "2010/10/01/post1"),
+                       ([("category_2", "category #2")], "2010/10/01/post2"),
+                       ([("category_1", "category #1"),
+                         ("category_2", "category #2")],
+                        "2010/10/01/post12")]:
+            self.assertEqual(
+                result[0],
+                self.app.env.blog_metadata[result[1]].filing["categories"])
 
     # check category pages were generated
-    for page in ["category__1.html", "category__2.html"]:
-        utils.test.assertTrue(os.path.exists(os.path.join(paths.html,
-                                                          "categories",
-                                                          page)))
-
-
-# extension setup
-def setup(app):
-    if utils.is_module(app):
-        return
-    app.connect("build-finished", build_finished)
+    def test_category_pages(self):
+        for page in ["category_1.html", "category_2.html"]:
+            self.assertTrue(os.path.exists(os.path.join(paths.html,
+                                                        "categories",
+                                                        page)))
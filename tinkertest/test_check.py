@@ -0,0 +1,117 @@
+'''
+    Check Test
+    ~~~~~~~~~~
+
+    Tests parse-only validation of blog sources.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import json
+import logging
+import mock
+import os
+try:
+    # Python 2
+    from StringIO import StringIO
+except ImportError:
+    # Python 3
+    from io import StringIO
+from tinkerer import check, cmdline, paths, post
+from tinkertest import utils
+
+
+# test case
+class TestCheck(utils.BaseTinkererTest):
+    def check(self, jobs=1):
+        # return problems failing the check
+        return [problem for problem in check.check(jobs)
+                if check.is_error(problem)]
+
+    def create_posts(self, count=8):
+        for i in range(count):
+            post.create("Post %d" % i, datetime.date(2010, 10, i + 1)).write(
+                content="Lorem ipsum", categories="category 1")
+
+    # a valid blog has no problems
+    def test_valid(self):
+        self.create_posts()
+
+        self.assertEqual([], self.check())
+
+        # check should not produce any build output
+        self.assertFalse(os.path.exists(paths.blog))
+
+    # empty filing entries are reported with their location
+    def test_empty_filing(self):
+        self.create_posts()
+        post.create("Bad Post", datetime.date(2010, 11, 1)).write(
+            categories="category 1,")
+
+        problems = self.check(jobs=2)
+
+        self.assertEqual(1, len(problems))
+        self.assertEqual(os.path.join("2010", "11", "01", "bad_post.rst"),
+                         problems[0]["file"])
+        self.assertEqual("WARNING", problems[0]["level"])
+        self.assertTrue("Empty string in 'categories' directive" in
+                        problems[0]["message"])
+
+    # invalid date paths are reported instead of failing the read
+    def test_invalid_date(self):
+        self.create_posts()
+        path = os.path.join(paths.root, "2010", "13", "01")
+        os.makedirs(path)
+        with open(os.path.join(path, "bad_date.rst"), "w") as f:
+            f.write("Bad date\n========\n")
+
+        problems = self.check()
+
+        self.assertTrue(any("Invalid post date" in problem["message"]
+                            for problem in problems))
+
+    # missing landing page is reported as an error
+    def test_missing_landing_page(self):
+        self.create_posts()
+        utils.update_conf({"landing_page = None": 'landing_page = "about"'})
+
+        problems = self.check()
+
+        self.assertEqual(1, len(problems))
+        self.assertEqual("conf.py", problems[0]["file"])
+        self.assertEqual("ERROR", problems[0]["level"])
+
+    # docutils system messages are parsed too
+    def test_parse_warnings(self):
+        problems = check.parse_warnings(
+            os.path.join(paths.root, "post.rst") +
+            ":3: (ERROR/3) Unknown directive type \"foo\".\n"
+            "\n"
+            ".. foo::\n"
+            "WARNING: global warning\n")
+
+        self.assertEqual(
+            [{"file": "post.rst", "line": 3, "level": "ERROR",
+              "message": 'Unknown directive type "foo".\n.. foo::'},
+             {"file": None, "line": None, "level": "WARNING",
+              "message": "global warning"}],
+            problems)
+
+    # command line reports JSON and a non-zero exit code
+    def test_cmdline(self):
+        logging.disable(logging.CRITICAL)
+        self.create_posts()
+        post.create("Bad Post", datetime.date(2010, 11, 1)).write(
+            tags="tag 1,")
+
+        stream = StringIO()
+        with mock.patch("sys.stdout", stream):
+            result = cmdline.main(["--check", "-j", "2"])
+        logging.disable(logging.NOTSET)
+
+        self.assertNotEqual(0, result)
+        problems = json.loads(stream.getvalue())["problems"]
+        self.assertEqual(
+            1, len([problem for problem in problems if problem["file"]]))
@@ -10,6 +10,7 @@
 '''
 import datetime
 import logging
+import mock
 import os
 try:
     # Python 2
@@ -18,7 +19,8 @@ except:
     # Python 3
     from io import StringIO
 import tinkerer
-from tinkerer import cmdline, output, paths, post
+from tinkerer import cmdline, output, paths, post, writer
+from tinkerer.blog import Blog
 from tinkertest import utils
 
 
@@ -171,6 +173,146 @@ class TestCmdLine(utils.BaseTinkererTest):
             os.path.join(utils.TEST_ROOT, "blog", "html", "2010",
                          "10", "01", "my_post.html")))
 
+    # test building additional themes
+    def test_build_themes(self):
+        post.create("My Post", datetime.date(2010, 10, 1)).write(
+            content="Lorem ipsum")
+
+        conf_path = os.path.join(utils.TEST_ROOT, "conf.py")
+        with open(conf_path, "r") as f:
+            conf = f.read()
+
+        flags = mock.patch.object(cmdline, "sphinx_flags",
+                                  wraps=cmdline.sphinx_flags)
+        with flags as sphinx_flags:
+            self.assertEqual(
+                0,
+                cmdline.main(["--build", "--themes", "modern5", "dark",
+                              "-j", "2", "--quiet"]))
+
+        # each theme is written from its own copy of the doctrees, removed
+        # once the theme is built
+        doctrees = [call[1].get("doctree")
+                    for call in sphinx_flags.call_args_list]
+        self.assertEqual(None, doctrees[0])
+        self.assertEqual(2, len(set(doctrees[1:])))
+        for doctree in doctrees[1:]:
+            self.assertNotEqual(paths.doctree, doctree)
+            self.assertFalse(os.path.exists(doctree))
+
+        # conf.py theme is built to the regular output directory
+        with open(os.path.join(paths.html, "index.html"), "r") as f:
+            self.assertTrue("flat.css" in f.read())
+
+        # other themes get their own output directory with full content
+        for theme in ["modern5", "dark"]:
+            with open(os.path.join(cmdline.theme_html(theme),
+                                   "index.html"), "r") as f:
+                html = f.read()
+                self.assertTrue("%s.css" % theme in html)
+                self.assertTrue("Lorem ipsum" in html)
+            self.assertTrue(os.path.exists(os.path.join(
+                cmdline.theme_html(theme), "2010", "10", "01",
+                "my_post.html")))
+
+        # conf.py should not be modified
+        with open(conf_path, "r") as f:
+            self.assertEqual(conf, f.read())
+
+        # --themes only works with --build
+        self.assertNotEqual(
+            0,
+            cmdline.main(["--check", "--themes", "dark"]))
+
+    # the theme of the first build can be given instead of read from conf.py
+    def test_build_themes_default(self):
+        post.create("My Post", datetime.date(2010, 10, 1)).write(
+            content="Lorem ipsum")
+
+        conf_path = os.path.join(utils.TEST_ROOT, "conf.py")
+        with open(conf_path, "r") as f:
+            conf = f.read()
+
+        self.assertEqual(0, cmdline.build_themes(["dark"], theme="modern5"))
+
+        with open(os.path.join(paths.html, "index.html"), "r") as f:
+            html = f.read()
+            self.assertTrue("modern5.css" in html)
+            self.assertFalse("flat.css" in html)
+        with open(os.path.join(cmdline.theme_html("dark"), "index.html"),
+                  "r") as f:
+            self.assertTrue("dark.css" in f.read())
+
+        # conf.py should not be modified
+        with open(conf_path, "r") as f:
+            self.assertEqual(conf, f.read())
+
+    # test building several blogs
+    def test_build_many(self):
+        for name in ["first", "second"]:
+            blog = Blog(os.path.join(utils.TEST_ROOT, "blogs", name))
+            os.makedirs(blog.root)
+            writer.setup_blog(blog)
+            post.create("Post", datetime.date(2010, 10, 1), blog=blog).write(
+                content="Post of %s" % name)
+
+        self.assertEqual(
+            0,
+            cmdline.main(["--build-many",
+                          os.path.join(utils.TEST_ROOT, "blogs", "*"),
+                          "-j", "2", "--quiet"]))
+
+        for name in ["first", "second"]:
+            with open(os.path.join(utils.TEST_ROOT, "blogs", name, "blog",
+                                   "html", "2010", "10", "01", "post.html"),
+                      "r") as f:
+                self.assertTrue("Post of %s" % name in f.read())
+
+        # a missing blog fails the whole command
+        self.assertNotEqual(
+            0,
+            cmdline.main(["--build-many",
+                          os.path.join(utils.TEST_ROOT, "blogs", "first"),
+                          os.path.join(utils.TEST_ROOT, "missing"),
+                          "--quiet"]))
+
+    # slugs follow the built blog's conf.py, not the current directory's
+    def test_build_many_word_separator(self):
+        blog = Blog(os.path.join(utils.TEST_ROOT, "blogs", "sep"))
+        os.makedirs(blog.root)
+        writer.setup_blog(blog)
+        with open(os.path.join(blog.root, "conf.py"), "a") as f:
+            f.write("\nslug_word_separator = \"-\"\n")
+        post.create("Post", datetime.date(2010, 10, 1), blog=blog).write(
+            tags="tag one")
+
+        cwd = os.getcwd()
+        os.chdir(utils.TEST_ROOT)
+        try:
+            self.assertEqual(
+                0, cmdline.main(["--build-many", blog.root, "--quiet"]))
+        finally:
+            os.chdir(cwd)
+
+        self.assertTrue(os.path.exists(os.path.join(
+            blog.html, "tags", "tag-one.html")))
+        with open(os.path.join(blog.html, "2010", "10", "01", "post.html"),
+                  "r") as f:
+            self.assertTrue("tags/tag-one.html" in f.read())
+
+    # blog roots are expanded in order, without duplicates
+    def test_blog_roots(self):
+        os.makedirs(os.path.join(utils.TEST_ROOT, "blogs", "b"))
+        os.makedirs(os.path.join(utils.TEST_ROOT, "blogs", "a"))
+        blogs = os.path.join(utils.TEST_ROOT, "blogs")
+
+        self.assertEqual(
+            [os.path.join(blogs, "b"), os.path.join(blogs, "a"),
+             os.path.join(blogs, "c")],
+            cmdline.blog_roots([os.path.join(blogs, "b"),
+                                os.path.join(blogs, "*"),
+                                os.path.join(blogs, "c")]))
+
     # ensure tinkerer only runs from blog root (dir containing conf.py) except
     # when running setup
     def test_root_only(self):
@@ -0,0 +1,112 @@
+'''
+    Compress Test
+    ~~~~~~~~~~~~~
+
+    Tests precompressed output.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import gzip
+import mock
+import os
+from tinkerer import cmdline, paths, post, utils as tinkerer_utils
+from tinkerer.ext import compress
+from tinkertest import utils
+
+
+# test case
+class TestCompress(utils.BaseTinkererTest):
+    def setUp(self):
+        utils.BaseTinkererTest.setUp(self)
+        post.create("Post", datetime.date(2010, 10, 1)).write(
+            content="Lorem ipsum " * 200)
+
+    def enable(self, min_size=1024):
+        with open(os.path.join(paths.root, "conf.py"), "a") as f:
+            f.write("\nprecompress = True\nprecompress_min_size = %d\n" %
+                    min_size)
+
+    # compressed siblings are written for text files above the threshold
+    def test_compress(self):
+        self.enable()
+        utils.build_blog()
+
+        filename = os.path.join(paths.html, "2010", "10", "01", "post.html")
+        with open(filename, "rb") as f:
+            content = f.read()
+        with gzip.open(filename + ".gz", "rb") as f:
+            self.assertEqual(content, f.read())
+        self.assertEqual(compress.brotli is not None,
+                         os.path.exists(filename + ".br"))
+
+        self.assertTrue(os.path.exists(
+            os.path.join(paths.html, "rss.html.gz")))
+        self.assertTrue(os.path.exists(
+            os.path.join(paths.html, "_static", "flat.css.gz")))
+
+        # images are not compressed
+        self.assertFalse(os.path.exists(
+            os.path.join(paths.html, "_static", "tinkerer.ico.gz")))
+
+    # small files are not compressed
+    def test_min_size(self):
+        self.enable(10 ** 6)
+        utils.build_blog()
+
+        self.assertFalse(os.path.exists(
+            os.path.join(paths.html, "2010", "10", "01", "post.html.gz")))
+
+    # unchanged files are not compressed again
+    def test_unchanged(self):
+        self.enable()
+        utils.build_blog()
+
+        with mock.patch.object(compress, "gzip_compress",
+                               wraps=compress.gzip_compress) as gzip_compress:
+            with mock.patch.object(compress, "brotli", None):
+                post.create("Post", datetime.date(2010, 10, 2)).write(
+                    content="Dolor sit amet " * 200)
+                utils.build_blog()
+
+        self.assertTrue(os.path.exists(
+            os.path.join(paths.html, "2010", "10", "02", "post.html.gz")))
+        self.assertTrue(os.path.exists(
+            os.path.join(paths.html, "_static", "flat.css.gz")))
+
+        # only pages listing the new post changed
+        compressed = len(gzip_compress.call_args_list)
+        self.assertTrue(0 < compressed < len(compress.find_files(
+            paths.html, [".html", ".css", ".js"], 1024)) / 2)
+
+    # the cache is kept across clean builds of the command line
+    def test_clean_build(self):
+        self.enable()
+        self.assertEqual(0, cmdline.build())
+
+        cache = tinkerer_utils.get_cache_path(paths.root, "precompressed")
+        cached = []
+        for root, dirs, names in os.walk(cache):
+            cached += [os.path.join(root, name) for name in names]
+        self.assertTrue(cached)
+        for filename in cached:
+            os.utime(filename, (0, 0))
+
+        self.assertEqual(0, cmdline.build())
+
+        self.assertTrue(os.path.exists(os.path.join(
+            paths.html, "2010", "10", "01", "post.html.gz")))
+        self.assertFalse(os.path.exists(os.path.join(paths.doctree,
+                                                     "precompressed")))
+        # unchanged files were copied from the cache
+        self.assertTrue(all(os.path.getmtime(filename) == 0
+                            for filename in cached))
+
+    # no compressed files by default
+    def test_disabled(self):
+        utils.build_blog()
+
+        self.assertFalse(os.path.exists(os.path.join(paths.html,
+                                                     "index.html.gz")))
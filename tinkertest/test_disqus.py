@@ -53,3 +53,38 @@ class TestDisqus(utils.BaseTinkererTest):
         # ensure comment count is added to aggregated page
         self.assertTrue(
             disqus.get_count(POST_LINK, POST_ID) in output_html)
+
+    # test threads and comment counts loaded by disqus.js
+    def test_lazy_load(self):
+        TEST_SHORTNAME = "test_shortname"
+
+        utils.update_conf(
+            {"disqus_shortname = None":
+             'disqus_shortname = "%s"\ndisqus_lazy_load = True' %
+             TEST_SHORTNAME})
+
+        post.create("post1", datetime.date(2010, 10, 1))
+        POST_ID = "2010/10/01/post1"
+        POST_LINK = "http://127.0.0.1/blog/html/" + POST_ID + ".html"
+
+        self.build()
+
+        output = os.path.join(utils.TEST_ROOT,
+                              "blog", "html", "2010", "10", "01", "post1.html")
+        output_html = open(output, "r").read()
+
+        # thread is configured through data- attributes, without inline JS
+        self.assertTrue(
+            disqus.create_lazy_thread(TEST_SHORTNAME, POST_ID) in output_html)
+        self.assertFalse("disqus_thread();" in output_html)
+        self.assertTrue("_static/disqus.js" in output_html)
+
+        output = os.path.join(utils.TEST_ROOT,
+                              "blog", "html", "index.html")
+        output_html = open(output, "r").read()
+
+        # comment counts are enabled by the links themselves
+        self.assertFalse("disqus_count();" in output_html)
+        self.assertTrue(
+            disqus.get_count(POST_LINK, POST_ID, TEST_SHORTNAME)
+            in output_html)
@@ -106,6 +106,7 @@ class TestDraft(utils.BaseTinkererTest):
             paths.post_template,
             mock.ANY,
             mock.ANY,
+            blog=mock.ANY,
         )
 
     @mock.patch('tinkerer.writer.render')
@@ -115,4 +116,5 @@ class TestDraft(utils.BaseTinkererTest):
             'the_template.rst',
             mock.ANY,
             mock.ANY,
+            blog=mock.ANY,
         )
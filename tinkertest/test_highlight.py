@@ -0,0 +1,75 @@
+'''
+    Highlight Test
+    ~~~~~~~~~~~~~~
+
+    Tests the cache of highlighted code blocks.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import mock
+import os
+import shutil
+import tempfile
+from sphinx.highlighting import PygmentsBridge
+from tinkerer import paths, post, utils as tinkerer_utils
+from tinkerer.ext import highlight
+from tinkertest import utils
+
+
+# test case
+class TestHighlight(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
+        post.create("Post", datetime.date(2010, 10, 1)).write(
+            content=".. code-block:: python\n\n   print(1)\n\n"
+                    ".. code-block:: python\n\n   print(2)\n\n"
+                    ".. code-block:: nosuchlang\n\n   print(3)\n")
+
+    # blocks are highlighted once and cached unless they raised warnings
+    def test_first_build(self):
+        cache = self.app.blog_highlight_cache
+        self.assertEqual((0, 3), (cache.hits, cache.misses))
+        self.assertEqual(2, len(os.listdir(tinkerer_utils.get_cache_path(
+            paths.root, highlight.CACHE_DIR))))
+        self.assertTrue('<span class="nb">print</span>' in
+                        self.read_html("2010", "10", "01", "post.html"))
+
+    # cached blocks are not highlighted again, even after a clean build
+    def test_cache(self):
+        shutil.rmtree(paths.blog)
+        patched = mock.patch.object(PygmentsBridge, "highlight_block",
+                                    autospec=True,
+                                    side_effect=PygmentsBridge.highlight_block)
+        with patched as highlight_block:
+            app = utils.build_blog()
+
+        self.assertEqual(1, highlight_block.call_count)
+        self.assertEqual((2, 1), (app.blog_highlight_cache.hits,
+                                  app.blog_highlight_cache.misses))
+        self.assertTrue('<span class="nb">print</span>' in
+                        self.read_html("2010", "10", "01", "post.html"))
+
+    # least recently used blocks are evicted first
+    def test_evict(self):
+        path = tempfile.mkdtemp()
+        try:
+            cache = highlight.HighlightCache(self.app.builder.highlighter,
+                                             path)
+            names = []
+            for i in range(3):
+                cache.highlight_block("print(%d)" % i, "python")
+                names.append(cache.get_filename("print(%d)" % i, "python",
+                                                None, {}))
+                os.utime(names[-1], (i, i))
+
+            cache.highlight_block("print(0)", "python")
+            self.assertEqual(1, cache.hits)
+
+            cache.evict(2)
+            self.assertEqual([True, False, True],
+                             [os.path.exists(name) for name in names])
+        finally:
+            shutil.rmtree(path)
@@ -0,0 +1,69 @@
+'''
+    HTML5 Test
+    ~~~~~~~~~~
+
+    Tests the HTML5 translator of the blog.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import os
+from sphinx.writers.html import HTMLTranslator
+from tinkerer import page, paths, post
+from tinkerer.ext import html5
+from tinkertest import utils
+
+
+# test case
+class TestHTML5(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
+        with open(os.path.join(paths.root, "dot.svg"), "w") as f:
+            f.write('<svg xmlns="http://www.w3.org/2000/svg"/>')
+        post.create("Post", datetime.date(2010, 10, 1)).write(
+            content="Some ``code`` here\n\n"
+                    ".. image:: ../../../dot.svg\n\n"
+                    ".. raw:: html\n\n"
+                    "   <iframe src=\"http://example.com/\"></iframe>\n\n"
+                    "Subsection\n----------\n\nText")
+        page.create("About").write(content="Title\n-----\n\nText")
+        with open(os.path.join(paths.root, "conf.py"), "a") as f:
+            f.write("\nhtml_add_permalinks = \"#\"\n"
+                    "post_header_links = False\n")
+
+    # sections and literals use HTML5 elements
+    def test_markup(self):
+        html = self.read_html("2010", "10", "01", "post.html")
+        self.assertTrue('<section id="subsection">' in html)
+        self.assertFalse('class="section"' in html)
+        self.assertTrue('<span class="docutils literal">' in html)
+
+    # media are loaded lazily
+    def test_lazy_loading(self):
+        html = self.read_html("2010", "10", "01", "post.html")
+        self.assertTrue('loading="lazy" decoding="async" />' in html)
+        self.assertTrue('<iframe src="http://example.com/" '
+                        'loading="lazy"></iframe>' in html)
+
+    # headline permalinks are left out of posts only
+    def test_header_links(self):
+        self.assertFalse("headerlink" in self.read_html(
+            "2010", "10", "01", "post.html"))
+        self.assertTrue("headerlink" in self.read_html("pages",
+                                                       "about.html"))
+
+    # the Sphinx translator is left as it is
+    def test_no_patching(self):
+        self.assertTrue(issubclass(self.app.builder.translator_class,
+                                   html5.HTML5Translator))
+        self.assertFalse(hasattr(HTMLTranslator, "add_lazy_loading"))
+        self.assertFalse(HTMLTranslator.visit_literal ==
+                         html5.HTML5Translator.visit_literal)
+
+    # existing attributes are kept
+    def test_add_lazy_loading(self):
+        self.assertEqual(
+            '<img src="a.png" loading="eager" decoding="async">',
+            html5.add_lazy_loading('<img src="a.png" loading="eager">'))
@@ -0,0 +1,119 @@
+'''
+    Images Test
+    ~~~~~~~~~~~
+
+    Tests responsive images and their links on aggregated pages and feeds.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import mock
+import os
+import shutil
+import unittest
+from tinkerer import paths, post
+from tinkerer.ext import images, patch
+from tinkertest import utils
+
+
+# test case
+@unittest.skipIf(images.Image is None, "Pillow is not installed")
+class TestImages(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
+        images.Image.new("RGB", (800, 400), (255, 0, 0)).save(
+            os.path.join(paths.root, "photo.png"))
+        post.create("Post", datetime.date(2010, 10, 1)).write(
+            content=".. image:: ../../../photo.png\n\n"
+                    ".. image:: ../../../photo.png\n"
+                    "   :width: 100px\n")
+        with open(os.path.join(paths.root, "conf.py"), "a") as f:
+            f.write("\nimage_widths = [200, 400, 1600]\n")
+
+    # images get dimensions, resized variants and lazy loading
+    def test_post(self):
+        html = self.read_html("2010", "10", "01", "post.html")
+
+        self.assertTrue(
+            'srcset="../../../_images/photo-200w.png 200w, '
+            '../../../_images/photo-400w.png 400w, '
+            '../../../_images/photo.png 800w"' in html)
+        self.assertTrue('sizes="100vw"' in html)
+        self.assertTrue('width="800"' in html)
+        self.assertTrue('height="400"' in html)
+        self.assertTrue('loading="lazy"' in html)
+
+        # images with an explicit size are left to Sphinx
+        self.assertEqual(1, html.count("srcset="))
+
+        image = images.Image.open(
+            os.path.join(paths.html, "_images", "photo-200w.png"))
+        self.assertEqual((200, 100), image.size)
+        self.assertFalse(os.path.exists(
+            os.path.join(paths.html, "_images", "photo-1600w.png")))
+
+    # srcset is rebased on aggregated pages and feeds
+    def test_aggregated(self):
+        self.assertTrue(
+            'srcset="_images/photo-200w.png 200w, _images/photo-400w.png '
+            '400w, _images/photo.png 800w"' in self.read_html("index.html"))
+        self.assertTrue(
+            "_images/photo-200w.png 200w" in self.read_html("rss.html"))
+        self.assertTrue(
+            "http://127.0.0.1/blog/html/_images/photo-400w.png 400w" in
+            self.read_html("rss.html"))
+
+    # unchanged images are not resized again, even after a clean build
+    def test_cache(self):
+        shutil.rmtree(paths.blog)
+        with mock.patch.object(images, "resize") as resize:
+            utils.build_blog()
+
+        self.assertFalse(resize.called)
+        self.assertTrue(os.path.exists(
+            os.path.join(paths.html, "_images", "photo-400w.png")))
+
+    # source images are closed once read or resized
+    def test_close(self):
+        files = []
+
+        def open_image(*args):
+            image = open_source(*args)
+            files.append(image.fp)
+            return image
+
+        open_source = images.Image.open
+        source = os.path.join(paths.root, "photo.png")
+        builder = mock.Mock(app=mock.Mock(blog_image_sources={}))
+        with mock.patch.object(images.Image, "open", side_effect=open_image):
+            digest, size = images.get_source(builder, source)
+            images.resize(source, os.path.join(paths.root, "small.png"), 100,
+                          size)
+
+        self.assertEqual(2, len(files))
+        self.assertTrue(all(f.closed for f in files))
+
+
+# test case
+class TestPatchImages(unittest.TestCase):
+    # urls relative to the parent directory are rebased, others are only
+    # normalized
+    def test_patch_url(self):
+        self.assertEqual("_images/a.png",
+                         patch.patch_url("../../../_images/a.png",
+                                         "2010/10/01/"))
+        self.assertEqual("a.png",
+                         patch.patch_url("./a.png", "2010/10/01/"))
+        self.assertEqual("http://example.com/a.png",
+                         patch.patch_url("http://example.com/a.png",
+                                         "2010/10/01/"))
+
+    # each srcset candidate is rebased
+    def test_patch_srcset(self):
+        self.assertEqual(
+            "_images/a-200w.png 200w, http://example.com/a.png 800w",
+            patch.patch_srcset("../../../_images/a-200w.png 200w,"
+                               "http://example.com/a.png 800w",
+                               "2010/10/01/"))
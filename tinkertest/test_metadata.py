@@ -14,10 +14,9 @@ from tinkertest import utils
 
 
 # test case
-class TestMetadata(utils.BaseTinkererTest):
-    def test_metadata(self):
-        utils.test = self
-
+class TestMetadata(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
         # create some posts
         for i in range(20):
             post.create("Post %d" % i, datetime.date(2010, 10, i + 1)).write(
@@ -27,29 +26,18 @@ class TestMetadata(utils.BaseTinkererTest):
         for i in range(10):
             page.create("Page %d" % i)
 
-        utils.hook_extension("test_metadata")
-        self.build()
-
-
-# test metadata through extension
-def build_finished(app, exception):
-    env = app.builder.env
-
     # check posts were identified as such
-    posts = ["2010/10/%02d/post_%d" % (i + 1, i) for i in range(20)]
-    utils.test.assertEquals(set(posts), set(env.blog_posts))
+    def test_posts(self):
+        posts = ["2010/10/%02d/post_%d" % (i + 1, i) for i in range(20)]
+        self.assertEqual(set(posts), set(self.app.env.blog_posts))
 
     # check pages were identified as such
-    pages = ["pages/page_%d" % i for i in range(10)]
-    utils.test.assertEquals(set(pages), set(env.blog_pages))
+    def test_pages(self):
+        pages = ["pages/page_%d" % i for i in range(10)]
+        self.assertEqual(set(pages), set(self.app.env.blog_pages))
 
     # body should contain the whole 100 word string
-    utils.test.assertTrue(" ".join("a" * 100) in
-                          env.blog_metadata[env.blog_posts[0]].body)
-
-
-# extension setup
-def setup(app):
-    if utils.is_module(app):
-        return
-    app.connect("build-finished", build_finished)
+    def test_body(self):
+        env = self.app.env
+        self.assertTrue(" ".join("a" * 100) in
+                        env.blog_metadata[env.blog_posts[0]].body)
@@ -14,22 +14,6 @@ import tinkerer
 from tinkerer import page, post
 
 
-# test case
-class TestOrdering(utils.BaseTinkererTest):
-    def test_ordering(self):
-        utils.test = self
-
-        # create some pages and posts
-        page.create("First Page")
-        post.create("Oldest Post", datetime.date(2010, 10, 1))
-        post.create("Newer Post", datetime.date(2010, 10, 1))
-        page.create("Another Page")
-        post.create("Newest Post", datetime.date(2010, 10, 1))
-
-        utils.hook_extension("test_ordering")
-        self.build()
-
-
 ordering = {
     tinkerer.master_doc: [None, None, "2010/10/01/newest_post"],
     "2010/10/01/newest_post": [tinkerer.master_doc, tinkerer.master_doc,
@@ -44,31 +28,33 @@ ordering = {
 }
 
 
-# test ordering through extension
-def build_finished(app, exception):
-    env = app.builder.env
+# test case
+class TestOrdering(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
+        # create some pages and posts
+        page.create("First Page")
+        post.create("Oldest Post", datetime.date(2010, 10, 1))
+        post.create("Newer Post", datetime.date(2010, 10, 1))
+        page.create("Another Page")
+        post.create("Newest Post", datetime.date(2010, 10, 1))
 
     # check post and pages have the correct relations
-    relations = env.collect_relations()
+    def test_relations(self):
+        relations = self.app.env.collect_relations()
 
-    for docname in ordering:
-        utils.test.assertEquals(relations[docname], ordering[docname])
+        for docname in ordering:
+            self.assertEqual(ordering[docname], relations[docname])
 
     # check metadata ordering is correct
-    utils.test.assertEquals(
-        ["2010/10/01/newest_post",
-         "2010/10/01/newer_post",
-         "2010/10/01/oldest_post"],
-        env.blog_posts)
-
-    utils.test.assertEquals(
-        ["pages/first_page",
-         "pages/another_page"],
-        env.blog_pages)
-
-
-# extension setup
-def setup(app):
-    if utils.is_module(app):
-        return
-    app.connect("build-finished", build_finished)
+    def test_ordering(self):
+        self.assertEqual(
+            ["2010/10/01/newest_post",
+             "2010/10/01/newer_post",
+             "2010/10/01/oldest_post"],
+            self.app.env.blog_posts)
+
+        self.assertEqual(
+            ["pages/first_page",
+             "pages/another_page"],
+            self.app.env.blog_pages)
@@ -0,0 +1,105 @@
+'''
+    Pagination Test
+    ~~~~~~~~~~~~~~~
+
+    Tests grouping of posts into aggregated pages.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import mock
+import os
+from tinkerer import paths, post
+from tinkerer.ext import aggregator
+from tinkertest import utils
+
+
+# test case
+class TestPagination(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
+        for day in range(1, 6):
+            post.create("Post %d" % day, datetime.date(2010, 10, day)).write()
+        with open(os.path.join(paths.root, "conf.py"), "a") as f:
+            f.write("\nposts_per_page = 2\nstable_pagination = True\n")
+
+    # returns [(pagename, posts)] of the aggregated pages of the given posts
+    def get_groups(self, posts, **config):
+        app = mock.Mock()
+        app.builder.env.blog_posts = posts
+        app.config.posts_per_page = 2
+        app.config.landing_page = None
+        app.config.stable_pagination = True
+        for name, value in config.items():
+            setattr(app.config, name, value)
+        return [(pagename, group) for pagename, _, group
+                in aggregator.get_groups(app)]
+
+    # pages are numbered from the oldest post
+    def test_stable(self):
+        self.assertEqual(
+            [("index", ["p5", "p4", "p3"]), ("page1", ["p2", "p1"])],
+            self.get_groups(["p5", "p4", "p3", "p2", "p1"]))
+
+        # publishing a post doesn't change older pages
+        self.assertEqual(
+            [("index", ["p6", "p5"]), ("page2", ["p4", "p3"]),
+             ("page1", ["p2", "p1"])],
+            self.get_groups(["p6", "p5", "p4", "p3", "p2", "p1"]))
+
+        self.assertEqual([("index", ["p1"])], self.get_groups(["p1"]))
+        self.assertEqual([], self.get_groups([]))
+
+    # pages are numbered from the newest post by default
+    def test_default(self):
+        self.assertEqual(
+            [("index", ["p5", "p4"]), ("page2", ["p3", "p2"]),
+             ("page3", ["p1"])],
+            self.get_groups(["p5", "p4", "p3", "p2", "p1"],
+                            stable_pagination=False))
+
+    # with a landing page the newest posts are on latest.html
+    def test_landing_page(self):
+        self.assertEqual(
+            ["latest", "page1"],
+            [pagename for pagename, _ in self.get_groups(
+                ["p4", "p3", "p2", "p1"], landing_page="about")])
+        self.assertEqual(
+            ["page1", "page2"],
+            [pagename for pagename, _ in self.get_groups(
+                ["p3", "p2", "p1"], landing_page="about",
+                stable_pagination=False)])
+
+    # pages link to each other
+    def test_links(self):
+        self.assertTrue('href="page1.html"' in self.read_html("index.html"))
+        self.assertTrue('href="index.html"' in self.read_html("page1.html"))
+        self.assertFalse(os.path.exists(os.path.join(paths.html,
+                                                     "page2.html")))
+
+
+# test case
+class TestMaxPages(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
+        for day in range(1, 6):
+            post.create("Post %d" % day, datetime.date(2010, 10, day)).write()
+        with open(os.path.join(paths.root, "conf.py"), "a") as f:
+            f.write("\nposts_per_page = 2\naggregated_max_pages = 2\n")
+
+    # older posts are only listed by the archive
+    def test_max_pages(self):
+        self.assertTrue(os.path.exists(os.path.join(paths.html,
+                                                    "page2.html")))
+        self.assertFalse(os.path.exists(os.path.join(paths.html,
+                                                     "page3.html")))
+
+        html = self.read_html("page2.html")
+        self.assertTrue('<link rel="next" title="Older" '
+                        'href="archive.html" />' in html)
+        self.assertTrue('href="index.html"' in html)
+
+        html = self.read_html("archive.html")
+        self.assertTrue("2010/10/01/post_1.html" in html)
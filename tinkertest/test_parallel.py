@@ -0,0 +1,99 @@
+'''
+    Parallel Build Test
+    ~~~~~~~~~~~~~~~~~~~
+
+    Tests parallel generation of aggregated, tag, category and archive pages.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import mock
+import os
+import shutil
+import sphinx
+from tinkerer import paths, post
+from tinkerer.ext import parallel
+from tinkertest import utils
+
+
+# pages generated by the blog extension rather than from sources
+COLLECTED_PAGES = [
+    ["index.html"],
+    ["page2.html"],
+    ["page3.html"],
+    ["archive.html"],
+    ["rss.html"],
+    ["tags", "tag_0.html"],
+    ["tags", "tag_1.html"],
+    ["categories", "category_0.html"],
+    ["categories", "category_1.html"],
+]
+
+
+# test case
+class TestParallel(utils.BaseTinkererTest):
+    def read_pages(self):
+        pages = {}
+        for page in COLLECTED_PAGES:
+            with open(os.path.join(paths.html, *page), "r") as f:
+                pages[page[-1]] = f.read()
+        return pages
+
+    def test_parallel_pages(self):
+        for i in range(25):
+            post.create("Post %d" % i, datetime.date(2010, 10, i + 1)).write(
+                content="Lorem ipsum %d\n\n.. more::\n\nDolor sit" % i,
+                tags="tag %d" % (i % 2),
+                categories="category %d" % (i % 3 % 2))
+
+        self.build()
+        serial = self.read_pages()
+
+        shutil.rmtree(paths.blog)
+        self.build(jobs=4)
+        parallel = self.read_pages()
+
+        # output should be identical to a serial build
+        for page in serial:
+            self.assertEqual(serial[page], parallel[page])
+
+        # aggregated pages should still get patched links
+        self.assertTrue('href="2010/10/25/post_24.html#more"' in
+                        parallel["index.html"])
+
+    def test_worker_state(self):
+        for i in range(25):
+            post.create("Post %d" % i, datetime.date(2010, 10, i + 1)).write(
+                tags="tag %d" % (i % 2))
+
+        serial = utils.build_blog()
+
+        shutil.rmtree(paths.blog)
+        parallel = utils.build_blog(jobs=4)
+
+        # sidebar widgets of tag pages are only rendered by workers, they
+        # should be sent back to the main process
+        self.assertTrue(("recent.html", 1) in
+                        parallel.blog_sidebar_fragments)
+        self.assertEqual(sorted(serial.blog_sidebar_fragments),
+                         sorted(parallel.blog_sidebar_fragments))
+
+    # Sphinx is only patched during parallel blog builds on old versions
+    def test_patch_scope(self):
+        post.create("Post", datetime.date(2010, 10, 1)).write()
+        self.build(jobs=2)
+        self.assertTrue(parallel.ParallelTasks._join_one is
+                        parallel.sphinx_join_one)
+
+        self.assertFalse(parallel.patch_parallel_tasks(mock.Mock(parallel=1)))
+        try:
+            patched = parallel.patch_parallel_tasks(mock.Mock(parallel=2))
+            self.assertEqual(sphinx.version_info[:2] < (1, 6), patched)
+            self.assertEqual(patched, parallel.ParallelTasks._join_one is
+                             parallel.join_one)
+        finally:
+            parallel.restore_parallel_tasks()
+        self.assertTrue(parallel.ParallelTasks._join_one is
+                        parallel.sphinx_join_one)
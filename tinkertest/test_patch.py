@@ -15,44 +15,62 @@ from tinkerer import paths, post
 from tinkertest import utils
 
 
-# test case
-class TestPatch(utils.BaseTinkererTest):
+# files created in the blog root
+FILENAMES = ["img.png", "img1.png", "img2.png", "img3.png"]
+
+# posts are tuples consisting of post title, date and content, each test
+# checks the posts of a different day
+POSTS = [
+    # links and images
+    ("Post1", datetime.date(2010, 10, 1),
+     ":ref:`x`\n`Arch Linux <www.archlinux.org>`_"),
+    ("Post2", datetime.date(2010, 10, 1),
+     ".. _x:\n\nX\n-\n.. image:: ../../../img.png"),
+
+    # images with :target: specified
+    ("Post1", datetime.date(2010, 10, 2),
+     # relative target
+     ".. image:: ../../../img1.png\n"
+     "   :target: ../../../_images/img1.png\n"
+     "\n"
+     # absolute target
+     ".. image:: ../../../img2.png\n"
+     "   :target: /_images/img2.png\n"
+     "\n"
+     # external target
+     ".. image:: ../../../img3.png\n"
+     "   :target: www.archlinux.org\n"),
+
+    # invalid link, which doesn't produce a proper <a> tag
+    ("Post1", datetime.date(2010, 10, 3),
+     "`http://book.cakephp.org/3.0/en/appendices/3-0-migration-\n"
+     "guide.html`_"),
+]
+
 
-    def check_posts(self, filenames, posts, expected):
-        # helper function which creates given list of files and posts, runs a
-        # build, then ensures expected content exists in each file
-        for filename in filenames:
+# test case
+class TestPatch(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
+        for filename in FILENAMES:
             with open(os.path.join(paths.root, filename), "w") as f:
                 f.write("content not important")
 
-        # posts are tuples consisting of post title and content
-        # all posts are created on 2010/10/1 as date is not relevant here
-        for new_post in posts:
-            post.create(new_post[0], datetime.date(2010, 10, 1)).write(
-                content=new_post[1]
-            )
-
-        # build and check output
-        self.build()
+        for title, date, content in POSTS:
+            post.create(title, date).write(content=content)
 
+    def check_output(self, expected):
         # tests are tuples consisting of file path (as a list) and the list of
         # expected content
         for test in expected:
-            with open(os.path.join(paths.html, *test[0]), "r") as f:
-                content = f.read()
-                for data in test[1]:
-                    if data not in content:
-                        print(data)
-                        print(content)
-                    self.assertTrue(data in content)
+            content = self.read_html(*test[0])
+            for data in test[1]:
+                if data not in content:
+                    print(data)
+                    print(content)
+                self.assertTrue(data in content)
 
     def test_patch_a_and_img(self):
-        filenames = ["img.png"]
-        posts = [
-            ("Post1", ":ref:`x`\n`Arch Linux <www.archlinux.org>`_"),
-            ("Post2", ".. _x:\n\nX\n-\n.. image:: ../../../img.png")
-        ]
-
         expected = [
             # Sphinx running on Python3 has an achor here, Python2 doesn't
             (["2010", "10", "01", "post1.html"],
@@ -77,29 +95,12 @@ class TestPatch(utils.BaseTinkererTest):
               'src="http://127.0.0.1/blog/html/_images/img.png"'])
         ]
 
-        self.check_posts(filenames, posts, expected)
+        self.check_output(expected)
 
     def test_patch_target(self):
         # tests patching links for images with :target: specified
-        filenames = ["img1.png", "img2.png", "img3.png"]
-
-        posts = [
-            ("Post1",
-             # relative target
-             ".. image:: ../../../img1.png\n"
-             "   :target: ../../../_images/img1.png\n"
-             "\n"
-             # absolute target
-             ".. image:: ../../../img2.png\n"
-             "   :target: /_images/img2.png\n"
-             "\n"
-             # external target
-             ".. image:: ../../../img3.png\n"
-             "   :target: www.archlinux.org\n")
-        ]
-
         expected = [
-            (["2010", "10", "01", "post1.html"],
+            (["2010", "10", "02", "post1.html"],
              [
                  # nothing should be changed
                  'href="../../../_images/img1.png"',
@@ -124,19 +125,12 @@ class TestPatch(utils.BaseTinkererTest):
                 'href="www.archlinux.org"'])
         ]
 
-        self.check_posts(filenames, posts, expected)
+        self.check_output(expected)
 
     def test_patch_bad_link(self):
         # post with an invalid link, which doesn't produce a proper <a> tag
-        posts = [
-            ("Post1",
-             # bad link
-             "`http://book.cakephp.org/3.0/en/appendices/3-0-migration-\n"
-             "guide.html`_")
-        ]
-
         expected = [
-            (["2010", "10", "01", "post1.html"],
+            (["2010", "10", "03", "post1.html"],
              [
                 # should be marked as problematic by Sphinx
                 '<a href="#id1"><span class="problematic" id="id2">'
@@ -144,4 +138,4 @@ class TestPatch(utils.BaseTinkererTest):
                 'guide.html`_</span></a>'])
         ]
 
-        self.check_posts([], posts, expected)
+        self.check_output(expected)
@@ -200,6 +200,7 @@ class TestPost(utils.BaseTinkererTest):
             paths.post_template,
             mock.ANY,
             mock.ANY,
+            blog=mock.ANY,
         )
 
     # test creating post with given template
@@ -210,4 +211,5 @@ class TestPost(utils.BaseTinkererTest):
             "the_template.rst",
             mock.ANY,
             mock.ANY,
+            blog=mock.ANY,
         )
@@ -10,7 +10,7 @@
 '''
 import datetime
 import os
-from tinkerer import post
+from tinkerer import paths, post
 from tinkertest import utils
 
 
@@ -41,3 +41,43 @@ class TestReadMore(utils.BaseTinkererTest):
             ' href="2010/10/01/post1.html#more">Read more...</a></p>'
         )
         self.assertTrue(expected in index_html)
+
+
+# test excerpts
+class TestExcerpt(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
+        post.create("Marked", datetime.date(2010, 10, 1)).write(
+            content="Intro\n\nSection\n-------\n\nShown\n\n.. more::\n\n"
+                    "Hidden\n\nOther\n-----\n\nHidden again")
+        post.create("Long", datetime.date(2010, 10, 2)).write(
+            content="One two three\n\nfour five six\n\nSeven eight")
+        post.create("Short", datetime.date(2010, 10, 3)).write(
+            content="One two three four five")
+        with open(os.path.join(paths.root, "conf.py"), "a") as f:
+            f.write("\nexcerpt_words = 5\n")
+
+    # excerpts end at the marker
+    def test_marker(self):
+        excerpt = self.app.env.blog_metadata["2010/10/01/marked"].excerpt
+        self.assertTrue("Shown" in excerpt)
+        self.assertFalse("Hidden" in excerpt)
+
+        for html in [self.read_html("index.html"),
+                     self.read_html("rss.html")]:
+            self.assertTrue("2010/10/01/marked.html#more" in html)
+            self.assertFalse("Hidden" in html)
+
+    # posts without a marker are cut after excerpt_words words
+    def test_words(self):
+        excerpt = self.app.env.blog_metadata["2010/10/02/long"].excerpt
+        self.assertTrue("four five six" in excerpt)
+        self.assertFalse("Seven" in excerpt)
+        self.assertTrue("2010/10/02/long.html#more" in
+                        self.read_html("index.html"))
+        self.assertTrue("Seven" in self.read_html("2010", "10", "02",
+                                                  "long.html"))
+
+        # short posts are aggregated in full
+        self.assertEqual(
+            None, self.app.env.blog_metadata["2010/10/03/short"].excerpt)
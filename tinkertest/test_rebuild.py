@@ -0,0 +1,50 @@
+'''
+    Rebuild Test
+    ~~~~~~~~~~~~
+
+    Tests builds of blogs with pages and rebuilds reusing the environment.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import os
+from tinkerer import page, paths, post
+from tinkertest import utils
+
+
+# read a page of the built blog
+def read_html(*path):
+    with open(os.path.join(paths.html, *path), "r") as f:
+        return f.read()
+
+
+# test case
+class TestRebuild(utils.BaseTinkererTest):
+    # pages are not listed with posts
+    def test_pages_are_not_posts(self):
+        post.create("Post", datetime.date(2010, 10, 1)).write(
+            content="Post body")
+        page.create("About").write(content="About body")
+        self.build()
+
+        feed = read_html("rss.html")
+        self.assertTrue("2010/10/01/post.html" in feed)
+        self.assertFalse("pages/about.html" in feed)
+
+    # posts which are not read again are still listed on aggregated pages
+    def test_rebuild(self):
+        post.create("First", datetime.date(2010, 10, 1)).write(
+            content="First body")
+        second = post.create("Second", datetime.date(2010, 10, 2))
+        second.write(content="Second body")
+        self.build()
+
+        # second build reuses the environment and only reads the edited post
+        second.write(content="Edited body")
+        self.build()
+        for name in ["index.html", "rss.html"]:
+            html = read_html(name)
+            self.assertTrue("First body" in html)
+            self.assertTrue("Edited body" in html)
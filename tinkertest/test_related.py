@@ -0,0 +1,71 @@
+'''
+    Related Posts Test
+    ~~~~~~~~~~~~~~~~~~
+
+    Tests related posts.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import os
+import random
+import unittest
+from tinkerer import paths, post
+from tinkerer.ext import related
+from tinkertest import utils
+
+
+# test case
+class TestRelated(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
+        post.create("A", datetime.date(2010, 10, 1)).write(tags="x, y")
+        post.create("B", datetime.date(2010, 10, 2)).write(tags="x")
+        post.create("C", datetime.date(2010, 10, 3)).write(
+            tags="y", categories="z")
+        post.create("D", datetime.date(2010, 10, 4)).write(tags="q")
+        with open(os.path.join(paths.root, "conf.py"), "a") as f:
+            f.write("\nrelated_posts = 2\n")
+
+    # posts sharing rarer tags and categories rank first
+    def test_related(self):
+        env = self.app.builder.env
+        self.assertEqual(["2010/10/02/b", "2010/10/03/c"],
+                         env.blog_related["2010/10/01/a"])
+        self.assertEqual(["2010/10/01/a"], env.blog_related["2010/10/02/b"])
+        self.assertEqual(["2010/10/01/a"], env.blog_related["2010/10/03/c"])
+        self.assertEqual([], env.blog_related["2010/10/04/d"])
+
+    # related posts are listed after the post
+    def test_page(self):
+        html = self.read_html("2010", "10", "02", "b.html")
+        self.assertTrue('<div class="related_posts">' in html)
+        self.assertTrue('<a href="../01/a.html">A</a>' in html)
+        self.assertFalse('<div class="related_posts">' in self.read_html(
+            "2010", "10", "04", "d.html"))
+
+
+# test case
+class TestCompute(unittest.TestCase):
+    def setUp(self):
+        generator = random.Random(1)
+        self.features = [sorted(set(("tags", generator.randint(0, 30))
+                                    for _ in range(generator.randint(0, 4))))
+                         for _ in range(300)]
+        self.weights = related.get_weights(self.features)
+
+    # ties go to the newer post
+    def test_ties(self):
+        features = [[("tags", "x")]] * 3
+        self.assertEqual(
+            [[1, 2], [0, 2], [0, 1]],
+            related.compute_python(features, related.get_weights(features), 5))
+
+    # matrix implementation ranks posts like the pure Python one
+    @unittest.skipIf(related.numpy is None, "NumPy and SciPy not installed")
+    def test_numpy(self):
+        self.assertEqual(
+            related.compute_python(self.features, self.weights, 5),
+            related.compute_numpy(self.features, self.weights, 5))
@@ -141,6 +141,7 @@ class TestRSS(utils.BaseTinkererTest):
 # object we use.
 class FauxConfig(object):
     rss_max_items = 0
+    rss_archive_size = 0
     website = None
     project = 'faux project'
     tagline = 'faux tagline'
@@ -231,3 +232,50 @@ class TestRSSTitle(utils.BaseTinkererTest):
     def test_without_title(self):
         context = rss.make_feed_context(self.app, None, [])
         self.assertEqual('faux project', context['title'])
+
+
+class TestRSSArchive(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
+        for day in range(1, 6):
+            post.create("Post %d" % day, datetime.date(2010, 10, day)).write(
+                content="Content %d" % day)
+        with open(os.path.join(paths.root, "conf.py"), "a") as f:
+            f.write("\nrss_archive_size = 2\n")
+
+    # get the item titles and feed links of a feed
+    def get_feed(self, name):
+        doc = xml.dom.minidom.parse(os.path.join(paths.html, name))
+        titles = [item.getElementsByTagName("title")[0].firstChild.nodeValue
+                  for item in doc.getElementsByTagName("item")]
+        links = [(link.getAttribute("rel"), link.getAttribute("href"))
+                 for link in doc.getElementsByTagName("atom:link")]
+        archive = bool(doc.getElementsByTagName("fh:archive"))
+        return titles, links, archive
+
+    # archives hold all posts from the oldest and link to each other
+    def test_archives(self):
+        website = "http://127.0.0.1/blog/html/"
+        self.assertEqual(
+            (["Post 5", "Post 4"],
+             [("prev-archive", website + "rss2.html")], False),
+            self.get_feed("rss.html"))
+        self.assertEqual(
+            (["Post 2", "Post 1"],
+             [("current", website + "rss.html"),
+              ("next-archive", website + "rss2.html")], True),
+            self.get_feed("rss1.html"))
+        self.assertEqual(
+            (["Post 4", "Post 3"],
+             [("current", website + "rss.html"),
+              ("prev-archive", website + "rss1.html")], True),
+            self.get_feed("rss2.html"))
+        self.assertFalse(os.path.exists(os.path.join(paths.html,
+                                                     "rss3.html")))
+
+    # items are generated while the feed is written
+    def test_items(self):
+        context = rss.make_feed_context(self.app, None,
+                                        self.app.env.blog_posts)
+        self.assertFalse(isinstance(context["items"], list))
+        self.assertEqual(5, len(list(context["items"])))
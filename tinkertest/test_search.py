@@ -0,0 +1,178 @@
+'''
+    Search Test
+    ~~~~~~~~~~~
+
+    Tests the sharded blog search index.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import json
+import os
+import subprocess
+import unittest
+from distutils.spawn import find_executable
+from sphinx.application import Sphinx
+from tinkerer import page, paths, post
+from tinkerer.ext import search
+from tinkertest import utils
+
+try:
+    # Python 2
+    from StringIO import StringIO
+except ImportError:
+    # Python 3
+    from io import StringIO
+
+
+# Node.js runs the search client in tests if installed
+NODE = find_executable("node") or find_executable("nodejs")
+
+# runs a query, given as JSON, with the search client against the index,
+# writes the terms of the query and the names of the matching documents,
+# best first
+NODE_SCRIPT = '''
+var fs = require('fs');
+var args = process.argv.slice(-3);
+var BlogSearch = new Function(fs.readFileSync(args[0], 'utf8') +
+                              '\\nreturn BlogSearch;')();
+var read = function (name) {
+    return JSON.parse(fs.readFileSync(args[1] + '/' + name, 'utf8'));
+};
+var manifest = read('manifest.json');
+var terms = BlogSearch.getTerms(JSON.parse(args[2]), manifest);
+var shards = {};
+terms.forEach(function (term) {
+    BlogSearch.getPrefixes(term, manifest).forEach(function (prefix) {
+        shards[manifest.shards[prefix]] = read(manifest.shards[prefix]);
+    });
+});
+var docs = BlogSearch.score(terms, manifest, shards).map(function (result) {
+    var chunk = manifest.docs[Math.floor(result[0] / manifest.chunk_size)];
+    return read(chunk)[result[0] % manifest.chunk_size][0];
+});
+process.stdout.write(JSON.stringify([terms, docs]));
+'''
+
+
+# read the manifest and a file of the index
+def read_index(path=None):
+    with open(os.path.join(paths.html, search.INDEX_DIR,
+                           path or "manifest.json"), "r") as f:
+        return json.load(f)
+
+
+# test case
+class TestSearch(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
+        post.create("Zebra Post", datetime.date(2010, 10, 1)).write(
+            content="Zeppelins and zebras", tags="zoology")
+        post.create("Other Post", datetime.date(2010, 10, 2)).write(
+            content="Zebras again, zebras everywhere")
+        page.create("About Page").write(content="Quokka")
+        with open(os.path.join(paths.root, "conf.py"), "a") as f:
+            f.write("\nblog_search = True\n")
+
+    # terms are sharded by prefix and scored
+    def test_shards(self):
+        manifest = read_index()
+        self.assertEqual(2, manifest["prefix_length"])
+
+        zebra = read_index(manifest["shards"]["ze"])
+        self.assertEqual(set(["zebra", "zebras", "zeppelins"]), set(zebra))
+
+        docs = read_index(manifest["docs"][0])
+        ids = dict((doc[0], number) for number, doc in enumerate(docs)
+                   if doc)
+        self.assertEqual(
+            ["2010/10/01/zebra_post", "2010/10/02/other_post",
+             "pages/about_page"], sorted(ids))
+
+        scores = dict(zebra["zebras"])
+        self.assertEqual(2, scores[ids["2010/10/02/other_post"]])
+        self.assertEqual(1, scores[ids["2010/10/01/zebra_post"]])
+
+        # title and tags weigh more than the body, which includes the title
+        self.assertEqual(
+            [[ids["2010/10/01/zebra_post"], search.TITLE_WEIGHT + 1]],
+            zebra["zebra"])
+        self.assertEqual(
+            [[ids["2010/10/01/zebra_post"], search.FILING_WEIGHT]],
+            read_index(manifest["shards"]["zo"])["zoology"])
+
+        # stop words are not indexed
+        self.assertFalse("an" in manifest["shards"])
+
+    # search page uses the blog index
+    def test_search_page(self):
+        html = self.read_html("search.html")
+        self.assertTrue("blogsearch.js" in html)
+        self.assertTrue("_search/manifest.json" in html)
+        self.assertFalse("searchtools.js" in html)
+
+    # the client leaves out stop words and splits words as the index does
+    @unittest.skipIf(NODE is None, "Node.js is not installed")
+    def test_client(self):
+        def query(text):
+            return json.loads(subprocess.check_output([
+                NODE, "-e", NODE_SCRIPT,
+                os.path.join(os.path.dirname(search.__file__), os.pardir,
+                             "static", "blogsearch.js"),
+                os.path.join(paths.html, search.INDEX_DIR),
+                json.dumps(text)]).decode("utf-8"))
+
+        self.assertEqual(
+            [["zebras"], ["2010/10/02/other_post", "2010/10/01/zebra_post"]],
+            query("the zebras"))
+        self.assertEqual(
+            [["zebras", "again"], ["2010/10/02/other_post"]],
+            query(u"this zebras\u2014again"))
+
+    # stop words are left out of queries by the client
+    def test_stopwords(self):
+        self.assertTrue("the" in read_index()["stopwords"])
+
+    # non-ASCII prefixes get safe shard names
+    def test_shard_name(self):
+        self.assertEqual("ab", search.shard_name("ab"))
+        self.assertEqual("xc3a9", search.shard_name(u"\xe9"))
+
+
+# test case
+class TestSearchIncremental(utils.BaseTinkererTest):
+    def build_env(self):
+        Sphinx(paths.root, paths.root, paths.html, paths.doctree, "html",
+               status=None, warning=StringIO()).build()
+
+    def list_index(self):
+        return set(os.listdir(os.path.join(paths.html, search.INDEX_DIR,
+                                           "shards")))
+
+    # only shards of changed posts are rewritten and ids are kept
+    def test_incremental(self):
+        with open(os.path.join(paths.root, "conf.py"), "a") as f:
+            f.write("\nblog_search = True\n")
+        first = post.create("First", datetime.date(2010, 10, 1))
+        first.write(content="Aardvark")
+        post.create("Second", datetime.date(2010, 10, 2)).write(
+            content="Kangaroo")
+        self.build_env()
+        before = self.list_index()
+        docs = read_index(read_index()["docs"][0])
+
+        first.write(content="Aardwolf")
+        post.create("Another", datetime.date(2010, 9, 1)).write(
+            content="Wombat")
+        self.build_env()
+        after = self.list_index()
+
+        self.assertEqual(set(["aa", "an", "wo"]),
+                         set(name.split(".")[0] for name in after - before))
+        self.assertEqual(set(["aa"]),
+                         set(name.split(".")[0] for name in before - after))
+
+        # new documents get new ids
+        self.assertEqual(docs[:2], read_index(read_index()["docs"][0])[:2])
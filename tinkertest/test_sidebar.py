@@ -0,0 +1,69 @@
+'''
+    Sidebar Test
+    ~~~~~~~~~~~~
+
+    Tests the sidebar fragment cache.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import mock
+import os
+from tinkerer import page, paths, post
+from tinkerer.ext import sidebar
+from tinkertest import utils
+
+
+# test case
+class TestSidebar(utils.BaseBuiltBlogTest):
+    @classmethod
+    def create_blog(cls):
+        post.create("First", datetime.date(2010, 10, 1)).write(
+            tags="tag #1", categories="category #1")
+        post.create("Second", datetime.date(2011, 5, 2)).write(
+            tags="tag #1, tag #2")
+        page.create("About").write()
+        with open(os.path.join(paths.root, "conf.py"), "a") as f:
+            f.write("\nhtml_sidebars = {'**': ['recent.html', "
+                    "'tags_cloud.html', 'categories.html', 'tags.html', "
+                    "'searchbox.html']}\n")
+
+    # links of cached widgets resolve from pages of any directory
+    def test_links(self):
+        for path, prefix in [(["index.html"], ""),
+                             (["pages", "about.html"], "../"),
+                             (["2010", "10", "01", "first.html"], "../" * 3),
+                             (["2011", "05", "02", "second.html"],
+                              "../" * 3)]:
+            html = self.read_html(*path)
+            for link in ["2010/10/01/first.html", "2011/05/02/second.html",
+                         "tags/tag_1.html", "tags/tag_2.html",
+                         "categories/category_1.html"]:
+                self.assertTrue('href="%s%s"' % (prefix, link) in html,
+                                "%s not in %s" % (link, path[-1]))
+
+            # the search box is rendered per page
+            self.assertTrue('action="%ssearch.html"' % prefix in html)
+
+    # each widget is rendered once per depth
+    def test_render_once(self):
+        with mock.patch.object(sidebar, "Markup",
+                               wraps=sidebar.Markup) as markup:
+            utils.build_blog()
+
+        # four widgets for the root, pages, tags and categories and posts
+        self.assertEqual(4 * 3, markup.call_count)
+
+    # pathto of cached widgets
+    def test_pathto(self):
+        builder = mock.Mock()
+        builder.get_target_uri = lambda docname: docname + ".html"
+        self.assertEqual("../../tags/a.html",
+                         sidebar.make_pathto(builder, 2)("tags/a"))
+        self.assertEqual("../_static/a.css",
+                         sidebar.make_pathto(builder, 1)("_static/a.css", 1))
+        self.assertEqual("http://example.com/a.css",
+                         sidebar.make_pathto(builder, 1)(
+                             "http://example.com/a.css", 1))
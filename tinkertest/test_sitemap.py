@@ -0,0 +1,130 @@
+'''
+    Sitemap Test
+    ~~~~~~~~~~~~
+
+    Tests the sitemap and its shards.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import datetime
+import mock
+import os
+import time
+import xml.dom.minidom
+from sphinx.application import Sphinx
+from tinkerer import page, paths, post
+from tinkerer.ext import sitemap
+from tinkertest import utils
+
+try:
+    # Python 2
+    from StringIO import StringIO
+except ImportError:
+    # Python 3
+    from io import StringIO
+
+
+WEBSITE = "http://127.0.0.1/blog/html/"
+
+
+# read the locations and dates of a sitemap or sitemap index
+def read_sitemap(name="sitemap.xml"):
+    doc = xml.dom.minidom.parse(os.path.join(paths.html, name))
+    entries = []
+    for node in doc.documentElement.childNodes:
+        if node.nodeType != node.ELEMENT_NODE:
+            continue
+        loc = node.getElementsByTagName("loc")[0].firstChild.nodeValue
+        lastmod = node.getElementsByTagName("lastmod")
+        entries.append((loc, lastmod[0].firstChild.nodeValue
+                        if lastmod else None))
+    return doc.documentElement.tagName, entries
+
+
+# test case
+class TestSitemap(utils.BaseTinkererTest):
+    def setUp(self):
+        super(TestSitemap, self).setUp()
+        with open(os.path.join(paths.root, "conf.py"), "a") as f:
+            f.write("\nblog_sitemap = True\n")
+        self.first = post.create("First", datetime.date(2010, 10, 1))
+        self.first.write(tags="tag #1", categories="category #1")
+        self.second = post.create("Second", datetime.date(2010, 10, 2))
+        self.second.write()
+        self.about = page.create("About")
+        self.about.write()
+
+        # sources were last changed on different days, only the date of
+        # pages comes from their source
+        for doc, day in [(self.first, 1), (self.second, 2), (self.about, 3)]:
+            timestamp = time.mktime(datetime.date(2011, 1, day).timetuple())
+            os.utime(doc.path, (timestamp, timestamp))
+
+    # build reusing the environment of the previous build
+    def build_env(self):
+        Sphinx(paths.root, paths.root, paths.html, paths.doctree, "html",
+               status=None, warning=StringIO()).build()
+
+    # posts, pages and generated pages are listed with their last change
+    def test_sitemap(self):
+        self.build_env()
+
+        tag, entries = read_sitemap()
+        self.assertEqual("urlset", tag)
+        self.assertEqual([
+            (WEBSITE + "2010/10/01/first.html", "2010-10-01"),
+            (WEBSITE + "2010/10/02/second.html", "2010-10-02"),
+            (WEBSITE + "pages/about.html", "2011-01-03"),
+            (WEBSITE + "index.html", "2010-10-02"),
+            (WEBSITE + "archive.html", "2010-10-02"),
+            (WEBSITE + "tags/tag_1.html", "2010-10-01"),
+            (WEBSITE + "categories/category_1.html", "2010-10-01")],
+            entries)
+
+    # dates only change with the content of the source
+    def test_dates(self):
+        self.build_env()
+
+        # touching a source doesn't change its date, editing it does
+        os.utime(self.second.path, None)
+        self.first.write(content="Changed")
+        self.build_env()
+
+        today = time.strftime("%Y-%m-%d", time.gmtime())
+        dates = dict(read_sitemap()[1])
+        self.assertEqual("2010-10-02",
+                         dates[WEBSITE + "2010/10/02/second.html"])
+        self.assertEqual(today, dates[WEBSITE + "2010/10/01/first.html"])
+        self.assertEqual(today, dates[WEBSITE + "index.html"])
+
+    # large sitemaps are split and unchanged shards are not written again
+    def test_shards(self):
+        with mock.patch.object(sitemap, "MAX_URLS", 3):
+            self.build_env()
+            tag, shards = read_sitemap()
+            self.assertEqual("sitemapindex", tag)
+            self.assertEqual(
+                [WEBSITE + "sitemap-1.xml", WEBSITE + "sitemap-2.xml",
+                 WEBSITE + "sitemap-3.xml"],
+                [loc for loc, _ in shards])
+            self.assertEqual(3, len(read_sitemap("sitemap-1.xml")[1]))
+
+            # only the shard listing the changed page is written
+            for number in range(1, 4):
+                os.utime(os.path.join(paths.html, "sitemap-%d.xml" % number),
+                         (0, 0))
+            self.about.write(content="Changed")
+            self.build_env()
+            self.assertEqual(
+                [True, False, False],
+                [os.path.getmtime(os.path.join(
+                    paths.html, "sitemap-%d.xml" % number)) > 0
+                 for number in range(1, 4)])
+
+        # shards are removed once the sitemap fits in a single file
+        self.build_env()
+        self.assertEqual("urlset", read_sitemap()[0])
+        self.assertFalse(os.path.exists(os.path.join(paths.html,
+                                                     "sitemap-1.xml")))
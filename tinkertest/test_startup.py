@@ -0,0 +1,82 @@
+'''
+    Startup Test
+    ~~~~~~~~~~~~
+
+    Tests that Tinkerer commands which don't build the blog start quickly by
+    checking they don't import the build machinery. Commands are run in a
+    fresh interpreter.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+import json
+import os
+import subprocess
+import sys
+from tinkerer import paths
+from tinkerer import utils as tinkerer_utils
+from tinkertest import utils
+
+
+# modules only needed to build the blog
+BUILD_MODULES = ["docutils", "multiprocessing", "sphinx", "subprocess"]
+
+# imports the command line and writes the names of all loaded modules on the
+# last line
+IMPORT_SCRIPT = (
+    "import json, sys\n"
+    "import tinkerer.cmdline\n"
+    "sys.stdout.write('\\n' + json.dumps(sorted(sys.modules)))\n")
+
+# runs a command and writes the names of all loaded modules on the last line
+SCRIPT = (
+    "import json, sys\n"
+    "from tinkerer import cmdline\n"
+    "cmdline.main(%r)\n"
+    "sys.stdout.write('\\n' + json.dumps(sorted(sys.modules)))\n")
+
+
+# test case
+class TestStartup(utils.BaseTinkererTest):
+    def run_script(self, script):
+        # returns loaded modules
+        args = [sys.executable, "-c", script]
+
+        # make sure this checkout of tinkerer is imported
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+             env.get("PYTHONPATH", "")])
+
+        process = subprocess.Popen(args, cwd=paths.root, env=env,
+                                   stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE)
+        out, err = process.communicate()
+        self.assertEqual(0, process.returncode, err)
+
+        return json.loads(out.decode("utf8").splitlines()[-1])
+
+    # importing the command line doesn't load Jinja or any build module
+    def test_import(self):
+        modules = self.run_script(IMPORT_SCRIPT)
+
+        for module in BUILD_MODULES + ["jinja2"]:
+            self.assertFalse(module in modules, module)
+
+    # --version doesn't load Jinja or any build module
+    def test_version(self):
+        modules = self.run_script(SCRIPT % (["-q", "--version"],))
+
+        for module in BUILD_MODULES + ["jinja2"]:
+            self.assertFalse(module in modules, module)
+
+    # -p only loads what is needed to render the post
+    def test_post(self):
+        modules = self.run_script(SCRIPT % (["-q", "-p", "Post"],))
+
+        self.assertTrue(os.path.exists(os.path.join(
+            paths.root, os.path.join(*tinkerer_utils.split_date()),
+            "post.rst")))
+        for module in BUILD_MODULES:
+            self.assertFalse(module in modules, module)
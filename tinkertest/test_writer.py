@@ -0,0 +1,74 @@
+'''
+    Template Cache Test
+    ~~~~~~~~~~~~~~~~~~~
+
+    Tests caching of compiled templates.
+
+    :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
+    CONTRIBUTORS file)
+    :license: FreeBSD, see LICENSE file
+'''
+from jinja2 import Environment, FileSystemLoader
+import mock
+import os
+from tinkerer import paths, writer
+from tinkertest import utils
+
+
+# test case
+class TestWriter(utils.BaseTinkererTest):
+    def setUp(self):
+        utils.BaseTinkererTest.setUp(self)
+        self.cache = os.path.join(utils.TEST_ROOT, "cache")
+        self.patcher = mock.patch.object(paths, "cache", self.cache)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        utils.BaseTinkererTest.tearDown(self)
+
+    def make_env(self):
+        # new environment sharing the cache, as used by a separate command
+        return Environment(
+            loader=FileSystemLoader(os.path.join(paths.root, "_templates")),
+            bytecode_cache=writer.get_bytecode_cache())
+
+    # the cache directory is only created once a template is compiled
+    def test_lazy_directory(self):
+        env = self.make_env()
+        self.assertFalse(os.path.exists(self.cache))
+
+        env.from_string("{{ title }}")
+        self.assertFalse(os.path.exists(self.cache))
+
+        with open(os.path.join(paths.root, "_templates", "post.rst"),
+                  "w") as f:
+            f.write("{{ title }}\n")
+        env.get_template("post.rst")
+        self.assertTrue(os.path.exists(self.cache))
+
+    # compiled templates are stored and invalidated when the source changes
+    def test_bytecode_cache(self):
+        template = os.path.join(paths.root, "_templates", "post.rst")
+        with open(template, "w") as f:
+            f.write("{{ title }}\n")
+
+        self.assertEqual("Post", self.make_env().get_template(
+            "post.rst").render(title="Post"))
+        self.assertEqual(1, len(os.listdir(self.cache)))
+
+        with open(template, "w") as f:
+            f.write("Changed {{ title }}\n")
+
+        self.assertEqual("Changed Post", self.make_env().get_template(
+            "post.rst").render(title="Post"))
+        self.assertEqual(1, len(os.listdir(self.cache)))
+
+    # theme templates are cached during the build when enabled
+    def test_theme_cache(self):
+        with open(paths.conf_file, "a") as f:
+            f.write("\ntemplate_bytecode_cache = True\n")
+
+        self.build()
+
+        self.assertTrue(os.listdir(self.cache))
@@ -2,28 +2,44 @@
     Test utilities
     ~~~~~~~~~~~~~~
 
-    Base test case class inherited by all test cases. Utility functions.
+    Base test case classes inherited by all test cases. Utility functions.
+
+    Each test process uses its own temporary blog root so the suite can run
+    in parallel with ``pytest -n``.
 
     :copyright: Copyright 2011-2016 by Vlad Riscutia and contributors (see
     CONTRIBUTORS file)
     :license: FreeBSD, see LICENSE file
 '''
+import atexit
 import mock
 import os
 import shutil
 import sphinx
+from sphinx.application import Sphinx
 import sys
+import tempfile
 from tinkerer import output, paths, writer
-import types
+from tinkerer import utils as tinkerer_utils
 import unittest
 
+try:
+    # Python 2
+    from StringIO import StringIO
+except ImportError:
+    # Python 3
+    from io import StringIO
 
-# test root directory
-TEST_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "root"))
 
+# test root directory, unique to this test process
+TEST_DIR = tempfile.mkdtemp(prefix="tinkertest-")
+TEST_ROOT = os.path.join(TEST_DIR, "root")
+atexit.register(shutil.rmtree, TEST_DIR, True)
 
-# stored test instance to assert from extensions while running Sphinx build
-test = None
+# compiled templates are cached in the test directory rather than the home
+# directory, also by sphinx-build processes started by the tests
+paths.cache = os.path.join(TEST_DIR, "cache")
+os.environ["TINKERER_CACHE_PATH"] = paths.cache
 
 
 # base tinkerer test case
@@ -34,12 +50,12 @@ class BaseTinkererTest(unittest.TestCase):
         setup()
 
     # invoke build
-    def build(self, expected_return=0):
+    def build(self, expected_return=0, jobs=1):
         print("")
 
         with mock.patch.object(sys, 'exit') as mock_exit:
-            sys.argv = ["sphinx-build", "-q", "-d", paths.doctree, "-b",
-                        "html", paths.root, paths.html]
+            sys.argv = ["sphinx-build", "-q", "-j", str(jobs), "-d",
+                        paths.doctree, "-b", "html", paths.root, paths.html]
             sphinx.main(sys.argv)
             mock_exit.assert_called_once_with(expected_return)
 
@@ -48,9 +64,33 @@ class BaseTinkererTest(unittest.TestCase):
         cleanup()
 
 
-# hook extension to conf.py
-def hook_extension(ext):
-    writer.write_conf_file(extensions=["tinkerer.ext.blog", ext])
+# base test case for tests only inspecting build output - the blog is created
+# by create_blog and built once, then shared by all tests of the class
+class BaseBuiltBlogTest(unittest.TestCase):
+    # Sphinx application of the build, tests can inspect its environment
+    app = None
+
+    @classmethod
+    def setUpClass(cls):
+        output.quiet = True
+        setup()
+        cls.create_blog()
+        cls.app = build_blog()
+
+    # override to add posts, pages and configuration before the build
+    @classmethod
+    def create_blog(cls):
+        pass
+
+    # read a file from the build output given its path components
+    def read_html(self, *path):
+        with open(os.path.join(paths.html, *path), "r") as f:
+            return f.read()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.app = None
+        cleanup()
 
 
 # setup blog using TEST_ROOT working directory
@@ -69,6 +109,17 @@ def setup():
 def cleanup():
     if os.path.exists(TEST_ROOT):
         shutil.rmtree(TEST_ROOT)
+    shutil.rmtree(tinkerer_utils.get_cache_path(TEST_ROOT), True)
+
+
+# build the blog in-process and return the Sphinx application, raises if the
+# build fails
+def build_blog(jobs=1):
+    app = Sphinx(paths.root, paths.root, paths.html, paths.doctree, "html",
+                 status=None, warning=StringIO(), freshenv=True,
+                 parallel=jobs)
+    app.build()
+    return app
 
 
 # update conf.py given a dictionary of strings to replace (from -> to)
@@ -80,13 +131,3 @@ def update_conf(settings):
         conf_text = conf_text.replace(setting, settings[setting])
 
     open(conf_path, "w").write(conf_text)
-
-
-# nose mistakenly calls Sphinx extension setup functions thinking they are
-# test setups with a module parameter
-def is_module(m):
-    return isinstance(m, types.ModuleType)
-
-
-# used by Sphinx to lookup extensions
-sys.path.append(os.path.abspath(os.path.dirname(__file__)))